@@ -8,6 +8,7 @@ import { MatGridListModule } from '@angular/material/grid-list';
 import { MatToolbarModule } from '@angular/material/toolbar';
 import { MatMenuModule } from '@angular/material/menu';
 import { AuthService } from '../../services/auth';
+import { DashboardService } from '../../services/dashboard';
 import { Usuario } from '../../models/usuario.interface';
 
 @Component({
@@ -33,6 +34,7 @@ export class DashboardComponent implements OnInit {
 
   constructor(
     private authService: AuthService,
+    private dashboardService: DashboardService,
     private router: Router
   ) {}
 
@@ -120,6 +122,13 @@ export class DashboardComponent implements OnInit {
         { label: 'Grados', value: 0, icon: 'class', color: 'warn' },
         { label: 'Materias', value: 0, icon: 'book', color: 'primary' }
       ];
+      this.dashboardService.getStats().subscribe({
+        next: (stats) => {
+          const valores = [stats.alumnos, stats.profesores, stats.grados, stats.materias];
+          valores.forEach((valor, i) => this.quickStats[i].value = valor);
+        },
+        error: (error) => console.error('Error al cargar estadísticas:', error)
+      });
     } else if (this.currentUser.rol === 'Docente') {
       this.quickStats = [
         { label: 'Mis Estudiantes', value: 0, icon: 'school', color: 'primary' },
@@ -0,0 +1,30 @@
+import { Injectable } from '@angular/core';
+import { HttpClient, HttpParams } from '@angular/common/http';
+import { Observable } from 'rxjs';
+
+export interface DashboardStats {
+  institucion: number | null;
+  alumnos: number;
+  profesores: number;
+  personal: number;
+  materias: number;
+  grados: number;
+}
+
+@Injectable({
+  providedIn: 'root'
+})
+export class DashboardService {
+  private apiUrl = 'http://localhost:8000/api/dashboard/';
+
+  constructor(private http: HttpClient) {}
+
+  // Obtener todos los conteos del dashboard en una sola petición
+  getStats(institucionId?: number): Observable<DashboardStats> {
+    let params = new HttpParams();
+    if (institucionId) {
+      params = params.set('institucion', institucionId.toString());
+    }
+    return this.http.get<DashboardStats>(`${this.apiUrl}stats/`, { params });
+  }
+}
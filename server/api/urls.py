@@ -9,10 +9,13 @@ The AuthViewSet in school/api/views.py handles all authentication:
     - GET  /api/auth/me/      - Get current user info
 
 This file is kept for potential future standalone API endpoints.
+    - GET  /api/_metrics/     - Métricas por endpoint (formato Prometheus)
 """
 from django.urls import path
+from core.views import metricas
 
 urlpatterns = [
     # Authentication is handled by school.api.urls.py -> AuthViewSet
     # Add any additional standalone API endpoints here if needed
-]
\ No newline at end of file
+    path('_metrics/', metricas, name='metricas'),
+]
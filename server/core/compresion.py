@@ -0,0 +1,273 @@
+"""
+Compresión de respuestas (Brotli / gzip)
+
+CompresionMiddleware comprime el cuerpo según el Accept-Encoding del cliente:
+
+    - br si el cliente lo acepta y el paquete `brotli` está instalado
+      (incluido en requirements-produccion.txt); si no, gzip (zlib de la
+      biblioteca estándar). Se respetan los q-values ('br;q=0' lo excluye)
+      y, a igual preferencia, se elige br.
+    - Solo tipos textuales (JSON, JSON Lines, CSV, texto, HTML, JS, XML).
+    - Los cuerpos de menos de COMPRESION_UMBRAL_BYTES se envían sin
+      comprimir: la cabecera gzip/br y el CPU no compensan.
+    - StreamingHttpResponse (exportaciones CSV/JSONL) se comprime por
+      partes: cada parte se comprime y se vacía (flush) al generarse, de modo
+      que el cliente recibe los datos a medida que salen de la base. Vale
+      para iteradores sync y async.
+    - No se tocan las respuestas que ya traen Content-Encoding (ej. los
+      estáticos precomprimidos de WhiteNoise) ni las que no tienen cuerpo.
+
+Como GZipMiddleware de Django, añade 'Vary: Accept-Encoding' y convierte
+el ETag en débil (W/"..."): los bytes dependen de la codificación. Las
+peticiones condicionales (school.api.condicional) comparan los ETag sin
+el prefijo débil.
+
+COMPRESION_RUTAS ajusta la configuración por prefijo de ruta (gana el más
+largo): `habilitada`, `umbral`, `nivel_gzip` y `nivel_br`. Por defecto
+/api/auth/ no se comprime: sus respuestas llevan tokens y comprimir
+secretos junto a datos del cliente expone a ataques tipo BREACH.
+
+Métricas por endpoint (core.metricas, en /api/_metrics/):
+    api_compresion_respuestas_total{endpoint,resultado}   br, gzip o motivo de omisión
+    api_compresion_bytes_total{endpoint,codificacion,etapa}  bytes original/comprimido
+    api_compresion_ratio{endpoint,codificacion}           original / comprimido
+    api_compresion_cpu_segundos{endpoint,codificacion}    CPU del hilo al comprimir
+y el tramo 'compresion' en Server-Timing (respuestas que no son streaming).
+"""
+import re
+import time
+import zlib
+from functools import partial
+from typing import Dict, Optional
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from core import metricas
+from core.middleware import _endpoint
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+CODIFICACIONES = ('br', 'gzip') if brotli is not None else ('gzip',)
+OPCIONES_RUTA = ('habilitada', 'umbral', 'nivel_gzip', 'nivel_br')
+
+TIPOS_COMPRIMIBLES = re.compile(
+    r'^(text/|application/(json|x-ndjson|javascript|xml)|image/svg\+xml|application/[^;]+\+(json|xml))',
+    re.IGNORECASE,
+)
+SIN_CUERPO = (204, 304)
+
+ETIQUETAS = ('endpoint', 'codificacion')
+BUCKETS_RATIO = (1.5, 2, 3, 4, 6, 8, 12, 20)
+BUCKETS_CPU = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+RESPUESTAS = metricas.registrar(metricas.Contador(
+    'api_compresion_respuestas_total',
+    'Respuestas por resultado de la compresión (br, gzip o motivo por el que no se comprimió)',
+    ('endpoint', 'resultado'),
+))
+BYTES = metricas.registrar(metricas.Contador(
+    'api_compresion_bytes_total', 'Bytes de las respuestas comprimidas antes y después de comprimir',
+    ETIQUETAS + ('etapa',),
+))
+RATIO = metricas.registrar(metricas.Histograma(
+    'api_compresion_ratio', 'Tamaño original / tamaño comprimido', BUCKETS_RATIO, ETIQUETAS,
+))
+CPU = metricas.registrar(metricas.Histograma(
+    'api_compresion_cpu_segundos', 'Tiempo de CPU dedicado a comprimir la respuesta', BUCKETS_CPU, ETIQUETAS,
+))
+
+
+def _aceptadas(cabecera: str) -> Dict[str, float]:
+    """Accept-Encoding -> {codificación: q}"""
+    aceptadas = {}
+    for parte in cabecera.split(','):
+        nombre, _, parametros = parte.partition(';')
+        nombre = nombre.strip().lower()
+        if not nombre:
+            continue
+        calidad = 1.0
+        for parametro in parametros.split(';'):
+            clave, _, valor = parametro.partition('=')
+            if clave.strip().lower() == 'q':
+                try:
+                    calidad = float(valor)
+                except ValueError:
+                    calidad = 0.0
+        aceptadas[nombre] = calidad
+    return aceptadas
+
+
+def elegir_codificacion(cabecera: str) -> Optional[str]:
+    """Codificación soportada de mayor q en Accept-Encoding (br ante un empate); None si ninguna"""
+    aceptadas = _aceptadas(cabecera)
+    comodin = aceptadas.get('*', 0.0)
+    candidatas = [(aceptadas.get(codificacion, comodin), codificacion) for codificacion in CODIFICACIONES]
+    calidad, codificacion = max(candidatas, key=lambda candidata: candidata[0])
+    return codificacion if calidad > 0 else None
+
+
+class Compresor:
+    """Compresor incremental de una respuesta; acumula bytes y tiempo de CPU"""
+
+    def __init__(self, codificacion: str, nivel: int):
+        self.codificacion = codificacion
+        self.original = 0
+        self.comprimido = 0
+        self.cpu = 0.0
+        if codificacion == 'br':
+            compresor = brotli.Compressor(quality=nivel)
+            self._comprimir, self._vaciar, self._terminar = compresor.process, compresor.flush, compresor.finish
+        else:
+            compresor = zlib.compressobj(nivel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # Formato gzip
+            self._comprimir, self._vaciar, self._terminar = (
+                compresor.compress, partial(compresor.flush, zlib.Z_SYNC_FLUSH), compresor.flush
+            )
+
+    def parte(self, datos: bytes) -> bytes:
+        """Comprime una parte y vacía el compresor: el cliente puede decodificarla ya"""
+        inicio = time.thread_time()
+        salida = self._comprimir(datos) + self._vaciar()
+        return self._contar(datos, salida, inicio)
+
+    def todo(self, datos: bytes) -> bytes:
+        """Comprime un cuerpo completo"""
+        inicio = time.thread_time()
+        salida = self._comprimir(datos) + self._terminar()
+        return self._contar(datos, salida, inicio)
+
+    def terminar(self) -> bytes:
+        inicio = time.thread_time()
+        return self._contar(b'', self._terminar(), inicio)
+
+    def _contar(self, datos: bytes, salida: bytes, inicio: float) -> bytes:
+        self.cpu += time.thread_time() - inicio
+        self.original += len(datos)
+        self.comprimido += len(salida)
+        return salida
+
+
+class CompresionMiddleware:
+    """Comprime las respuestas con br o gzip (ver el docstring del módulo)"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.habilitada = getattr(settings, 'COMPRESION_HABILITADA', True)
+        self.metricas = getattr(settings, 'METRICAS_HABILITADAS', True)
+        self.server_timing = self.metricas and getattr(settings, 'METRICAS_SERVER_TIMING', True)
+        base = {
+            'habilitada': True,
+            'umbral': getattr(settings, 'COMPRESION_UMBRAL_BYTES', 1024),
+            'nivel_gzip': getattr(settings, 'COMPRESION_NIVEL_GZIP', 6),
+            'nivel_br': getattr(settings, 'COMPRESION_NIVEL_BR', 4),
+        }
+        self.rutas = [('', base)]
+        for prefijo, opciones in getattr(settings, 'COMPRESION_RUTAS', {}).items():
+            desconocidas = set(opciones) - set(OPCIONES_RUTA)
+            if desconocidas:
+                raise ValueError(
+                    f"COMPRESION_RUTAS['{prefijo}'] no válido: {', '.join(sorted(desconocidas))}. "
+                    f"Use: {', '.join(OPCIONES_RUTA)}"
+                )
+            self.rutas.append((prefijo, {**base, **opciones}))
+        self.rutas.sort(key=lambda ruta: len(ruta[0]), reverse=True)
+        self.es_async = iscoroutinefunction(get_response)
+        if self.es_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.es_async:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        return self._procesar(request, response) if self.habilitada else response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return self._procesar(request, response) if self.habilitada else response
+
+    def _configuracion(self, ruta: str) -> dict:
+        return next(opciones for prefijo, opciones in self.rutas if ruta.startswith(prefijo))
+
+    def _procesar(self, request, response):
+        if response.status_code in SIN_CUERPO or response.has_header('Content-Encoding'):
+            return response
+        if not TIPOS_COMPRIMIBLES.match(response.get('Content-Type', '')):
+            return response
+        configuracion = self._configuracion(request.path_info)
+        if not configuracion['habilitada']:
+            return self._omitir(request, response, 'ruta')
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        codificacion = elegir_codificacion(request.headers.get('Accept-Encoding', ''))
+        if codificacion is None:
+            return self._omitir(request, response, 'sin_soporte')
+        if not response.streaming and len(response.content) < configuracion['umbral']:
+            return self._omitir(request, response, 'pequena')
+
+        compresor = Compresor(codificacion, configuracion[f'nivel_{codificacion}'])
+        if response.streaming:
+            del response['Content-Length']
+            if response.is_async:
+                response.streaming_content = self._por_partes_async(request, response.streaming_content, compresor)
+            else:
+                response.streaming_content = self._por_partes(request, response.streaming_content, compresor)
+        else:
+            contenido = compresor.todo(response.content)
+            if len(contenido) >= len(response.content):
+                return self._omitir(request, response, 'sin_ganancia')
+            response.content = contenido
+            response['Content-Length'] = str(len(contenido))
+            self._registrar(request, compresor)
+            if self.server_timing:
+                tramo = (f'compresion;dur={compresor.cpu * 1000:.1f};'
+                         f'desc="{codificacion} {compresor.original}->{compresor.comprimido} bytes"')
+                existente = response.get('Server-Timing')
+                response['Server-Timing'] = f'{existente}, {tramo}' if existente else tramo
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = codificacion
+        return response
+
+    def _por_partes(self, request, contenido, compresor: Compresor):
+        try:
+            for parte in contenido:
+                salida = compresor.parte(parte)
+                if salida:
+                    yield salida
+            yield compresor.terminar()
+        finally:
+            self._registrar(request, compresor)
+
+    async def _por_partes_async(self, request, contenido, compresor: Compresor):
+        try:
+            async for parte in contenido:
+                salida = compresor.parte(parte)
+                if salida:
+                    yield salida
+            yield compresor.terminar()
+        finally:
+            self._registrar(request, compresor)
+
+    def _omitir(self, request, response, motivo: str):
+        if self.metricas:
+            RESPUESTAS.incrementar(_endpoint(request), motivo)
+        return response
+
+    def _registrar(self, request, compresor: Compresor) -> None:
+        if not self.metricas:
+            return
+        endpoint, codificacion = _endpoint(request), compresor.codificacion
+        RESPUESTAS.incrementar(endpoint, codificacion)
+        BYTES.incrementar(endpoint, codificacion, 'original', valor=compresor.original)
+        BYTES.incrementar(endpoint, codificacion, 'comprimido', valor=compresor.comprimido)
+        CPU.observar(compresor.cpu, endpoint, codificacion)
+        if compresor.comprimido:
+            RATIO.observar(compresor.original / compresor.comprimido, endpoint, codificacion)
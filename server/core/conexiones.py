@@ -0,0 +1,101 @@
+"""
+Conexiones a la base de datos: precalentamiento y métricas del pool
+
+precalentar() abre las conexiones al iniciar el proceso (lo llama
+SchoolConfig.ready si DB_PRECALENTAR=True) para que la primera petición no
+pague la conexión TCP + TLS. Con pool (DB_POOL=True) espera a que el pool
+tenga DB_POOL_MIN conexiones; sin pool abre la conexión del hilo actual,
+que es el que atiende las peticiones en los workers sync de Gunicorn.
+
+Las estadísticas de psycopg_pool (tamaño, conexiones libres, peticiones en
+espera y tiempo total de espera) se publican en /api/_metrics/.
+"""
+import logging
+import time
+from django.db import connections
+from core import metricas
+
+
+logger = logging.getLogger('core.conexiones')
+
+
+def _pool_existente(alias):
+    """Pool ya creado del alias (sin crearlo, a diferencia de connection.pool)"""
+    conexion = connections[alias]
+    if not conexion.settings_dict.get('OPTIONS', {}).get('pool'):
+        return None
+    return type(conexion)._connection_pools.get(alias)
+
+
+def precalentar(aliases=None, timeout=None) -> None:
+    """Abre las conexiones de cada alias; un fallo se registra y no impide arrancar"""
+    for alias in aliases or connections:
+        conexion = connections[alias]
+        inicio = time.perf_counter()
+        try:
+            pool = getattr(conexion, 'pool', None)
+            if pool is not None:
+                pool.open(wait=True, timeout=timeout or pool.timeout)
+                detalle = f'pool con {pool.get_stats().get("pool_size", 0)} conexiones'
+            else:
+                conexion.ensure_connection()
+                detalle = 'conexión abierta'
+        except Exception as e:
+            logger.warning('No se pudo precalentar la base %r: %s', alias, e)
+            continue
+        logger.info('Base %r precalentada en %.0f ms (%s)', alias, (time.perf_counter() - inicio) * 1000, detalle)
+
+
+def reiniciar_tras_fork() -> None:
+    """
+    En un proceso hijo (Gunicorn con preload_app) descarta las conexiones y
+    pools heredados del master y vuelve a precalentar si corresponde.
+    """
+    from django.conf import settings
+    connections.close_all()
+    for alias in connections:
+        if _pool_existente(alias) is not None:
+            connections[alias].close_pool()
+    if getattr(settings, 'DB_PRECALENTAR', False):
+        precalentar()
+
+
+class MetricasPool:
+    """Exposición Prometheus de get_stats() de cada pool de psycopg"""
+
+    # (nombre, tipo, ayuda, clave de get_stats, divisor)
+    SERIES = [
+        ('db_pool_conexiones', 'gauge', 'Conexiones abiertas en el pool', 'pool_size', 1),
+        ('db_pool_disponibles', 'gauge', 'Conexiones libres en el pool', 'pool_available', 1),
+        ('db_pool_esperando', 'gauge', 'Peticiones esperando una conexión', 'requests_waiting', 1),
+        ('db_pool_maximo', 'gauge', 'Tamaño máximo del pool', 'pool_max', 1),
+        ('db_pool_peticiones_total', 'counter', 'Conexiones pedidas al pool', 'requests_num', 1),
+        ('db_pool_encoladas_total', 'counter', 'Peticiones que tuvieron que esperar', 'requests_queued', 1),
+        ('db_pool_espera_segundos_total', 'counter', 'Tiempo total esperando una conexión',
+         'requests_wait_ms', 1000),
+        ('db_pool_errores_total', 'counter', 'Peticiones sin conexión (timeout)', 'requests_errors', 1),
+        ('db_pool_conexiones_creadas_total', 'counter', 'Conexiones abiertas contra el servidor',
+         'connections_num', 1),
+        ('db_pool_conexion_segundos_total', 'counter', 'Tiempo total abriendo conexiones',
+         'connections_ms', 1000),
+        ('db_pool_conexiones_perdidas_total', 'counter', 'Conexiones descartadas por fallar la verificación',
+         'connections_lost', 1),
+    ]
+
+    def exponer(self):
+        estadisticas = {}
+        for alias in connections:
+            pool = _pool_existente(alias)
+            if pool is not None:
+                estadisticas[alias] = pool.get_stats()
+        if not estadisticas:
+            return []
+        lineas = []
+        for nombre, tipo, ayuda, clave, divisor in self.SERIES:
+            lineas.extend([f'# HELP {nombre} {ayuda}', f'# TYPE {nombre} {tipo}'])
+            for alias, valores in sorted(estadisticas.items()):
+                lineas.append(f'{nombre}{{alias="{alias}"}} {valores.get(clave, 0) / divisor:g}')
+        return lineas
+
+
+metricas.registrar(MetricasPool())
@@ -0,0 +1,111 @@
+"""
+Registro de métricas por endpoint (formato de exposición de Prometheus)
+
+Histogramas en memoria del proceso, etiquetados por endpoint (nombre de la
+vista, ej. 'grado-list') y método HTTP. Con varios workers cada proceso
+expone sus propias series; Prometheus las distingue por instancia.
+"""
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+BUCKETS_BYTES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+class Histograma:
+    """Histograma acumulativo con series por combinación de etiquetas"""
+
+    def __init__(self, nombre: str, ayuda: str, buckets: Sequence[float], etiquetas: Sequence[str]):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.buckets = tuple(buckets)
+        self.etiquetas = tuple(etiquetas)
+        # valores de etiquetas -> [conteos por bucket (+Inf al final), suma]
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observar(self, valor: float, *etiquetas: str) -> None:
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._series.get(etiquetas)
+            if serie is None:
+                serie = self._series[etiquetas] = [[0] * (len(self.buckets) + 1), 0.0]
+            serie[0][indice] += 1
+            serie[1] += valor
+
+    def exponer(self) -> List[str]:
+        lineas = [f'# HELP {self.nombre} {self.ayuda}', f'# TYPE {self.nombre} histogram']
+        with self._lock:
+            series = sorted((clave, list(conteos), suma) for clave, (conteos, suma) in self._series.items())
+        for valores, conteos, suma in series:
+            base = ','.join(f'{etiqueta}="{_escapar(valor)}"' for etiqueta, valor in zip(self.etiquetas, valores))
+            acumulado = 0
+            for limite, conteo in zip(list(self.buckets) + ['+Inf'], conteos):
+                acumulado += conteo
+                lineas.append(f'{self.nombre}_bucket{{{base},le="{limite}"}} {acumulado}')
+            lineas.append(f'{self.nombre}_sum{{{base}}} {suma:.6f}')
+            lineas.append(f'{self.nombre}_count{{{base}}} {acumulado}')
+        return lineas
+
+
+class Contador:
+    """Contador monótono con series por combinación de etiquetas"""
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str]):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._series: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def incrementar(self, *etiquetas: str, valor: float = 1) -> None:
+        with self._lock:
+            self._series[etiquetas] += valor
+
+    def exponer(self) -> List[str]:
+        lineas = [f'# HELP {self.nombre} {self.ayuda}', f'# TYPE {self.nombre} counter']
+        with self._lock:
+            series = sorted(self._series.items())
+        for valores, total in series:
+            base = ','.join(f'{etiqueta}="{_escapar(valor)}"' for etiqueta, valor in zip(self.etiquetas, valores))
+            lineas.append(f'{self.nombre}{{{base}}} {total:g}')
+        return lineas
+
+
+def _escapar(valor) -> str:
+    return str(valor).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+ETIQUETAS = ('endpoint', 'metodo')
+
+PETICIONES = Contador('api_peticiones_total', 'Peticiones atendidas', ETIQUETAS + ('estado',))
+DURACION = Histograma('api_peticion_duracion_segundos', 'Duración total de la petición',
+                      BUCKETS_SEGUNDOS, ETIQUETAS)
+CONSULTAS = Histograma('api_peticion_consultas_sql', 'Consultas SQL por petición',
+                       BUCKETS_CONSULTAS, ETIQUETAS)
+TIEMPO_SQL = Histograma('api_peticion_sql_segundos', 'Tiempo en la base de datos por petición',
+                        BUCKETS_SEGUNDOS, ETIQUETAS)
+SERIALIZACION = Histograma('api_peticion_serializacion_segundos', 'Tiempo de render de la respuesta',
+                           BUCKETS_SEGUNDOS, ETIQUETAS)
+TAMANO = Histograma('api_respuesta_bytes', 'Tamaño del cuerpo de la respuesta',
+                    BUCKETS_BYTES, ETIQUETAS)
+
+REGISTRO = [PETICIONES, DURACION, CONSULTAS, TIEMPO_SQL, SERIALIZACION, TAMANO]
+
+
+def registrar(metrica):
+    """Agrega una métrica al registro expuesto (para otros módulos)"""
+    REGISTRO.append(metrica)
+    return metrica
+
+
+def exponer() -> str:
+    """Todas las métricas en formato de texto de Prometheus"""
+    lineas = []
+    for metrica in REGISTRO:
+        lineas.extend(metrica.exponer())
+    return '\n'.join(lineas) + '\n'
@@ -0,0 +1,165 @@
+"""
+Middleware de instrumentación de peticiones
+
+Por cada petición mide la cantidad de consultas SQL y el tiempo en la base
+de datos (execute_wrapper sobre todas las conexiones), el tiempo de render
+de la respuesta (serialización a JSON de DRF), el tamaño del cuerpo y la
+duración total. Los valores se publican en la cabecera Server-Timing, se
+acumulan en los histogramas de core.metricas y las peticiones que superan
+METRICAS_UMBRAL_LENTO_MS se registran en el logger 'core.metricas'.
+
+Funciona en modo sync y async: el contador de la petición viaja en una
+ContextVar, que asgiref copia a los hilos donde el ORM async ejecuta las
+consultas, y el execute_wrapper se instala una vez por conexión.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from core import metricas
+
+
+logger = logging.getLogger('core.metricas')
+
+
+class ContadorSQL:
+    """Consultas y duración acumulada de una petición"""
+
+    def __init__(self):
+        self.consultas = 0
+        self.segundos = 0.0
+
+
+_contador_actual: ContextVar = ContextVar('contador_sql', default=None)
+
+
+def _medir_consulta(execute, sql, params, many, context):
+    """execute_wrapper permanente: suma al contador de la petición en curso, si hay"""
+    contador = _contador_actual.get()
+    if contador is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        contador.consultas += 1
+        contador.segundos += time.perf_counter() - inicio
+
+
+def _instalar(conexion) -> None:
+    if _medir_consulta not in conexion.execute_wrappers:
+        conexion.execute_wrappers.append(_medir_consulta)
+
+
+def _al_conectar(sender, connection, **kwargs):
+    _instalar(connection)
+
+
+connection_created.connect(_al_conectar, dispatch_uid='core.middleware.medir_consultas')
+
+
+def _endpoint(request) -> str:
+    """Nombre de la vista resuelta (cardinalidad acotada, sin ids de la URL)"""
+    coincidencia = getattr(request, 'resolver_match', None)
+    if coincidencia is None:
+        return 'sin_ruta'
+    return coincidencia.view_name or coincidencia._func_path
+
+
+class MetricasMiddleware:
+    """Registra consultas, tiempo en base de datos, render y tamaño de cada petición"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.habilitado = getattr(settings, 'METRICAS_HABILITADAS', True)
+        self.server_timing = getattr(settings, 'METRICAS_SERVER_TIMING', True)
+        self.umbral_lento = getattr(settings, 'METRICAS_UMBRAL_LENTO_MS', 500) / 1000
+        self.es_async = iscoroutinefunction(get_response)
+        if self.es_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.es_async:
+            return self.__acall__(request)
+        if not self.habilitado:
+            return self.get_response(request)
+
+        # Conexiones abiertas antes de importar este módulo (ej. precalentamiento)
+        for conexion in connections.all(initialized_only=True):
+            _instalar(conexion)
+        contador, token = self._iniciar(request)
+        inicio = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _contador_actual.reset(token)
+        self._registrar(request, response, contador, request._metricas_render, time.perf_counter() - inicio)
+        return response
+
+    async def __acall__(self, request):
+        if not self.habilitado:
+            return await self.get_response(request)
+
+        contador, token = self._iniciar(request)
+        inicio = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _contador_actual.reset(token)
+        self._registrar(request, response, contador, request._metricas_render, time.perf_counter() - inicio)
+        return response
+
+    @staticmethod
+    def _iniciar(request):
+        request._metricas_render = 0.0
+        contador = ContadorSQL()
+        return contador, _contador_actual.set(contador)
+
+    def process_template_response(self, request, response):
+        """Las respuestas de DRF se renderizan después de la vista: se mide ese tramo"""
+        if self.habilitado:
+            inicio = time.perf_counter()
+
+            def medir_render(respuesta):
+                request._metricas_render += time.perf_counter() - inicio
+
+            response.add_post_render_callback(medir_render)
+        return response
+
+    def _registrar(self, request, response, contador, render, total):
+        endpoint, metodo = _endpoint(request), request.method
+        # El cuerpo de las respuestas en streaming se genera después; no se mide
+        tamano = None if response.streaming else len(response.content)
+
+        metricas.PETICIONES.incrementar(endpoint, metodo, str(response.status_code))
+        metricas.DURACION.observar(total, endpoint, metodo)
+        metricas.CONSULTAS.observar(contador.consultas, endpoint, metodo)
+        metricas.TIEMPO_SQL.observar(contador.segundos, endpoint, metodo)
+        metricas.SERIALIZACION.observar(render, endpoint, metodo)
+        if tamano is not None:
+            metricas.TAMANO.observar(tamano, endpoint, metodo)
+
+        if self.server_timing:
+            tramos = [
+                f'db;dur={contador.segundos * 1000:.1f};desc="{contador.consultas} consultas"',
+                f'serializacion;dur={render * 1000:.1f}',
+                f'total;dur={total * 1000:.1f}',
+            ]
+            existente = response.get('Server-Timing')
+            response['Server-Timing'] = ', '.join(([existente] if existente else []) + tramos)
+            response['X-Consultas-SQL'] = str(contador.consultas)
+
+        if total >= self.umbral_lento:
+            logger.warning(
+                'Petición lenta: %s %s -> %s en %.0f ms (%d consultas, %.0f ms en base de datos, '
+                '%.0f ms de render, %s bytes) [%s]',
+                metodo, request.get_full_path(), response.status_code, total * 1000,
+                contador.consultas, contador.segundos * 1000, render * 1000,
+                tamano if tamano is not None else '?', endpoint,
+            )
@@ -0,0 +1,274 @@
+"""
+Réplicas de lectura
+
+RouterReplicas (DATABASE_ROUTERS) envía las lecturas de las apps de
+DB_REPLICAS_APPS (por defecto 'school') a una réplica y todas las
+escrituras a 'default'. Las réplicas son los alias con
+TEST={'MIRROR': 'default'}, la convención de Django para réplicas; en
+core/settings.py se crean desde DB_REPLICAS.
+
+Elección de la réplica (DB_REPLICAS_ESTRATEGIA):
+    round_robin     una tras otra
+    menor_latencia  la de menor tiempo medio por consulta (media móvil
+                    exponencial medida con un execute_wrapper); una fracción
+                    de las lecturas se reparte en ronda para mantener
+                    actualizadas las mediciones de todas
+
+Dentro de una petición (ReplicasMiddleware) la réplica se elige una vez y
+se mantiene, de modo que el conteo y la página de un listado salen de la
+misma réplica. Para no leer datos anteriores a una escritura propia
+(read-your-writes), la petición queda fijada a 'default':
+    - desde el inicio si el método no es seguro (POST, PUT, PATCH, DELETE),
+      porque las validaciones previas a la escritura también deben leer
+      de la primaria;
+    - después de escribir en esas apps o dentro de transaction.atomic();
+    - durante DB_REPLICAS_FIJAR_SEGUNDOS después de una escritura, en las
+      peticiones siguientes del mismo cliente (cookie), para cubrir el
+      retraso de replicación.
+Fuera de una petición (comandos, shell) la primera escritura fija el resto
+del contexto a la primaria.
+
+Lo que se guarda en la caché versionada (school.cache: respuestas de datos
+de referencia, estadísticas, índice de búsqueda) se calcula leyendo de la
+primaria (lecturas_primaria): una réplica atrasada justo después de una
+invalidación dejaría datos viejos bajo la versión nueva hasta su TTL.
+
+/api/_metrics/ incluye las elecciones por réplica, su latencia media y las
+peticiones fijadas a la primaria por motivo.
+"""
+import itertools
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from core import metricas
+
+
+COOKIE_PRIMARIA = 'db_primaria'
+METODOS_SEGUROS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+ESTRATEGIAS = ('round_robin', 'menor_latencia')
+
+# Peso de la última medición en la media móvil y fracción de lecturas en ronda
+SUAVIZADO = 0.2
+EXPLORACION = 0.1
+
+
+def aliases_replica() -> List[str]:
+    """Alias configurados como réplica de 'default'"""
+    return [
+        alias for alias, config in settings.DATABASES.items()
+        if alias != DEFAULT_DB_ALIAS and (config.get('TEST') or {}).get('MIRROR') == DEFAULT_DB_ALIAS
+    ]
+
+
+class EstadoPeticion:
+    """Decisiones de enrutamiento de una petición (o de un contexto sin petición)"""
+
+    __slots__ = ('primaria', 'motivo', 'escribio', 'replica')
+
+    def __init__(self, primaria: bool = False, motivo: Optional[str] = None):
+        self.primaria = primaria
+        self.motivo = motivo
+        self.escribio = False
+        self.replica = None
+
+    def fijar(self, motivo: str) -> None:
+        if not self.primaria:
+            self.primaria = True
+            self.motivo = motivo
+
+
+_estado: ContextVar = ContextVar('replicas_estado', default=None)
+
+
+def _estado_actual() -> EstadoPeticion:
+    estado = _estado.get()
+    if estado is None:
+        estado = EstadoPeticion()
+        _estado.set(estado)
+    return estado
+
+
+def fijar_primaria(motivo: str = 'manual') -> None:
+    """Envía a 'default' las lecturas que resten en el contexto actual"""
+    _estado_actual().fijar(motivo)
+
+
+@contextmanager
+def lecturas_primaria(motivo: str = 'cache'):
+    """
+    Envía a 'default' las lecturas del bloque y después restaura el
+    enrutamiento (salvo que el bloque haya escrito: entonces sigue fijado).
+    """
+    estado = _estado_actual()
+    fijada = estado.primaria
+    estado.fijar(motivo)
+    try:
+        yield
+    finally:
+        if not fijada and not estado.escribio:
+            estado.primaria, estado.motivo = False, None
+
+
+class SelectorReplicas:
+    """Elige la réplica según la estrategia; mide la latencia de cada una"""
+
+    def __init__(self, aliases: List[str], estrategia: str):
+        if estrategia not in ESTRATEGIAS:
+            raise ValueError(f"DB_REPLICAS_ESTRATEGIA no válida: {estrategia}. Use: {', '.join(ESTRATEGIAS)}")
+        self.aliases = list(aliases)
+        self.estrategia = estrategia
+        self.latencias: Dict[str, float] = {}
+        self._ronda = itertools.cycle(self.aliases)
+        self._lock = threading.Lock()
+
+    def elegir(self) -> str:
+        if self.estrategia == 'menor_latencia' and random.random() >= EXPLORACION:
+            medidas = {alias: self.latencias.get(alias) for alias in self.aliases}
+            # Sin medición todavía: se prueba antes de comparar
+            sin_medir = [alias for alias, latencia in medidas.items() if latencia is None]
+            alias = sin_medir[0] if sin_medir else min(medidas, key=medidas.get)
+        else:
+            with self._lock:
+                alias = next(self._ronda)
+        ELECCIONES.incrementar(alias)
+        return alias
+
+    def observar(self, alias: str, segundos: float) -> None:
+        with self._lock:
+            anterior = self.latencias.get(alias)
+            self.latencias[alias] = segundos if anterior is None else (
+                SUAVIZADO * segundos + (1 - SUAVIZADO) * anterior
+            )
+
+    def medir(self, alias: str):
+        """execute_wrapper que alimenta la media de latencia de `alias`"""
+        def medir_consulta(execute, sql, params, many, context):
+            inicio = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.observar(alias, time.perf_counter() - inicio)
+        medir_consulta.replica = alias
+        return medir_consulta
+
+    def exponer(self):
+        lineas = ['# HELP db_replica_latencia_segundos Tiempo medio por consulta (media móvil)',
+                  '# TYPE db_replica_latencia_segundos gauge']
+        with self._lock:
+            latencias = sorted(self.latencias.items())
+        lineas.extend(f'db_replica_latencia_segundos{{alias="{alias}"}} {valor:.6f}' for alias, valor in latencias)
+        return lineas
+
+
+ELECCIONES = metricas.registrar(
+    metricas.Contador('db_replica_elecciones_total', 'Peticiones o lecturas asignadas a cada réplica', ('alias',))
+)
+FIJADAS = metricas.registrar(
+    metricas.Contador('db_peticiones_primaria_total', 'Peticiones fijadas a la primaria', ('motivo',))
+)
+
+
+class RouterReplicas:
+    """Lecturas a réplicas, escrituras a 'default' (ver el docstring del módulo)"""
+
+    def __init__(self):
+        self.replicas = aliases_replica()
+        self.apps = set(getattr(settings, 'DB_REPLICAS_APPS', ['school']))
+        self.selector = SelectorReplicas(self.replicas, getattr(settings, 'DB_REPLICAS_ESTRATEGIA', 'round_robin'))
+        self.bases = {DEFAULT_DB_ALIAS, *self.replicas}
+        connection_created.connect(self._al_conectar, dispatch_uid='core.replicas.medir_latencia')
+        metricas.registrar(self.selector)
+
+    def _al_conectar(self, sender, connection, **kwargs):
+        if connection.alias in self.replicas and not any(
+            getattr(wrapper, 'replica', None) for wrapper in connection.execute_wrappers
+        ):
+            connection.execute_wrappers.append(self.selector.medir(connection.alias))
+
+    def db_for_read(self, model, **hints):
+        if not self.replicas or model._meta.app_label not in self.apps:
+            return None
+        estado = _estado_actual()
+        if not estado.primaria and connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            estado.fijar('transaccion')
+        if estado.primaria:
+            return DEFAULT_DB_ALIAS
+        if estado.replica is None:
+            estado.replica = self.selector.elegir()
+        return estado.replica
+
+    def db_for_write(self, model, **hints):
+        # Solo las escrituras replicadas fijan la petición (no la sesión ni el último login)
+        if model._meta.app_label not in self.apps:
+            return None
+        estado = _estado_actual()
+        estado.escribio = True
+        estado.fijar('escritura')
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if obj1._state.db in self.bases and obj2._state.db in self.bases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Las réplicas reciben el esquema por replicación; `migrate --database`
+        # sigue disponible para copias locales de prueba
+        return None
+
+
+class ReplicasMiddleware:
+    """Estado de enrutamiento por petición y cookie de fijación tras escribir"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not aliases_replica():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.fijar_segundos = int(getattr(settings, 'DB_REPLICAS_FIJAR_SEGUNDOS', 5))
+        self.es_async = iscoroutinefunction(get_response)
+        if self.es_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.es_async:
+            return self.__acall__(request)
+        estado, token = self._iniciar(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _estado.reset(token)
+        return self._terminar(estado, response)
+
+    async def __acall__(self, request):
+        estado, token = self._iniciar(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _estado.reset(token)
+        return self._terminar(estado, response)
+
+    def _iniciar(self, request):
+        estado = EstadoPeticion()
+        if request.method not in METODOS_SEGUROS:
+            estado.fijar('metodo')
+        elif self.fijar_segundos and COOKIE_PRIMARIA in request.COOKIES:
+            estado.fijar('cookie')
+        return estado, _estado.set(estado)
+
+    def _terminar(self, estado, response):
+        if estado.primaria:
+            FIJADAS.incrementar(estado.motivo)
+        if estado.escribio and self.fijar_segundos:
+            response.set_cookie(COOKIE_PRIMARIA, '1', max_age=self.fijar_segundos, httponly=True, samesite='Lax')
+        return response
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+import copy
 import os
 from dotenv import load_dotenv
 
@@ -51,24 +52,33 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # CORS debe ir primero
     'django.middleware.security.SecurityMiddleware',
+    'core.compresion.CompresionMiddleware',  # br/gzip según Accept-Encoding (ver COMPRESION_*); fuera de MetricasMiddleware
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.replicas.ReplicasMiddleware',  # Fija la petición a la primaria tras escribir (sin réplicas se desactiva)
+    'core.middleware.MetricasMiddleware',  # Consultas SQL, tiempos y tamaño por petición
 ]
 
 # Deshabilitar CSRF para API REST (solo para desarrollo)
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'school.api.autenticacion.SesionAuthentication',  # No lee la sesión si llega 'Authorization: Token'
+        'school.api.autenticacion.TokenCacheadoAuthentication',  # Token -> usuario en caché (ver AUTH_TOKEN_CACHE_*)
+        'school.api.autenticacion.AccesoFirmadoAuthentication',  # 'Authorization: Bearer' firmado, sin consultas
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',  # Cambiar a IsAuthenticated en producción
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'school.api.renderers.JSONRapidoRenderer',  # Mismos bytes que JSONRenderer, con orjson si está instalado
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'school.api.renderers.JSONCompactoRenderer',  # ?format=compact (school.api.campos)
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'school.api.pagination.StandardPagination',  # ?paginacion=cursor para modo keyset
     'PAGE_SIZE': 20,
     'EXCEPTION_HANDLER': 'school.api.exceptions.custom_exception_handler',  # Handler personalizado para errores JSON
 }
@@ -118,7 +128,7 @@ DATABASES = {
         'HOST': os.environ.get('DB_HOST', 'ep-lucky-bush-ada2nsx9-pooler.c-2.us-east-1.aws.neon.tech'),
         'PORT': os.environ.get('DB_PORT', '5432'),
         'OPTIONS': {
-            'sslmode': 'require',  # 👈 Requiere SSL pero usa certificados del sistema
+            'sslmode': os.environ.get('DB_SSLMODE', 'require'),  # 👈 Requiere SSL pero usa certificados del sistema ('disable' para Postgres local)
             'connect_timeout': 10,
             'keepalives': 1,
             'keepalives_idle': 30,
@@ -126,6 +136,72 @@ DATABASES = {
             'keepalives_count': 5,
         },
         'CONN_MAX_AGE': 60,  # 👈 Mantiene conexiones vivas por 60 segundos (mejor para consola interactiva)
+        'CONN_HEALTH_CHECKS': True,  # Verifica la conexión reutilizada antes de la primera consulta de cada petición
+    }
+}
+
+# Pool de conexiones de psycopg 3 (Django 5.1+): cada proceso mantiene entre
+# DB_POOL_MIN y DB_POOL_MAX conexiones abiertas y compartidas entre hilos, sin
+# pagar el handshake TLS en cada petición. Incompatible con CONN_MAX_AGE.
+DB_POOL = os.environ.get('DB_POOL', 'False') == 'True'
+if DB_POOL:
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN', 2)),
+        'max_size': int(os.environ.get('DB_POOL_MAX', 10)),
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),  # Espera máxima por una conexión libre (s)
+        'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', 300)),  # Cierra conexiones ociosas por encima de min_size (s)
+        'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', 1800)),  # Recicla conexiones antiguas (s)
+    }
+
+# Abrir las conexiones (o llenar el pool hasta DB_POOL_MIN) al iniciar cada proceso
+DB_PRECALENTAR = os.environ.get('DB_PRECALENTAR', 'False') == 'True'
+
+# Réplicas de lectura (ver core/replicas.py): DB_REPLICAS=host[:puerto][/base],...
+# crea los alias replica_1, replica_2... con la misma configuración que 'default'
+DB_REPLICAS = [replica.strip() for replica in os.environ.get('DB_REPLICAS', '').split(',') if replica.strip()]
+for indice, replica in enumerate(DB_REPLICAS, start=1):
+    direccion, _, nombre = replica.partition('/')
+    host, _, puerto = direccion.partition(':')
+    DATABASES[f'replica_{indice}'] = dict(
+        copy.deepcopy(DATABASES['default']),
+        HOST=host or DATABASES['default']['HOST'],
+        PORT=puerto or DATABASES['default']['PORT'],
+        NAME=nombre or DATABASES['default']['NAME'],
+        TEST={'MIRROR': 'default'},  # Marca de réplica; los tests usan la base de 'default'
+    )
+DB_REPLICAS_ESTRATEGIA = os.environ.get('DB_REPLICAS_ESTRATEGIA', 'round_robin')  # o 'menor_latencia'
+DB_REPLICAS_FIJAR_SEGUNDOS = int(os.environ.get('DB_REPLICAS_FIJAR_SEGUNDOS', 5))  # Lecturas a la primaria tras escribir
+DB_REPLICAS_APPS = ['school']
+DATABASE_ROUTERS = ['core.replicas.RouterReplicas']
+
+
+# Cache
+# CACHE_BACKEND: 'locmem' (por defecto, por proceso), 'file' (compartida entre
+# procesos del mismo servidor), 'redis' (requiere `pip install redis`) o 'dummy'
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ValueError(f"CACHE_BACKEND no válido: {CACHE_BACKEND}. Use: {', '.join(CACHE_BACKENDS)}")
+
+CACHE_LOCATIONS = {
+    'locmem': 'school',
+    'file': str(BASE_DIR / '.cache'),
+    'redis': 'redis://127.0.0.1:6379/1',
+    'dummy': '',
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.environ.get('CACHE_LOCATION', CACHE_LOCATIONS[CACHE_BACKEND]),
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', 300)),
+        'KEY_PREFIX': os.environ.get('CACHE_KEY_PREFIX', 'edu'),
     }
 }
 
@@ -189,6 +265,65 @@ CSRF_TRUSTED_ORIGINS = [
     'http://127.0.0.1:4200',
 ]
 
+# Reportes de calificaciones
+CALIFICACION_APROBATORIA = float(os.environ.get('CALIFICACION_APROBATORIA', 10))  # Nota mínima para aprobar
+RESUMEN_CACHE_TTL = int(os.environ.get('RESUMEN_CACHE_TTL', 300))  # Segundos; 0 desactiva la caché de resúmenes
+
+# Dashboard
+DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', 60))  # Segundos; 0 desactiva la caché de estadísticas
+
+# Datos de referencia (instituciones, periodos, grados)
+REFERENCIA_CACHE_TTL = int(os.environ.get('REFERENCIA_CACHE_TTL', 3600))  # Segundos; 0 desactiva la caché de respuestas
+
+# Listados de los ModelViewSets leídos con values_list en lugar de instanciar modelos (school.api.lectura_valores)
+API_LECTURA_VALORES = os.environ.get('API_LECTURA_VALORES', 'True') == 'True'
+
+# Caché de tokens de la API (school.api.autenticacion)
+AUTH_TOKEN_CACHE_TTL = int(os.environ.get('AUTH_TOKEN_CACHE_TTL', 60))  # Segundos; 0 consulta la base en cada petición
+AUTH_TOKEN_CACHE_MAX = int(os.environ.get('AUTH_TOKEN_CACHE_MAX', 1024))  # Tokens en el LRU de cada proceso
+AUTH_TOKEN_CACHE_COMPARTIDA = os.environ.get('AUTH_TOKEN_CACHE_COMPARTIDA', 'False') == 'True'  # Segundo nivel en CACHES['default']
+AUTH_TOKEN_CACHE_TTL_LOCAL = int(os.environ.get('AUTH_TOKEN_CACHE_TTL_LOCAL', 5))  # TTL del LRU local con caché compartida
+
+# Tokens que entrega /api/auth/login/: 'token' (Token de DRF en base, sin vencimiento) o
+# 'firmado' (acceso firmado de vida corta + token de refresco; ver school.api.autenticacion)
+AUTH_TOKEN_MODOS = ('token', 'firmado')
+AUTH_TOKEN_MODO = os.environ.get('AUTH_TOKEN_MODO', 'token')
+if AUTH_TOKEN_MODO not in AUTH_TOKEN_MODOS:
+    raise ValueError(f"AUTH_TOKEN_MODO no válido: {AUTH_TOKEN_MODO}. Use: {', '.join(AUTH_TOKEN_MODOS)}")
+AUTH_ACCESO_TTL = int(os.environ.get('AUTH_ACCESO_TTL', 300))  # Segundos de validez del acceso firmado
+AUTH_REFRESH_TTL = int(os.environ.get('AUTH_REFRESH_TTL', 14 * 24 * 3600))  # Segundos de validez del token de refresco
+
+# Compresión de respuestas br/gzip (core.compresion); br requiere `pip install brotli`
+COMPRESION_HABILITADA = os.environ.get('COMPRESION_HABILITADA', 'True') == 'True'
+COMPRESION_UMBRAL_BYTES = int(os.environ.get('COMPRESION_UMBRAL_BYTES', 1024))  # Cuerpos menores se envían sin comprimir
+COMPRESION_NIVEL_GZIP = int(os.environ.get('COMPRESION_NIVEL_GZIP', 6))  # 1-9
+COMPRESION_NIVEL_BR = int(os.environ.get('COMPRESION_NIVEL_BR', 4))  # 0-11; 4-5 equilibra CPU y tamaño en respuestas dinámicas
+# Por prefijo de ruta (gana el más largo): habilitada, umbral, nivel_gzip, nivel_br
+COMPRESION_RUTAS = {
+    '/api/auth/': {'habilitada': False},  # Respuestas con tokens: sin compresión (ataques tipo BREACH)
+}
+
+# Métricas por petición (Server-Timing y /api/_metrics/)
+METRICAS_HABILITADAS = os.environ.get('METRICAS_HABILITADAS', 'True') == 'True'
+METRICAS_SERVER_TIMING = os.environ.get('METRICAS_SERVER_TIMING', 'True') == 'True'  # Cabeceras Server-Timing y X-Consultas-SQL
+METRICAS_UMBRAL_LENTO_MS = int(os.environ.get('METRICAS_UMBRAL_LENTO_MS', 500))  # Peticiones más lentas se registran en 'core.metricas'
+METRICAS_TOKEN = os.environ.get('METRICAS_TOKEN', '')  # Si se define, /api/_metrics/ exige 'Authorization: Bearer <token>'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'consola': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.metricas': {
+            'handlers': ['consola'],
+            'level': os.environ.get('METRICAS_LOG_NIVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
 AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',  # ← debe estar
 ]
\ No newline at end of file
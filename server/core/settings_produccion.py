@@ -0,0 +1,98 @@
+"""
+Perfil de producción
+
+Hereda de core.settings y ajusta lo necesario para servir con Gunicorn
+(WSGI o ASGI, ver gunicorn.conf.py):
+
+    DJANGO_SETTINGS_MODULE=core.settings_produccion
+
+Variables de entorno obligatorias: SECRET_KEY, ALLOWED_HOSTS (separados por coma)
+y METRICAS_TOKEN (salvo METRICAS_HABILITADAS=False).
+
+La caché es 'file' por defecto (compartida por los workers del servidor);
+con varios servidores usar CACHE_BACKEND=redis.
+"""
+from core.settings import *  # noqa: F401,F403
+from core.settings import MIDDLEWARE, REST_FRAMEWORK, BASE_DIR, DATABASES, LOGGING
+from core.settings import CACHES, CACHE_BACKENDS, CACHE_LOCATIONS, METRICAS_HABILITADAS
+import multiprocessing
+import os
+from django.core.exceptions import ImproperlyConfigured
+
+
+DEBUG = os.environ.get('DEBUG', 'False') == 'True'
+
+SECRET_KEY = os.environ.get('SECRET_KEY', '')
+if not SECRET_KEY:
+    raise ImproperlyConfigured('SECRET_KEY es obligatoria en producción')
+
+ALLOWED_HOSTS = [host.strip() for host in os.environ.get('ALLOWED_HOSTS', '').split(',') if host.strip()]
+if not ALLOWED_HOSTS:
+    raise ImproperlyConfigured('ALLOWED_HOSTS es obligatoria en producción (ej. api.ejemplo.com,backend)')
+
+# /api/_metrics/ expone rutas, tiempos y estado de la base: no se publica sin token
+METRICAS_TOKEN = os.environ.get('METRICAS_TOKEN', '')
+if METRICAS_HABILITADAS and not METRICAS_TOKEN:
+    raise ImproperlyConfigured('METRICAS_TOKEN es obligatoria en producción (o METRICAS_HABILITADAS=False)')
+# Server-Timing y X-Consultas-SQL revelan el coste interno de cada petición; solo a pedido
+METRICAS_SERVER_TIMING = os.environ.get('METRICAS_SERVER_TIMING', 'False') == 'True'
+
+# CORS: solo los orígenes configurados
+CORS_ALLOW_ALL_ORIGINS = False
+CORS_ALLOWED_ORIGINS = [
+    origen.strip() for origen in os.environ.get('CORS_ALLOWED_ORIGINS', '').split(',') if origen.strip()
+]
+CSRF_TRUSTED_ORIGINS = CORS_ALLOWED_ORIGINS
+
+# Conexiones persistentes por worker (o pool si DB_POOL=True); se verifican antes de reutilizarlas
+for base in DATABASES.values():
+    if not base.get('OPTIONS', {}).get('pool'):
+        base['CONN_MAX_AGE'] = int(os.environ.get('CONN_MAX_AGE', 600))
+    base['CONN_HEALTH_CHECKS'] = True
+
+# Caché compartida entre workers: las respuestas de referencia, el índice de
+# búsqueda en memoria y las estadísticas se invalidan subiendo versiones en la
+# caché (school.cache); con locmem cada worker tiene la suya y los que no
+# atendieron la escritura siguen sirviendo datos viejos
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'file')
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ValueError(f"CACHE_BACKEND no válido: {CACHE_BACKEND}. Use: {', '.join(CACHE_BACKENDS)}")
+WEB_WORKERS = int(os.environ.get('WEB_WORKERS', multiprocessing.cpu_count() * 2 + 1))  # Mismo valor por defecto que gunicorn.conf.py
+if CACHE_BACKEND == 'locmem' and WEB_WORKERS > 1:
+    raise ImproperlyConfigured(
+        f'CACHE_BACKEND=locmem no es compartida entre los {WEB_WORKERS} workers; use file o redis (o WEB_WORKERS=1)'
+    )
+CACHES = {
+    'default': dict(
+        CACHES['default'],
+        BACKEND=CACHE_BACKENDS[CACHE_BACKEND],
+        LOCATION=os.environ.get('CACHE_LOCATION', CACHE_LOCATIONS[CACHE_BACKEND]),
+    ),
+}
+
+DB_PRECALENTAR = os.environ.get('DB_PRECALENTAR', 'True') == 'True'
+
+# Archivos estáticos (admin y API navegable) servidos por WhiteNoise desde collectstatic
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+MIDDLEWARE = list(MIDDLEWARE)
+# Subclase de WhiteNoise que no fuerza el modo sync bajo ASGI (ver core/estaticos.py)
+MIDDLEWARE.insert(MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+                  'core.estaticos.WhiteNoiseMiddleware')
+
+# Solo JSON: la API navegable renderiza plantillas en cada respuesta
+REST_FRAMEWORK = dict(REST_FRAMEWORK, DEFAULT_RENDERER_CLASSES=[
+    'school.api.renderers.JSONRapidoRenderer',
+    'school.api.renderers.JSONCompactoRenderer',
+])
+
+# Detrás de un proxy reverso que termina TLS (Nginx, balanceador)
+if os.environ.get('HTTPS', 'True') == 'True':
+    SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+    SESSION_COOKIE_SECURE = True
+    CSRF_COOKIE_SECURE = True
+
+LOGGING = dict(LOGGING, root={'handlers': ['consola'], 'level': os.environ.get('LOG_NIVEL', 'INFO')})
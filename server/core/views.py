@@ -1,4 +1,7 @@
-from django.http import JsonResponse
+import hmac
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from core import metricas as registro_metricas
 
 def api_root(request):
     """
@@ -22,3 +25,16 @@ def api_root(request):
         'documentation': 'Consulta README.md para más información'
     })
 
+
+
+def metricas(request):
+    """
+    Métricas por endpoint en formato de texto de Prometheus.
+    Si METRICAS_TOKEN está configurado se exige 'Authorization: Bearer <token>'.
+    """
+    token = getattr(settings, 'METRICAS_TOKEN', '')
+    if token:
+        recibido = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+        if not hmac.compare_digest(recibido.encode(), token.encode()):
+            return HttpResponse(status=401)
+    return HttpResponse(registro_metricas.exponer(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,58 @@
+"""
+Configuración de Gunicorn (la lee automáticamente desde el directorio de trabajo)
+
+SERVIDOR=wsgi  core.wsgi con workers sync (o gthread si WEB_THREADS > 1)
+SERVIDOR=asgi  core.asgi con workers de Uvicorn
+
+Variables de entorno:
+    WEB_BIND          dirección de escucha (0.0.0.0:8000)
+    WEB_WORKERS       procesos (2 x CPU + 1)
+    WEB_THREADS       hilos por proceso en modo wsgi (1)
+    WEB_TIMEOUT       segundos antes de reiniciar un worker colgado (30)
+    WEB_MAX_REQUESTS  reciclar cada worker tras N peticiones (0 = nunca)
+    WEB_PRELOAD       cargar Django en el master antes de crear los workers (False)
+
+Recarga sin cortar conexiones: `kill -HUP <pid del master>` (los workers
+nuevos arrancan antes de que terminen los anteriores). Con WEB_PRELOAD=True
+la recarga no toma código nuevo; en ese caso usar USR2 + WINCH.
+"""
+import multiprocessing
+import os
+
+
+modo = os.environ.get('SERVIDOR', 'wsgi')
+if modo not in ('wsgi', 'asgi'):
+    raise ValueError(f"SERVIDOR no válido para Gunicorn: {modo}. Use: wsgi, asgi")
+
+wsgi_app = 'core.asgi:application' if modo == 'asgi' else 'core.wsgi:application'
+bind = os.environ.get('WEB_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('WEB_THREADS', 1))
+
+if modo == 'asgi':
+    worker_class = 'uvicorn_worker.UvicornWorker'
+elif threads > 1:
+    worker_class = 'gthread'
+else:
+    worker_class = 'sync'
+
+timeout = int(os.environ.get('WEB_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('WEB_KEEPALIVE', 5))
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+
+# Precarga: workers más rápidos y memoria compartida, a cambio de la recarga de código con HUP
+preload_app = os.environ.get('WEB_PRELOAD', 'False') == 'True'
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_NIVEL', 'info').lower()
+
+
+def post_fork(server, worker):
+    """Con precarga, las conexiones y pools abiertos en el master no deben compartirse entre procesos"""
+    if not server.cfg.preload_app:
+        return
+    from core.conexiones import reiniciar_tras_fork
+    reiniciar_tras_fork()
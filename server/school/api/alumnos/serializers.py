@@ -1,8 +1,12 @@
 from rest_framework import serializers
+from school.api.campos import CamposDinamicosMixin
 
 
-class AlumnoSerializer(serializers.Serializer):
+class AlumnoSerializer(CamposDinamicosMixin, serializers.Serializer):
     """Serializer simplificado - solo validación de entrada/salida"""
+    # ?format=compact: sin alias ni campos de valor fijo; el ID del grado
+    # sale en gradoEstudioId (grado solo se usa como entrada)
+    campos_compactos = ('id', 'nombre', 'apellido', 'matricula', 'fecha_nacimiento', 'correo', 'gradoEstudioId', 'grado_nombre')
     id = serializers.IntegerField(read_only=True)
     nombre = serializers.CharField(max_length=100, required=True)
     apellido = serializers.CharField(max_length=100, required=True)
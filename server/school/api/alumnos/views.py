@@ -1,47 +1,132 @@
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException
 from rest_framework.response import Response
 from school.api.alumnos.serializers import AlumnoSerializer
+from school.api.campos import campos_pedidos
+from school.api.exports import exportar
+from school.api.importacion import leer_filas
+from school.api.condicional import PeticionCondicionalMixin
+from school.api.pagination import get_paginator
 from school.exceptions.domain_exceptions import (
     AlumnoNotFoundError,
     MatriculaDuplicadaError,
     GradoNotFoundError
 )
 
+ERROR_INVALID_ID = 'ID inválido'
 
-class AlumnoViewSet(viewsets.ViewSet):
+
+class AlumnoViewSet(PeticionCondicionalMixin, viewsets.ViewSet):
     """ViewSet delgado que delega a servicios"""
     permission_classes = []
     
+    COLUMNAS_EXPORTACION = [
+        ('id', 'id'),
+        ('nombre', 'nombre'),
+        ('apellido', 'apellido'),
+        ('matricula', 'matricula'),
+        ('fecha_nacimiento', 'fecha_nacimiento'),
+        ('correo', 'correo'),
+        ('grado', 'grado_id'),
+        ('grado_nombre', 'grado__nombre'),
+    ]
+    relaciones_condicional = ('grado',)  # la respuesta incluye grado_nombre
+    
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         from school.services.alumno_service import AlumnoService
         self.alumno_service = AlumnoService()
     
-    def list(self, request):
-        """Lista alumnos con filtros"""
+    @staticmethod
+    def _filtros(request):
+        """Extrae los filtros de la query string"""
         filtros = {
             'grado_id': request.query_params.get('grado'),
             'institucion_id': request.query_params.get('institucion'),
             'search': request.query_params.get('search')
         }
         # Limpiar None values
-        filtros = {k: v for k, v in filtros.items() if v is not None}
-        
+        return {k: v for k, v in filtros.items() if v is not None}
+    
+    def get_queryset_condicional(self):
+        return self.alumno_service.listar_alumnos(self._filtros(self.request))
+    
+    def list(self, request):
+        """Lista alumnos con filtros (paginado por página o por cursor)"""
+        return self._responder_condicional(self._listar, self.get_queryset_condicional, request)
+    
+    def _listar(self, request):
+        # ?fields=/?omit=/?format=compact: fuera del try, un campo desconocido es un 400
+        campos = campos_pedidos(request, AlumnoSerializer)
         try:
-            alumnos = self.alumno_service.listar_alumnos(filtros)
-            serializer = AlumnoSerializer(alumnos, many=True)
-            return Response(serializer.data)
+            alumnos = self.alumno_service.listar_alumnos(self._filtros(request), campos)
+            paginator = get_paginator(request)
+            pagina = paginator.paginate_queryset(alumnos, request, view=self)
+            serializer = AlumnoSerializer(
+                self.alumno_service.serializar_alumnos(pagina, campos), many=True, campos=campos
+            )
+            return paginator.get_paginated_response(serializer.data)
+        except APIException:
+            # Página o cursor fuera de rango (404): los responde el handler de la API
+            raise
         except Exception as e:
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @action(detail=False, methods=['get'])
+    def exportar(self, request):
+        """Exporta el listado de alumnos filtrado en streaming (?formato=csv|jsonl)"""
+        alumnos = self.alumno_service.listar_alumnos(self._filtros(request))
+        return exportar(request, alumnos, self.COLUMNAS_EXPORTACION, 'alumnos')
+    
+    @action(detail=False, methods=['post'])
+    def importar(self, request):
+        """
+        Importación masiva de alumnos.
+        
+        Acepta un arreglo JSON (o {alumnos: [...]}), un cuerpo text/csv o un
+        archivo CSV en el campo 'archivo', con columnas
+        nombre, apellido, matricula, fecha_nacimiento, correo, grado.
+        Las matrículas vacías se generan automáticamente.
+        
+        Returns:
+            201 Created: { recibidas, creadas, alumnos: [{fila, id, matricula}], errores }
+            400 Bad Request: formato inválido o ninguna fila válida
+        """
+        filas = leer_filas(request, 'alumnos')
+        if filas is None:
+            return Response(
+                {'error': 'Se esperaba un arreglo de alumnos o un CSV'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            resultado = self.alumno_service.importar_alumnos(filas)
+        except MatriculaDuplicadaError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_409_CONFLICT
+            )
+        
+        codigo = status.HTTP_201_CREATED
+        if filas and not resultado['creadas']:
+            codigo = status.HTTP_400_BAD_REQUEST
+        return Response(resultado, status=codigo)
+    
     def retrieve(self, request, pk=None):
         """Obtiene un alumno por ID"""
+        return self._responder_condicional(
+            self._obtener, lambda: self.get_queryset_condicional().filter(pk=int(pk)), request, pk=pk
+        )
+    
+    def _obtener(self, request, pk=None):
+        campos = campos_pedidos(request, AlumnoSerializer)
         try:
             alumno = self.alumno_service.obtener_alumno(int(pk))
-            serializer = AlumnoSerializer(alumno)
+            serializer = AlumnoSerializer(alumno, campos=campos)
             return Response(serializer.data)
         except AlumnoNotFoundError as e:
             return Response(
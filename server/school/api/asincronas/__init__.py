@@ -0,0 +1,3 @@
+"""
+Módulo de API con las lecturas async (alumnos, calificaciones y dashboard)
+"""
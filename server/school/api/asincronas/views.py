@@ -0,0 +1,194 @@
+"""
+Variantes async de las lecturas más frecuentes
+
+    GET /api/async/alumnos/             == GET /api/alumnos/
+    GET /api/async/alumnos/{id}/        == GET /api/alumnos/{id}/
+    GET /api/async/calificaciones/      == GET /api/calificaciones/
+    GET /api/async/dashboard/stats/     == GET /api/dashboard/stats/
+
+Devuelven el mismo JSON que las vistas sync (mismos serializers y
+JSONRapidoRenderer) y admiten los mismos filtros, modos de paginación y
+peticiones condicionales. Usan el ORM async (aaggregate, acount, aget y
+`async for` sobre la página), de modo que bajo ASGI (core.asgi,
+SERVIDOR=asgi) el event loop sigue atendiendo otras peticiones mientras
+una espera a la base de datos.
+
+También admiten ?fields=, ?omit= y ?format=compact (school.api.campos).
+
+Además ahorran viajes a la base:
+    - El listado reutiliza el total de los validadores condicionales como
+      `count` de la página (la versión sync repite el COUNT(*)).
+    - El detalle calcula los validadores desde la fila leída (una consulta
+      en lugar de dos).
+
+Son vistas de Django (no de DRF): no pasan por la autenticación ni los
+permisos de DRF, igual que las versiones sync, que son públicas.
+"""
+import time
+from typing import Optional
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from school.api.alumnos.serializers import AlumnoSerializer
+from school.api.alumnos.views import AlumnoViewSet, ERROR_INVALID_ID
+from school.api.campos import campos_pedidos
+from school.api.condicional import (
+    CAMPO_MODIFICACION,
+    aplicar_validadores,
+    avalidadores,
+    calcular_etag,
+    no_modificado,
+    relaciones_con_marca,
+)
+from school.api.exceptions import custom_exception_handler
+from school.api.pagination import get_paginator
+from school.api.query_plans import build_query_plan
+from school.api.renderers import JSONRapidoRenderer
+from school.api.serializers import CalificacionSerializer
+from school.api.views import CalificacionViewSet
+from school.exceptions.domain_exceptions import AlumnoNotFoundError
+from school.models import Calificacion
+from school.services.alumno_service import AlumnoService
+from school.services.estadisticas_service import EstadisticasService
+
+
+def responder(request, datos, estado: int = status.HTTP_200_OK) -> HttpResponse:
+    """Renderiza con el renderer JSON de la API (mismos bytes que la vista sync)"""
+    inicio = time.perf_counter()
+    contenido = JSONRapidoRenderer().render(datos)
+    if hasattr(request, '_metricas_render'):
+        request._metricas_render += time.perf_counter() - inicio
+    return HttpResponse(contenido, status=estado, content_type='application/json')
+
+
+class LecturaAsyncView(View):
+    """
+    Base de las vistas async: solo lectura, query_params como en DRF y
+    errores de DRF (página inválida, cursor inválido) con el handler de la API.
+    """
+    http_method_names = ['get', 'head', 'options']
+    cursor_ordering = ('id',)
+
+    async def dispatch(self, request, *args, **kwargs):
+        # Request de DRF solo para query_params; no autentica hasta que se pide .user
+        self.api_request = Request(request)
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except APIException as exc:
+            respuesta = custom_exception_handler(exc, {'view': self, 'request': self.api_request})
+            return responder(request, respuesta.data, respuesta.status_code)
+
+    async def listar(self, queryset, relaciones, serializar) -> HttpResponse:
+        """Validadores, 304 si corresponde y página serializada"""
+        ultima, total = await avalidadores(queryset, relaciones_con_marca(queryset.model, relaciones))
+        etag = calcular_etag(self.request, ultima, total)
+        if no_modificado(self.request, etag, ultima):
+            return aplicar_validadores(HttpResponse(status=status.HTTP_304_NOT_MODIFIED), etag, ultima)
+
+        paginator = get_paginator(self.api_request)
+        pagina = await paginator.apaginate_queryset(queryset, self.api_request, view=self, total=total)
+        datos = paginator.get_paginated_response(serializar(pagina)).data
+        return aplicar_validadores(responder(self.request, datos), etag, ultima)
+
+
+class AlumnoListaAsyncView(LecturaAsyncView):
+    """GET /api/async/alumnos/ (filtros grado, institucion y search)"""
+
+    alumno_service = AlumnoService()
+
+    async def get(self, request):
+        filtros = AlumnoViewSet._filtros(self.api_request)
+        self.campos = campos_pedidos(self.api_request, AlumnoSerializer)
+        try:
+            if filtros.get('search'):
+                # El buscador en memoria puede construir su índice: consulta sync
+                alumnos = await sync_to_async(self.alumno_service.listar_alumnos)(filtros, self.campos)
+            else:
+                alumnos = self.alumno_service.listar_alumnos(filtros, self.campos)
+            return await self.listar(alumnos, AlumnoViewSet.relaciones_condicional, self._serializar)
+        except ValueError as e:
+            return responder(request, {'error': str(e)}, status.HTTP_400_BAD_REQUEST)
+
+    def _serializar(self, pagina):
+        return AlumnoSerializer(
+            self.alumno_service.serializar_alumnos(pagina, self.campos), many=True, campos=self.campos
+        ).data
+
+
+class AlumnoDetalleAsyncView(LecturaAsyncView):
+    """GET /api/async/alumnos/{id}/"""
+
+    alumno_service = AlumnoService()
+
+    async def get(self, request, pk):
+        campos = campos_pedidos(self.api_request, AlumnoSerializer)
+        try:
+            alumno = await self.alumno_service.aobtener_alumno(int(pk))
+        except AlumnoNotFoundError as e:
+            return responder(request, {'error': str(e)}, status.HTTP_404_NOT_FOUND)
+        except ValueError:
+            return responder(request, {'error': ERROR_INVALID_ID}, status.HTTP_400_BAD_REQUEST)
+
+        # Mismos validadores que la versión sync: la fila y su grado, total 1
+        fechas = [getattr(alumno, CAMPO_MODIFICACION)]
+        if alumno.grado is not None:
+            fechas.append(getattr(alumno.grado, CAMPO_MODIFICACION))
+        ultima = max((fecha for fecha in fechas if fecha is not None), default=None)
+        etag = calcular_etag(request, ultima, 1)
+        if no_modificado(request, etag, ultima):
+            return aplicar_validadores(HttpResponse(status=status.HTTP_304_NOT_MODIFIED), etag, ultima)
+
+        datos = AlumnoSerializer(self.alumno_service.serializar_alumnos([alumno], campos)[0], campos=campos).data
+        return aplicar_validadores(responder(request, datos), etag, ultima)
+
+
+class CalificacionListaAsyncView(LecturaAsyncView):
+    """GET /api/async/calificaciones/ (filtros alumno, materia y periodo)"""
+
+    cursor_ordering = CalificacionViewSet.cursor_ordering
+    FILTROS = {'alumno': 'alumno_id', 'materia': 'materia_id', 'periodo': 'periodo_id'}
+
+    async def get(self, request):
+        self.campos = campos_pedidos(self.api_request, CalificacionSerializer)
+        plan = build_query_plan(
+            CalificacionSerializer, model=Calificacion, campos=self.campos,
+            adicionales=self.cursor_ordering if self.campos is not None else (),
+        )
+        queryset = plan.apply(Calificacion.objects.all())
+        try:
+            for parametro, campo in self.FILTROS.items():
+                valor = self.api_request.query_params.get(parametro)
+                if valor:
+                    queryset = queryset.filter(**{campo: valor})
+            return await self.listar(queryset, plan.select_related, self._serializar)
+        except ValueError as e:
+            return responder(request, {'error': str(e)}, status.HTTP_400_BAD_REQUEST)
+
+    def _serializar(self, pagina):
+        return CalificacionSerializer(pagina, many=True, campos=self.campos).data
+
+
+class EstadisticasAsyncView(LecturaAsyncView):
+    """GET /api/async/dashboard/stats/ (?institucion=, ?cache=false)"""
+
+    estadisticas_service = EstadisticasService()
+
+    async def get(self, request):
+        institucion: Optional[int] = None
+        valor = self.api_request.query_params.get('institucion')
+        if valor:
+            try:
+                institucion = int(valor)
+            except ValueError:
+                return responder(
+                    request,
+                    {'error': 'El parámetro institucion debe ser un ID entero'},
+                    status.HTTP_400_BAD_REQUEST
+                )
+
+        usar_cache = self.api_request.query_params.get('cache', '').lower() != 'false'
+        conteos = await self.estadisticas_service.aestadisticas(institucion, usar_cache=usar_cache)
+        return responder(request, {'institucion': institucion, **conteos})
@@ -0,0 +1,353 @@
+"""
+Autenticación por token con caché
+
+TokenAuthentication de DRF consulta Token JOIN User en cada petición.
+TokenCacheadoAuthentication resuelve el token en dos niveles:
+
+    1. LRU en memoria del proceso, acotado (AUTH_TOKEN_CACHE_MAX entradas)
+       y con vencimiento (AUTH_TOKEN_CACHE_TTL segundos)
+    2. Opcional: la caché de Django (AUTH_TOKEN_CACHE_COMPARTIDA=True, ej.
+       Redis), compartida entre procesos; el LRU local usa entonces
+       AUTH_TOKEN_CACHE_TTL_LOCAL para acotar cuánto tarda otro proceso en
+       ver una revocación
+
+Las entradas se guardan serializadas (cada petición recibe su propia copia
+del usuario) y con la clave SHA-256 del token, nunca el token en claro.
+Las señales de school/signals.py las invalidan al borrar un token (logout)
+y al guardar un usuario (desactivación, cambio de rol). En el proceso que
+hace el cambio el efecto es inmediato; en los demás, como máximo tras el
+TTL del LRU local.
+
+Acceso firmado (AUTH_TOKEN_MODO=firmado)
+
+El login entrega un token de acceso de vida corta (AUTH_ACCESO_TTL) firmado
+con django.core.signing (HMAC con SECRET_KEY) que lleva el ID, el rol, la
+expiración y los datos de `me`; AccesoFirmadoAuthentication
+(`Authorization: Bearer ...`) lo verifica sin consultar la base y `me`
+responde desde las claims. Junto a él se entrega un token de refresco
+(RefreshToken, AUTH_REFRESH_TTL) para pedir otro acceso en
+POST /api/auth/refresh/; cada uso lo rota y reutilizar uno ya rotado revoca
+todos los del usuario. El acceso no se puede revocar: el logout revoca los
+refrescos y el acceso deja de valer al expirar.
+
+SesionAuthentication evita además leer la sesión cuando la petición trae
+`Authorization: Token ...` o `Bearer ...`. /api/_metrics/ expone aciertos y
+fallos de la caché y el resultado de verificar los accesos firmados.
+"""
+import hashlib
+import pickle
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Iterable, Optional, Tuple
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.authentication import (
+    BaseAuthentication,
+    SessionAuthentication,
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework.exceptions import AuthenticationFailed
+from core import metricas
+
+
+PREFIJO_CLAVE = 'auth:token:'
+SALT_ACCESO = 'school.api.autenticacion.acceso'
+KEYWORD_ACCESO = 'Bearer'
+
+
+def _huella(key: str) -> str:
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+class LRUConVencimiento:
+    """Diccionario acotado: descarta la entrada menos usada y las vencidas"""
+
+    def __init__(self, maximo: int, ttl: float):
+        self.maximo = maximo
+        self.ttl = ttl
+        self._datos: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, clave):
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return None
+            vence, valor = entrada
+            if vence <= time.monotonic():
+                del self._datos[clave]
+                return None
+            self._datos.move_to_end(clave)
+            return valor
+
+    def guardar(self, clave, valor) -> None:
+        with self._lock:
+            self._datos[clave] = (time.monotonic() + self.ttl, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maximo:
+                self._datos.popitem(last=False)
+
+    def quitar(self, clave) -> None:
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self):
+        return len(self._datos)
+
+
+class CacheTokens:
+    """Token -> (usuario, token) en el LRU local y, si se configura, en la caché compartida"""
+
+    def __init__(self):
+        self.ttl = getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 60)
+        self.compartida = getattr(settings, 'AUTH_TOKEN_CACHE_COMPARTIDA', False)
+        ttl_local = getattr(settings, 'AUTH_TOKEN_CACHE_TTL_LOCAL', 5) if self.compartida else self.ttl
+        self.local = LRUConVencimiento(getattr(settings, 'AUTH_TOKEN_CACHE_MAX', 1024), min(ttl_local, self.ttl))
+        self.resultados = metricas.Contador(
+            'auth_token_cache_total', 'Resoluciones de token por resultado', ('resultado',)
+        )
+
+    @property
+    def habilitada(self) -> bool:
+        return self.ttl > 0
+
+    def obtener(self, key: str):
+        """(usuario, token) o None si no está cacheado"""
+        huella = _huella(key)
+        datos = self.local.obtener(huella)
+        if datos is not None:
+            self.resultados.incrementar('acierto_local')
+            return pickle.loads(datos)
+        if self.compartida:
+            datos = cache.get(PREFIJO_CLAVE + huella)
+            if datos is not None:
+                self.resultados.incrementar('acierto_compartido')
+                self.local.guardar(huella, datos)
+                return pickle.loads(datos)
+        self.resultados.incrementar('fallo')
+        return None
+
+    def guardar(self, key: str, usuario, token) -> None:
+        huella = _huella(key)
+        datos = pickle.dumps((usuario, token), protocol=pickle.HIGHEST_PROTOCOL)
+        self.local.guardar(huella, datos)
+        if self.compartida:
+            cache.set(PREFIJO_CLAVE + huella, datos, timeout=self.ttl)
+
+    def invalidar(self, keys: Iterable[str]) -> None:
+        huellas = [_huella(key) for key in keys]
+        for huella in huellas:
+            self.local.quitar(huella)
+        if self.compartida and huellas:
+            cache.delete_many([PREFIJO_CLAVE + huella for huella in huellas])
+
+    def exponer(self):
+        lineas = self.resultados.exponer()
+        lineas.extend([
+            '# HELP auth_token_cache_entradas Tokens en el LRU local',
+            '# TYPE auth_token_cache_entradas gauge',
+            f'auth_token_cache_entradas {len(self.local)}',
+        ])
+        return lineas
+
+
+_cache_tokens: Optional[CacheTokens] = None
+_cache_lock = threading.Lock()
+
+
+def cache_tokens() -> CacheTokens:
+    """Instancia del proceso (se crea al primer uso, con los settings ya cargados)"""
+    global _cache_tokens
+    if _cache_tokens is None:
+        with _cache_lock:
+            if _cache_tokens is None:
+                _cache_tokens = metricas.registrar(CacheTokens())
+    return _cache_tokens
+
+
+def invalidar_tokens(keys: Iterable[str]) -> None:
+    """Quita los tokens dados de la caché (logout, token borrado)"""
+    cache_tokens().invalidar(keys)
+
+
+def invalidar_usuario(user_id: int) -> None:
+    """Quita los tokens de un usuario (desactivado o con datos nuevos)"""
+    from rest_framework.authtoken.models import Token
+    invalidar_tokens(Token.objects.filter(user_id=user_id).values_list('key', flat=True))
+
+
+class TokenCacheadoAuthentication(TokenAuthentication):
+    """TokenAuthentication que evita la consulta Token JOIN User mientras el token esté cacheado"""
+
+    def authenticate_credentials(self, key):
+        cache_local = cache_tokens()
+        if not cache_local.habilitada:
+            return super().authenticate_credentials(key)
+        cacheado = cache_local.obtener(key)
+        if cacheado is not None:
+            return cacheado
+        # Token inválido o usuario inactivo: AuthenticationFailed, no se cachea
+        usuario, token = super().authenticate_credentials(key)
+        cache_local.guardar(key, usuario, token)
+        return usuario, token
+
+
+def rol_de(user) -> str:
+    """
+    Rol del sistema educativo según los permisos de Django:
+        - Administrador: superusuario (gestión completa)
+        - Docente: staff (gestiona cursos y alumnos)
+        - Estudiante: usuario regular
+    """
+    if user.is_superuser:
+        return 'Administrador'
+    if user.is_staff:
+        return 'Docente'
+    return 'Estudiante'
+
+
+VERIFICACIONES = metricas.registrar(
+    metricas.Contador('auth_acceso_firmado_total', 'Tokens de acceso firmados verificados por resultado', ('resultado',))
+)
+
+
+class UsuarioFirmado:
+    """Usuario reconstruido desde las claims del acceso firmado, sin consultar la base"""
+
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, claims: dict):
+        self.claims = claims
+        self.id = self.pk = claims['uid']
+        self.rol = claims['rol']
+        self.username = claims['datos'].get('username', '')
+        self.is_superuser = self.rol == 'Administrador'
+        self.is_staff = self.rol in ('Administrador', 'Docente')
+
+    def get_username(self):
+        return self.username
+
+    def __str__(self):
+        return self.username
+
+
+def emitir_acceso(user) -> Tuple[str, int]:
+    """Token de acceso firmado y su duración en segundos"""
+    from school.api.serializers import UserSerializer
+    ttl = getattr(settings, 'AUTH_ACCESO_TTL', 300)
+    claims = {
+        'uid': user.pk,
+        'rol': rol_de(user),
+        'exp': int(time.time()) + ttl,
+        'datos': dict(UserSerializer(user).data),
+    }
+    return signing.dumps(claims, salt=SALT_ACCESO, compress=True), ttl
+
+
+def leer_acceso(token: str) -> dict:
+    """Claims de un acceso firmado; AuthenticationFailed si la firma no es válida o expiró"""
+    try:
+        claims = signing.loads(token, salt=SALT_ACCESO)
+    except signing.BadSignature:
+        VERIFICACIONES.incrementar('invalido')
+        raise AuthenticationFailed('Token de acceso inválido')
+    if claims.get('exp', 0) <= time.time():
+        VERIFICACIONES.incrementar('expirado')
+        raise AuthenticationFailed('Token de acceso expirado')
+    VERIFICACIONES.incrementar('valido')
+    return claims
+
+
+def emitir_refresh(user) -> str:
+    """Crea un token de refresco; el valor en claro solo lo recibe el cliente"""
+    from school.models import RefreshToken
+    valor = secrets.token_urlsafe(32)
+    RefreshToken.objects.create(
+        usuario=user,
+        huella=_huella(valor),
+        expira_en=timezone.now() + timedelta(seconds=getattr(settings, 'AUTH_REFRESH_TTL', 14 * 24 * 3600)),
+    )
+    return valor
+
+
+def revocar_refresh(user_id: int, valor: Optional[str] = None) -> int:
+    """Revoca un token de refresco del usuario o, sin `valor`, todos los vigentes"""
+    from school.models import RefreshToken
+    vigentes = RefreshToken.objects.filter(usuario_id=user_id, revocado_en__isnull=True)
+    if valor:
+        vigentes = vigentes.filter(huella=_huella(valor))
+    return vigentes.update(revocado_en=timezone.now())
+
+
+def rotar_refresh(valor: str):
+    """
+    Consume un token de refresco y devuelve (usuario, nuevo refresco).
+    Un token ya rotado indica que se copió: se revocan todos los del usuario.
+    """
+    from school.models import RefreshToken
+    ahora = timezone.now()
+    with transaction.atomic():
+        registro = (
+            RefreshToken.objects.select_for_update()
+            .select_related('usuario')
+            .filter(huella=_huella(valor))
+            .first()
+        )
+        vigente = (
+            registro is not None and registro.revocado_en is None
+            and registro.expira_en > ahora and registro.usuario.is_active
+        )
+        if vigente:
+            registro.revocado_en = ahora
+            registro.save(update_fields=['revocado_en'])
+            return registro.usuario, emitir_refresh(registro.usuario)
+    if registro is not None and registro.revocado_en is not None:
+        revocar_refresh(registro.usuario_id)
+    raise AuthenticationFailed('Token de refresco inválido o expirado')
+
+
+class AccesoFirmadoAuthentication(BaseAuthentication):
+    """`Authorization: Bearer <acceso firmado>`; request.auth son las claims"""
+
+    keyword = KEYWORD_ACCESO
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed('Cabecera Authorization inválida')
+        try:
+            token = auth[1].decode()
+        except UnicodeError:
+            raise AuthenticationFailed('Cabecera Authorization inválida')
+        claims = leer_acceso(token)
+        return UsuarioFirmado(claims), claims
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+class SesionAuthentication(SessionAuthentication):
+    """SessionAuthentication que no lee la sesión si la petición trae un token"""
+
+    keywords = (TokenAuthentication.keyword.lower().encode(), KEYWORD_ACCESO.lower().encode())
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if auth and auth[0].lower() in self.keywords:
+            return None
+        return super().authenticate(request)
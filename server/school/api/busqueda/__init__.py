@@ -0,0 +1,3 @@
+"""
+Módulo de API para Búsqueda
+"""
@@ -0,0 +1,93 @@
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from school.busqueda import buscador
+from school.models import Alumno, Personal
+
+
+# Tipo -> (queryset base, lookup de institución, campos devueltos)
+TIPOS = {
+    'alumnos': (Alumno.objects.all(), 'grado__institucion_id', ('nombre', 'apellido', 'matricula', 'grado_id')),
+    'personal': (Personal.objects.all(), 'institucion_id', ('nombre', 'apellido', 'cedula', 'cargo', 'institucion_id')),
+}
+
+MAX_LIMITE = 50
+
+
+class BusquedaViewSet(viewsets.ViewSet):
+    """Búsqueda de alumnos y personal sin distinguir acentos, ordenada por similitud"""
+
+    def _parametros(self, request, limite_por_defecto):
+        """Devuelve (consulta, tipos, institucion, limite) o una Response de error"""
+        consulta = (request.query_params.get('q') or '').strip()
+        if not consulta:
+            return Response({'error': "El parámetro 'q' es requerido"}, status=status.HTTP_400_BAD_REQUEST)
+
+        tipo = request.query_params.get('tipo')
+        if tipo and tipo not in TIPOS:
+            return Response(
+                {'error': f"Tipo no válido: {tipo}. Use: {', '.join(TIPOS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limite = int(request.query_params.get('limite', limite_por_defecto))
+            institucion = request.query_params.get('institucion')
+            institucion = int(institucion) if institucion else None
+        except ValueError:
+            return Response(
+                {'error': 'limite e institucion deben ser enteros'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limite = max(1, min(limite, MAX_LIMITE))
+        return consulta, [tipo] if tipo else list(TIPOS), institucion, limite
+
+    def _resultados(self, request, limite_por_defecto, autocompletar):
+        parametros = self._parametros(request, limite_por_defecto)
+        if isinstance(parametros, Response):
+            return parametros
+        consulta, tipos, institucion, limite = parametros
+
+        resultados = []
+        for tipo in tipos:
+            queryset, lookup_institucion, campos = TIPOS[tipo]
+            queryset = queryset.all()
+            if institucion is not None:
+                queryset = queryset.filter(**{lookup_institucion: institucion})
+            motor = buscador(tipo)
+            encontrados = (motor.autocompletar if autocompletar else motor.buscar)(queryset, consulta, limite)
+            resultados.extend(
+                {
+                    'tipo': tipo,
+                    'id': objeto.pk,
+                    **{campo: getattr(objeto, campo) for campo in campos},
+                    'puntaje': round(puntaje, 4),
+                }
+                for objeto, puntaje in encontrados
+            )
+        resultados.sort(key=lambda resultado: -resultado['puntaje'])
+        return Response({'q': consulta, 'resultados': resultados[:limite]})
+
+    def list(self, request):
+        """
+        GET /api/busqueda/?q=jose perez
+
+        Filas que contienen todos los términos (sin distinguir acentos ni
+        mayúsculas), ordenadas por similitud.
+
+        Query params:
+            q: texto a buscar (requerido)
+            tipo: 'alumnos' o 'personal' (por defecto ambos)
+            institucion: limita a una institución
+            limite: máximo de resultados (por defecto 20, máximo 50)
+        """
+        return self._resultados(request, 20, autocompletar=False)
+
+    @action(detail=False, methods=['get'])
+    def autocompletar(self, request):
+        """
+        GET /api/busqueda/autocompletar/?q=jose pe
+
+        Igual que la búsqueda, pero el último término se toma como prefijo de
+        palabra ('pe' encuentra 'Pérez'). Mismos parámetros; limite por defecto 10.
+        """
+        return self._resultados(request, 10, autocompletar=True)
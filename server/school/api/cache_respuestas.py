@@ -0,0 +1,99 @@
+"""
+Caché de respuestas para datos de referencia
+
+Las respuestas de list/retrieve se guardan en la caché versionada
+(school.cache) bajo el espacio de nombres del viewset, con una clave que
+incluye la acción, el ID, los parámetros de la query string, el Accept y el
+host (los enlaces de paginación son absolutos). Las señales invalidan el
+espacio al guardar o borrar un objeto.
+
+Con PeticionCondicionalMixin este mixin va antes en la herencia: los
+validadores (ETag / Last-Modified) se calculan al llenar la entrada y se
+guardan con ella, de modo que tanto el 200 como el 304 de un acierto se
+responden sin consultas a la base de datos.
+"""
+import json
+from django.conf import settings
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+from school.api.condicional import aplicar_validadores, no_modificado
+from school.cache import obtener_o_calcular
+
+
+def preparar_entrada(datos, validadores=None) -> dict:
+    """
+    Entrada de caché {data, validadores}: `data` se reduce a tipos JSON
+    simples (ReturnDict/ReturnList conservan una referencia al serializer);
+    `validadores` es (etag, última modificación) o None.
+    """
+    return {
+        'data': json.loads(json.dumps(datos, cls=JSONEncoder, ensure_ascii=False)),
+        'validadores': validadores,
+    }
+
+
+class CacheRespuestaMixin:
+    """
+    Cachea list y retrieve de un ModelViewSet.
+
+    Atributos:
+        cache_namespaces: espacios de nombres de los que depende la respuesta;
+            el primero identifica al recurso
+        cache_timeout: segundos (por defecto settings.REFERENCIA_CACHE_TTL; 0 desactiva)
+
+    `?cache=false` omite la caché.
+    """
+
+    cache_namespaces = ()
+    cache_timeout = None
+
+    def get_cache_timeout(self) -> int:
+        if self.cache_timeout is not None:
+            return self.cache_timeout
+        return getattr(settings, 'REFERENCIA_CACHE_TTL', 3600)
+
+    def _no_modificado(self, request, etag, ultima) -> bool:
+        # PeticionCondicionalMixin pregunta al llenar la entrada: se guardan
+        # los validadores y se calcula siempre la respuesta completa
+        self._validadores = (etag, ultima)
+        return False
+
+    def _respuesta_cacheada(self, calcular, request, *args, **kwargs):
+        calculada = {}
+
+        def calcular_entrada():
+            self._validadores = None
+            respuesta = calculada['respuesta'] = calcular(request, *args, **kwargs)
+            if respuesta.status_code != status.HTTP_200_OK:
+                return None
+            return preparar_entrada(respuesta.data, self._validadores)
+
+        timeout = self.get_cache_timeout()
+        if not timeout or request.query_params.get('cache', '').lower() == 'false':
+            entrada = calcular_entrada()
+        else:
+            partes = (
+                self.action, kwargs, sorted(request.query_params.lists()),
+                request.headers.get('Accept', ''), request.build_absolute_uri('/'),
+            )
+            entrada = obtener_o_calcular(self.cache_namespaces, partes, calcular_entrada, timeout=timeout)
+        if entrada is None:
+            # Las respuestas que no son 200 no se cachean y se devuelven tal cual
+            return calculada['respuesta']
+
+        validadores = entrada.get('validadores')
+        if validadores is None:
+            return Response(entrada['data'])
+        etag, ultima = validadores
+        if no_modificado(request, etag, ultima):
+            respuesta = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            respuesta = Response(entrada['data'])
+        return aplicar_validadores(respuesta, etag, ultima)
+
+    def list(self, request, *args, **kwargs):
+        return self._respuesta_cacheada(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._respuesta_cacheada(super().retrieve, request, *args, **kwargs)
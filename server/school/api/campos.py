@@ -0,0 +1,110 @@
+"""
+Selección de campos de las respuestas de lectura (listado y detalle)
+
+    ?fields=id,nombre,apellido     solo esos campos
+    ?omit=correo,telefono          todos los campos menos esos
+    ?format=compact                representación compacta: sin los alias para
+                                   el frontend ni los campos de valor fijo
+
+Los campos salen siempre en el orden del serializer. `omit` se combina con
+los otros dos (`?format=compact&omit=correo`); con `fields` la representación
+compacta no cambia nada, porque ya se eligieron los campos. Un nombre que el
+serializer no tiene responde 400 con la lista de campos disponibles.
+
+Cada serializer declara su representación compacta en `campos_compactos`
+(sin el atributo, la compacta es la completa). `format` es el parámetro con
+el que DRF elige el renderer (URL_FORMAT_OVERRIDE): `compact` corresponde a
+JSONCompactoRenderer (school.api.renderers), que escribe el mismo JSON.
+
+Los campos que no se piden tampoco se leen de la base: los planes de
+consulta (school.api.query_plans) y de lectura por valores
+(school.api.lectura_valores) se derivan solo de los campos elegidos, y el
+listado de alumnos aplica .only() con las columnas que necesitan
+(AlumnoService.COLUMNAS_CAMPO).
+"""
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+
+PARAMETRO_CAMPOS = 'fields'
+PARAMETRO_OMITIR = 'omit'
+FORMATO_COMPACTO = 'compact'
+
+# Acciones de los ModelViewSets cuya respuesta admite selección de campos
+ACCIONES = ('list', 'retrieve')
+
+
+@lru_cache(maxsize=None)
+def campos_legibles(serializer_class) -> Tuple[str, ...]:
+    """Campos de la representación del serializer, en su orden"""
+    return tuple(nombre for nombre, campo in serializer_class().fields.items() if not campo.write_only)
+
+
+def _nombres(valor: str) -> List[str]:
+    return [nombre.strip() for nombre in valor.split(',') if nombre.strip()]
+
+
+def es_compacto(request) -> bool:
+    return request.query_params.get(api_settings.URL_FORMAT_OVERRIDE) == FORMATO_COMPACTO
+
+
+def campos_pedidos(request, serializer_class) -> Optional[Tuple[str, ...]]:
+    """
+    Campos a emitir según fields/omit/format; None si son todos.
+    ValidationError (400) si se nombra un campo que el serializer no tiene.
+    """
+    disponibles = campos_legibles(serializer_class)
+    pedidos = _nombres(request.query_params.get(PARAMETRO_CAMPOS, ''))
+    omitidos = _nombres(request.query_params.get(PARAMETRO_OMITIR, ''))
+    desconocidos = [nombre for nombre in pedidos + omitidos if nombre not in disponibles]
+    if desconocidos:
+        raise ValidationError({
+            PARAMETRO_CAMPOS if desconocidos[0] in pedidos else PARAMETRO_OMITIR: [
+                f"Campos no válidos: {', '.join(desconocidos)}. Disponibles: {', '.join(disponibles)}"
+            ]
+        })
+
+    if pedidos:
+        base = set(pedidos)
+    elif es_compacto(request):
+        base = set(getattr(serializer_class, 'campos_compactos', None) or disponibles)
+    else:
+        base = set(disponibles)
+    campos = tuple(nombre for nombre in disponibles if nombre in base and nombre not in omitidos)
+    return None if campos == disponibles else campos
+
+
+class CamposDinamicosMixin:
+    """
+    Mixin para serializers: `Serializer(..., campos=('id', 'nombre'))` solo
+    representa esos campos (los demás se quitan de `fields`).
+    """
+
+    def __init__(self, *args, campos=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if campos is not None:
+            for nombre in [nombre for nombre in self.fields if nombre not in campos]:
+                self.fields.pop(nombre)
+
+
+class SeleccionCamposMixin:
+    """
+    Mixin para ModelViewSets: aplica ?fields=/?omit=/?format=compact a
+    `list` y `retrieve`. QueryPlanMixin y LecturaValoresMixin consultan
+    get_campos_respuesta() para leer solo las columnas de esos campos.
+    """
+
+    def get_campos_respuesta(self) -> Optional[Tuple[str, ...]]:
+        if self.request is None or getattr(self, 'action', None) not in ACCIONES:
+            return None
+        if not hasattr(self, '_campos_respuesta'):
+            self._campos_respuesta = campos_pedidos(self.request, self.get_serializer_class())
+        return self._campos_respuesta
+
+    def get_serializer(self, *args, **kwargs):
+        campos = self.get_campos_respuesta()
+        if campos is not None:
+            kwargs.setdefault('campos', campos)
+        return super().get_serializer(*args, **kwargs)
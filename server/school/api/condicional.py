@@ -0,0 +1,158 @@
+"""
+Peticiones condicionales (ETag / Last-Modified)
+
+Antes de serializar, list y retrieve calculan validadores baratos con una
+sola consulta agregada sobre el queryset filtrado: la fecha de modificación
+más reciente (`actualizado_en`, incluida la de las relaciones que el
+serializer muestra) y el número de filas. Si el cliente envía
+If-None-Match o If-Modified-Since y los validadores coinciden se responde
+304 sin cuerpo, sin paginar y sin serializar.
+
+El conteo forma parte del ETag para detectar borrados, que no cambian la
+fecha máxima. Last-Modified no puede detectarlos, por eso If-None-Match
+tiene prioridad cuando el cliente envía ambos.
+"""
+import hashlib
+import json
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Count, Max, QuerySet
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+CAMPO_MODIFICACION = 'actualizado_en'
+
+
+def relaciones_con_marca(model, relaciones: Sequence[str]) -> Tuple[str, ...]:
+    """Filtra las rutas de select_related cuyo modelo final tiene `actualizado_en`"""
+    validas = []
+    for ruta in relaciones:
+        actual = model
+        for parte in ruta.split('__'):
+            actual = actual._meta.get_field(parte).related_model
+        try:
+            actual._meta.get_field(CAMPO_MODIFICACION)
+        except FieldDoesNotExist:
+            continue
+        validas.append(ruta)
+    return tuple(validas)
+
+
+def _agregados(relaciones: Sequence[str]) -> dict:
+    agregados = {'total': Count('pk'), 'ultima': Max(CAMPO_MODIFICACION)}
+    for indice, ruta in enumerate(relaciones):
+        agregados[f'ultima_{indice}'] = Max(f'{ruta}__{CAMPO_MODIFICACION}')
+    return agregados
+
+
+def _resultado(datos: dict) -> Tuple[Optional[datetime], int]:
+    total = datos.pop('total')
+    fechas = [fecha for fecha in datos.values() if fecha is not None]
+    return max(fechas, default=None), total
+
+
+def validadores(queryset: QuerySet, relaciones: Sequence[str] = ()) -> Tuple[Optional[datetime], int]:
+    """(última modificación, total de filas) del queryset en una consulta"""
+    return _resultado(queryset.order_by().aggregate(**_agregados(relaciones)))
+
+
+async def avalidadores(queryset: QuerySet, relaciones: Sequence[str] = ()) -> Tuple[Optional[datetime], int]:
+    """Versión async de validadores() (aaggregate)"""
+    return _resultado(await queryset.order_by().aaggregate(**_agregados(relaciones)))
+
+
+def _sin_prefijo_debil(etag: str) -> str:
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def calcular_etag(request, ultima, total) -> str:
+    """ETag débil a partir de los validadores y de la representación pedida"""
+    huella = json.dumps([
+        ultima.isoformat() if ultima else None, total,
+        request.get_full_path(), request.headers.get('Accept', ''),
+    ])
+    return 'W/' + quote_etag(hashlib.sha1(huella.encode('utf-8')).hexdigest())
+
+
+def no_modificado(request, etag, ultima) -> bool:
+    """True si los validadores del cliente siguen siendo vigentes"""
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        etiquetas = {_sin_prefijo_debil(etiqueta) for etiqueta in parse_etags(if_none_match)}
+        return '*' in etiquetas or _sin_prefijo_debil(etag) in etiquetas
+    desde = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return desde is not None and ultima is not None and int(ultima.timestamp()) <= desde
+
+
+def aplicar_validadores(respuesta, etag, ultima):
+    """Cabeceras ETag, Last-Modified y Cache-Control: no-cache"""
+    respuesta['ETag'] = etag
+    if ultima is not None:
+        respuesta['Last-Modified'] = http_date(ultima.timestamp())
+    # Sin frescura heurística: el navegador revalida siempre con los validadores
+    patch_cache_control(respuesta, no_cache=True)
+    return respuesta
+
+
+class PeticionCondicionalMixin:
+    """
+    Añade ETag y Last-Modified a list y retrieve y responde 304 cuando corresponde.
+
+    Atributos:
+        relaciones_condicional: rutas de FK cuya modificación cambia la respuesta
+            (por defecto, el select_related del plan de consulta si lo hay)
+    """
+
+    relaciones_condicional = None
+
+    def get_queryset_condicional(self) -> QuerySet:
+        """Queryset cuyos validadores describen la respuesta (ya filtrado)"""
+        return self.filter_queryset(self.get_queryset())
+
+    def get_relaciones_condicional(self, model) -> Tuple[str, ...]:
+        relaciones = self.relaciones_condicional
+        if relaciones is None:
+            relaciones = self.get_query_plan().select_related if hasattr(self, 'get_query_plan') else ()
+        return relaciones_con_marca(model, relaciones)
+
+    def _etag(self, request, ultima, total) -> str:
+        return calcular_etag(request, ultima, total)
+
+    @staticmethod
+    def _no_modificado(request, etag, ultima) -> bool:
+        return no_modificado(request, etag, ultima)
+
+    def _responder_condicional(self, calcular, obtener_queryset, request, *args, **kwargs):
+        try:
+            queryset = obtener_queryset()
+            ultima, total = validadores(queryset, self.get_relaciones_condicional(queryset.model))
+        except (TypeError, ValueError, ValidationError):
+            # ID mal formado: la vista devuelve su propio error
+            return calcular(request, *args, **kwargs)
+        if self.action == 'retrieve' and not total:
+            return calcular(request, *args, **kwargs)
+
+        etag = self._etag(request, ultima, total)
+        if self._no_modificado(request, etag, ultima):
+            respuesta = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            respuesta = calcular(request, *args, **kwargs)
+            if respuesta.status_code != status.HTTP_200_OK:
+                return respuesta
+        return aplicar_validadores(respuesta, etag, ultima)
+
+    def list(self, request, *args, **kwargs):
+        return self._responder_condicional(
+            super().list, self.get_queryset_condicional, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._responder_condicional(
+            super().retrieve,
+            lambda: self.get_queryset_condicional().filter(pk=kwargs.get('pk')),
+            request, *args, **kwargs
+        )
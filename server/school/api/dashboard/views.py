@@ -0,0 +1,37 @@
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from school.services.estadisticas_service import EstadisticasService
+
+
+class DashboardViewSet(viewsets.ViewSet):
+    """Datos agregados para las tarjetas del dashboard"""
+
+    estadisticas_service = EstadisticasService()
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        GET /api/dashboard/stats/
+
+        Conteos de alumnos, profesores, personal, materias y grados.
+
+        Query params:
+            institucion: limita los conteos a una institución
+            cache: 'false' para omitir la caché
+        """
+        institucion = request.query_params.get('institucion')
+        if institucion:
+            try:
+                institucion = int(institucion)
+            except ValueError:
+                return Response(
+                    {'error': 'El parámetro institucion debe ser un ID entero'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            institucion = None
+
+        usar_cache = request.query_params.get('cache', '').lower() != 'false'
+        conteos = self.estadisticas_service.estadisticas(institucion, usar_cache=usar_cache)
+        return Response({'institucion': institucion, **conteos})
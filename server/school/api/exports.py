@@ -0,0 +1,86 @@
+"""
+Exportación en streaming (CSV / JSONL)
+
+Las filas se leen con values_list en lotes keyset (pk > último visto) y se
+escriben a medida que llegan, de modo que la memoria es constante y el
+cliente recibe bytes desde el primer lote. Se usan lotes keyset en lugar de
+cursores del servidor porque el endpoint de Neon usa PgBouncer en modo
+transacción, donde los cursores del servidor no son fiables.
+
+Formato: ?formato=csv (por defecto) o ?formato=jsonl
+"""
+import csv
+import json
+from typing import Iterator, List, Sequence, Tuple
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+
+
+FORMATOS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+TAMANO_LOTE = 2000
+
+
+class _Eco:
+    """Pseudo-buffer para csv.writer: devuelve lo escrito en lugar de guardarlo"""
+
+    def write(self, valor):
+        return valor
+
+
+def iterar_lotes(queryset, campos: Sequence[str], tamano_lote: int = TAMANO_LOTE) -> Iterator[List[tuple]]:
+    """Recorre el queryset en lotes keyset devolviendo listas de tuplas de `campos`"""
+    queryset = queryset.order_by('pk')
+    ultimo = None
+    while True:
+        lote = queryset if ultimo is None else queryset.filter(pk__gt=ultimo)
+        filas = list(lote.values_list('pk', *campos)[:tamano_lote])
+        if not filas:
+            return
+        yield [fila[1:] for fila in filas]
+        if len(filas) < tamano_lote:
+            return
+        ultimo = filas[-1][0]
+
+
+def _csv(cabeceras, lotes) -> Iterator[str]:
+    escritor = csv.writer(_Eco())
+    yield '\ufeff' + escritor.writerow(cabeceras)  # BOM para que Excel detecte UTF-8
+    for lote in lotes:
+        yield ''.join(escritor.writerow(fila) for fila in lote)
+
+
+def _jsonl(cabeceras, lotes) -> Iterator[str]:
+    for lote in lotes:
+        yield ''.join(
+            json.dumps(dict(zip(cabeceras, fila)), default=str, ensure_ascii=False) + '\n'
+            for fila in lote
+        )
+
+
+def exportar(request, queryset, columnas: Sequence[Tuple[str, str]], nombre_archivo: str):
+    """
+    Respuesta de exportación en streaming.
+
+    Args:
+        columnas: pares (cabecera, lookup del ORM), ej. ('grado_nombre', 'grado__nombre')
+        nombre_archivo: nombre base del archivo descargado (sin extensión)
+    """
+    formato = (request.query_params.get('formato') or 'csv').lower()
+    if formato not in FORMATOS:
+        return Response(
+            {'error': f"Formato no soportado: {formato}. Use 'csv' o 'jsonl'"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    cabeceras = [cabecera for cabecera, _ in columnas]
+    lotes = iterar_lotes(queryset, [lookup for _, lookup in columnas])
+    contenido = _csv(cabeceras, lotes) if formato == 'csv' else _jsonl(cabeceras, lotes)
+
+    respuesta = StreamingHttpResponse(contenido, content_type=FORMATOS[formato])
+    respuesta['Content-Disposition'] = f'attachment; filename="{nombre_archivo}.{formato}"'
+    return respuesta
@@ -0,0 +1,44 @@
+"""
+Lectura de cargas masivas (JSON / CSV)
+
+Formatos aceptados por los endpoints de carga masiva:
+    - Arreglo JSON de objetos, o un objeto {<clave>: [...]}
+    - Cuerpo text/csv con cabecera
+    - Archivo CSV subido en el campo multipart 'archivo'
+
+Los CSV deben venir en UTF-8 (con o sin BOM); otra codificación responde
+400 (ParseError).
+"""
+import csv
+import io
+from typing import Dict, List, Optional
+from rest_framework.exceptions import ParseError
+
+
+def leer_csv(contenido: str) -> List[Dict]:
+    """Convierte un CSV con cabecera en una lista de diccionarios"""
+    return [dict(fila) for fila in csv.DictReader(io.StringIO(contenido))]
+
+
+def _decodificar(datos: bytes) -> str:
+    """Decodifica un CSV en UTF-8; ParseError (400) si trae otra codificación"""
+    try:
+        return datos.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise ParseError('El CSV debe estar codificado en UTF-8')
+
+
+def leer_filas(request, clave: str) -> Optional[List[Dict]]:
+    """
+    Extrae las filas de la petición; devuelve None si el formato no es válido.
+    ParseError (400) si el CSV no está en UTF-8.
+    """
+    if request.content_type.startswith('text/csv'):
+        return leer_csv(_decodificar(request.body))
+    if 'archivo' in request.FILES:
+        return leer_csv(_decodificar(request.FILES['archivo'].read()))
+
+    filas = request.data
+    if isinstance(filas, dict):
+        filas = filas.get(clave)
+    return filas if isinstance(filas, list) else None
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from school.models import Institucion
+from school.api.campos import CamposDinamicosMixin
 
 
-class InstitucionSerializer(serializers.ModelSerializer):
+class InstitucionSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     class Meta:
         model = Institucion
         fields = ['id', 'nombre', 'direccion', 'telefono', 'correo']
@@ -1,9 +1,15 @@
 from rest_framework import viewsets
 from school.models import Institucion
 from school.api.instituciones.serializers import InstitucionSerializer
+from school.api.pagination import PaginacionSeleccionableMixin
+from school.api.cache_respuestas import CacheRespuestaMixin
+from school.api.condicional import PeticionCondicionalMixin
+from school.api.lectura_valores import LecturaValoresMixin
+from school.api.campos import SeleccionCamposMixin
 
 
-class InstitucionViewSet(viewsets.ModelViewSet):
+class InstitucionViewSet(CacheRespuestaMixin, PeticionCondicionalMixin, PaginacionSeleccionableMixin, SeleccionCamposMixin, LecturaValoresMixin, viewsets.ModelViewSet):
     queryset = Institucion.objects.all()
     serializer_class = InstitucionSerializer
+    cache_namespaces = ('instituciones',)
 
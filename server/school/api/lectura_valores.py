@@ -0,0 +1,257 @@
+"""
+Lectura por valores para los listados de los ModelViewSets
+
+Serializar una página con un ModelSerializer recorre, por cada fila y cada
+campo, get_attribute (con sus try/except), la instancia del modelo y
+to_representation. LecturaValoresMixin obtiene la página con
+`values_list()` (tuplas, sin instanciar modelos) y arma cada fila a partir
+de un PlanValores derivado del serializer, igual que los planes de
+school.api.query_plans:
+
+    - `source` del serializer         -> lookup de values_list
+      ('materia.nombre' -> 'materia__nombre', 'institucion' -> su ID)
+    - CharField/IntegerField/BooleanField sobre columnas del mismo tipo y
+      las FK por PK                   -> el valor tal cual
+    - DecimalField                    -> '{:f}' si la base ya lo devuelve
+      con los decimales del campo; si no, to_representation del campo
+    - cualquier otro campo            -> to_representation del campo
+
+El resultado es el mismo que el del serializer (mismas claves, mismo
+orden, mismos valores; incluida la omisión de un campo cuando una FK
+intermedia nula no permite leerlo). Si el serializer tiene algo que no se
+puede leer de una columna (SerializerMethodField, propiedades del modelo,
+serializers anidados, relaciones muchos-a-muchos, archivos) no hay plan y
+el ViewSet usa el serializer. `python manage.py benchmark_serializacion`
+compara ambos caminos byte a byte.
+
+Con ?fields=/?omit=/?format=compact (school.api.campos) el plan se deriva
+solo de los campos elegidos: values_list no lee las demás columnas.
+
+Se desactiva con API_LECTURA_VALORES=False o `lectura_valores = False`
+en el ViewSet.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from rest_framework import fields as campos_drf
+from rest_framework import relations, serializers
+from rest_framework.fields import empty
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+# Campos que se omiten de la respuesta (ver Field.get_attribute de DRF)
+OMITIR = object()
+
+TIPOS_TEXTO = {'CharField', 'TextField', 'EmailField', 'SlugField', 'URLField'}
+TIPOS_ENTERO = {
+    'AutoField', 'BigAutoField', 'SmallAutoField', 'IntegerField', 'BigIntegerField',
+    'SmallIntegerField', 'PositiveIntegerField', 'PositiveSmallIntegerField', 'PositiveBigIntegerField',
+}
+# Campo de DRF (clase exacta) -> tipos de columna cuyo valor ya es la representación
+IDENTIDAD = {
+    campos_drf.CharField: TIPOS_TEXTO,
+    campos_drf.EmailField: TIPOS_TEXTO,
+    campos_drf.IntegerField: TIPOS_ENTERO,
+    campos_drf.BooleanField: {'BooleanField'},
+}
+NO_SOPORTADOS = (
+    serializers.BaseSerializer,
+    serializers.SerializerMethodField,
+    serializers.HiddenField,
+    serializers.ModelField,
+    serializers.FileField,
+    relations.ManyRelatedField,
+)
+
+
+class SinPlan(Exception):
+    """El serializer tiene campos que no se pueden leer de columnas"""
+
+
+@dataclass(frozen=True)
+class Columna:
+    """Campo de la respuesta leído de la posición `indice` de cada tupla"""
+    nombre: str
+    indice: int
+    convertir: Optional[Callable] = None  # None: el valor ya es la representación
+    intermedias: Tuple[int, ...] = ()  # FK nulables del camino hasta el valor
+    ausente: object = OMITIR  # Si una de ellas es None: OMITIR o función que da el valor
+
+
+@dataclass(frozen=True)
+class PlanValores:
+    """Lookups de values_list y cómo armar cada fila de la respuesta"""
+    lookups: Tuple[str, ...]
+    columnas: Tuple[Columna, ...]
+
+    def consulta(self, queryset: QuerySet, extra: Tuple[str, ...] = ()) -> QuerySet:
+        """
+        values_list con filas con nombre: el paginador por cursor lee los
+        campos de orden como atributos (`extra` añade los que falten)
+        """
+        lookups = self.lookups + tuple(campo for campo in extra if campo not in self.lookups)
+        return queryset.values_list(*lookups, named=True)
+
+    def representar(self, filas) -> list:
+        """Filas de values_list -> lista de dicts como la de serializer.data"""
+        resultado = []
+        for fila in filas:
+            datos = {}
+            for columna in self.columnas:
+                if columna.intermedias and any(fila[i] is None for i in columna.intermedias):
+                    if columna.ausente is not OMITIR:
+                        datos[columna.nombre] = columna.ausente()
+                    continue
+                valor = fila[columna.indice]
+                if valor is None or columna.convertir is None:
+                    datos[columna.nombre] = valor
+                else:
+                    datos[columna.nombre] = columna.convertir(valor)
+            resultado.append(datos)
+        return resultado
+
+
+def _decimal(campo: campos_drf.DecimalField) -> Callable:
+    """
+    DecimalField.to_representation sin cuantizar cuando la base ya devuelve
+    el Decimal con `decimal_places` decimales (el caso normal)
+    """
+    exponente = -campo.decimal_places
+
+    def convertir(valor):
+        if type(valor) is Decimal and valor.as_tuple().exponent == exponente:
+            return f'{valor:f}'
+        return campo.to_representation(valor)
+    return convertir
+
+
+def _convertidor(campo, campo_modelo) -> Optional[Callable]:
+    if isinstance(campo, relations.PrimaryKeyRelatedField):
+        return campo.pk_field.to_representation if campo.pk_field is not None else None
+    if isinstance(campo, relations.RelatedField):
+        raise SinPlan(campo.field_name)
+    if campo_modelo.get_internal_type() in IDENTIDAD.get(type(campo), ()):
+        return None
+    if (
+        type(campo) is campos_drf.BigIntegerField and campo_modelo.get_internal_type() in TIPOS_ENTERO
+        and not getattr(campo, 'coerce_to_string', api_settings.COERCE_BIGINT_TO_STRING)
+    ):
+        return None  # Los ID (BigAutoField) se serializan como enteros salvo COERCE_BIGINT_TO_STRING
+    if (
+        type(campo) is campos_drf.DecimalField and campo.decimal_places is not None
+        and getattr(campo, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+        and not campo.localize and not campo.normalize_output
+    ):
+        return _decimal(campo)
+    return campo.to_representation
+
+
+def _ausente(campo):
+    """Qué hace Field.get_attribute de DRF si no puede recorrer el `source`"""
+    if campo.default is not empty:
+        def por_defecto():
+            valor = campo.get_default()
+            return None if valor is None else campo.to_representation(valor)
+        return por_defecto
+    if campo.allow_null:
+        return lambda: None
+    if not campo.required:
+        return OMITIR
+    raise SinPlan(campo.field_name)
+
+
+def _columna(campo, model, lookups: list) -> Columna:
+    """Recorre el `source` del campo sobre el modelo; SinPlan si no es una columna"""
+    if isinstance(campo, NO_SOPORTADOS) or campo.source == '*':
+        raise SinPlan(campo.field_name)
+    actual = model
+    camino = []
+    intermedias = []
+    partes = campo.source_attrs
+    for indice, parte in enumerate(partes):
+        try:
+            campo_modelo = actual._meta.get_field(parte)
+        except FieldDoesNotExist:
+            raise SinPlan(campo.field_name)  # Propiedad o método del modelo
+        if not campo_modelo.concrete or campo_modelo.many_to_many:
+            raise SinPlan(campo.field_name)
+        camino.append(parte)
+        es_ultimo = indice == len(partes) - 1
+        if es_ultimo:
+            break
+        if not campo_modelo.is_relation:
+            raise SinPlan(campo.field_name)
+        # FK intermedia: si es nula DRF no puede leer el resto del camino
+        if campo_modelo.null:
+            intermedias.append('__'.join(camino))
+        actual = campo_modelo.related_model
+    if campo_modelo.is_relation and not isinstance(campo, relations.PrimaryKeyRelatedField):
+        raise SinPlan(campo.field_name)
+
+    def posicion(lookup):
+        if lookup not in lookups:
+            lookups.append(lookup)
+        return lookups.index(lookup)
+
+    return Columna(
+        nombre=campo.field_name,
+        indice=posicion('__'.join(camino)),
+        convertir=_convertidor(campo, campo_modelo),
+        intermedias=tuple(posicion(lookup) for lookup in intermedias),
+        ausente=_ausente(campo) if intermedias else OMITIR,
+    )
+
+
+# Acotada: la clave incluye los campos pedidos con ?fields=/?omit=, que elige el cliente
+@lru_cache(maxsize=256)
+def build_values_plan(serializer_class, model=None, campos: Optional[Tuple[str, ...]] = None) -> Optional[PlanValores]:
+    """
+    PlanValores del serializer (solo `campos` si se indican) o None si algún
+    campo no se puede leer de columnas
+    """
+    model = model or serializer_class.Meta.model
+    lookups = []
+    try:
+        columnas = tuple(
+            _columna(campo, model, lookups)
+            for nombre, campo in serializer_class().fields.items()
+            if not campo.write_only and (campos is None or nombre in campos)
+        )
+    except SinPlan:
+        return None
+    return PlanValores(lookups=tuple(lookups), columnas=columnas)
+
+
+class LecturaValoresMixin:
+    """
+    Mixin para ModelViewSets: `list` lee la página con values_list y la arma
+    con el PlanValores del serializer (ver el docstring del módulo).
+    Va antes de viewsets.ModelViewSet y después de los mixins que envuelven
+    `list` (CacheRespuestaMixin, PeticionCondicionalMixin).
+    """
+    lectura_valores = True
+
+    def get_values_plan(self) -> Optional[PlanValores]:
+        if not self.lectura_valores or not getattr(settings, 'API_LECTURA_VALORES', True):
+            return None
+        campos = self.get_campos_respuesta() if hasattr(self, 'get_campos_respuesta') else None
+        return build_values_plan(self.get_serializer_class(), model=self.queryset.model, campos=campos)
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_values_plan()
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = plan.consulta(
+            self.filter_queryset(self.get_queryset()),
+            extra=tuple(getattr(self, 'cursor_ordering', None) or ()),
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(plan.representar(page))
+        return Response(plan.representar(queryset))
@@ -0,0 +1,324 @@
+"""
+Paginación de la API
+
+Modos disponibles (seleccionables por petición):
+    - Página (por defecto): ?page=N&page_size=M
+      Con ?sin_conteo=true se omite el COUNT(*) y `count` se devuelve null.
+    - Cursor (keyset):      ?paginacion=cursor
+      Ordena por el `cursor_ordering` del ViewSet (por defecto ('id',)) y
+      filtra por el último valor visto, sin COUNT ni OFFSET. Los enlaces
+      next/previous incluyen el parámetro `cursor` y conservan el modo.
+
+Ambos paginadores tienen una variante `apaginate_queryset` para las vistas
+async (school.api.asincronas) que lee la página con el ORM async.
+"""
+import base64
+import json
+from collections import OrderedDict
+from typing import Sequence
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+MODO_PAGINA = 'pagina'
+MODO_CURSOR = 'cursor'
+
+VALORES_VERDADEROS = ('1', 'true', 'si', 'sí', 'yes')
+
+
+def _parametro_verdadero(request, nombre: str) -> bool:
+    return (request.query_params.get(nombre) or '').lower() in VALORES_VERDADEROS
+
+
+def _con_orden(queryset):
+    return queryset if queryset.ordered else queryset.order_by('pk')
+
+
+async def _filas(consulta) -> list:
+    """
+    Evalúa una página con el ORM async en un solo viaje a la base.
+
+    No se usa aiterator(): en PostgreSQL abre un cursor del lado del servidor
+    (DECLARE + FETCH), más viajes de ida y vuelta para una página pequeña.
+    """
+    return [fila async for fila in consulta]
+
+
+class StandardPagination(PageNumberPagination):
+    """Paginación por número de página con tamaño acotado y orden estable"""
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    sin_conteo_query_param = 'sin_conteo'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Orden estable: sin ORDER BY las páginas pueden solaparse
+        queryset = _con_orden(queryset)
+        self.sin_conteo = _parametro_verdadero(request, self.sin_conteo_query_param)
+        if not self.sin_conteo:
+            return super().paginate_queryset(queryset, request, view)
+
+        consulta = self._consulta_sin_conteo(queryset, request)
+        if consulta is None:
+            return None
+        return self._pagina_sin_conteo(list(consulta))
+
+    async def apaginate_queryset(self, queryset, request, view=None, total=None):
+        """
+        Versión async de paginate_queryset (aiterator y acount).
+
+        `total` permite reutilizar un conteo ya calculado (ej. el de los
+        validadores condicionales) en lugar de repetir el COUNT(*).
+        """
+        queryset = _con_orden(queryset)
+        self.sin_conteo = _parametro_verdadero(request, self.sin_conteo_query_param)
+        if self.sin_conteo:
+            consulta = self._consulta_sin_conteo(queryset, request)
+            if consulta is None:
+                return None
+            return self._pagina_sin_conteo(await _filas(consulta))
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        paginator = self.django_paginator_class(queryset, page_size)
+        # count es una cached_property: se fija para que Paginator no lo calcule en modo sync
+        paginator.count = await queryset.acount() if total is None else total
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        self.page.object_list = await _filas(self.page.object_list)
+        return list(self.page)
+
+    def _consulta_sin_conteo(self, queryset, request):
+        """Sin COUNT(*): se pide una fila extra para saber si hay siguiente"""
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        try:
+            self.numero_pagina = int(request.query_params.get(self.page_query_param, 1))
+            if self.numero_pagina < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_page_message.format(
+                page_number=request.query_params.get(self.page_query_param),
+                message='Número de página inválido'
+            ))
+        self.tamano_pagina = page_size
+        inicio = (self.numero_pagina - 1) * page_size
+        return queryset[inicio:inicio + page_size + 1]
+
+    def _pagina_sin_conteo(self, filas):
+        self.tiene_siguiente = len(filas) > self.tamano_pagina
+        return filas[:self.tamano_pagina]
+
+    def get_paginated_response(self, data):
+        if not getattr(self, 'sin_conteo', False):
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('count', None),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not getattr(self, 'sin_conteo', False):
+            return super().get_next_link()
+        if not self.tiene_siguiente:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.numero_pagina + 1)
+
+    def get_previous_link(self):
+        if not getattr(self, 'sin_conteo', False):
+            return super().get_previous_link()
+        if self.numero_pagina <= 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.numero_pagina == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.numero_pagina - 1)
+
+
+def encode_cursor(valores: Sequence, reverso: bool = False) -> str:
+    """Codifica la posición (valores de la última fila vista) en un cursor"""
+    datos = json.dumps({'v': list(valores), 'r': reverso}, default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(datos.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str):
+    """Decodifica un cursor; devuelve (valores, reverso)"""
+    try:
+        datos = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        return list(datos['v']), bool(datos.get('r', False))
+    except (ValueError, KeyError, TypeError, UnicodeError):
+        raise NotFound('Cursor inválido')
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación keyset (cursor) sobre un orden compuesto.
+
+    El ViewSet define `cursor_ordering`, una tupla de columnas ascendentes
+    (ej. ('periodo_id', 'alumno_id', 'id')). Si la última columna no es
+    'id' se añade como desempate para garantizar un orden total estable.
+    La posición se filtra con una comparación lexicográfica, de modo que el
+    coste de una página profunda es el mismo que el de la primera.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('id',)
+
+    def get_page_size(self, request):
+        page_size = api_settings.PAGE_SIZE or 20
+        valor = request.query_params.get(self.page_size_query_param)
+        if valor:
+            try:
+                page_size = int(valor)
+            except ValueError:
+                pass
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_ordering(self, view) -> tuple:
+        ordering = tuple(getattr(view, 'cursor_ordering', None) or self.ordering)
+        if ordering[-1] not in ('id', 'pk'):
+            ordering = ordering + ('id',)
+        return ordering
+
+    @staticmethod
+    def _filtro_posicion(ordering, valores, reverso: bool) -> Q:
+        """(a, b, c) > (va, vb, vc) expresado como OR de prefijos iguales"""
+        operador = 'lt' if reverso else 'gt'
+        condicion = Q()
+        for indice, campo in enumerate(ordering):
+            prefijo = Q(**{anterior: valores[j] for j, anterior in enumerate(ordering[:indice])})
+            condicion |= prefijo & Q(**{f'{campo}__{operador}': valores[indice]})
+        return condicion
+
+    @staticmethod
+    def _campo(model, ruta: str):
+        """Campo del modelo para una columna de `cursor_ordering` (admite 'pk', attname y relaciones)"""
+        *relaciones, nombre = ruta.split('__')
+        for relacion in relaciones:
+            model = model._meta.get_field(relacion).related_model
+        return model._meta.pk if nombre == 'pk' else model._meta.get_field(nombre)
+
+    def _valores_cursor(self, model, valores) -> list:
+        """Convierte los valores del cursor al tipo de cada columna; NotFound si no corresponden"""
+        if len(valores) != len(self.ordering_campos):
+            raise NotFound('Cursor inválido')
+        try:
+            convertidos = [
+                self._campo(model, campo).to_python(valor)
+                for campo, valor in zip(self.ordering_campos, valores)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound('Cursor inválido')
+        if None in convertidos:
+            # Las columnas del orden keyset no admiten NULL
+            raise NotFound('Cursor inválido')
+        return convertidos
+
+    @staticmethod
+    def _valores_fila(fila, ordering):
+        return [getattr(fila, campo) for campo in ordering]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self._procesar_filas(list(self._consulta(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None, total=None):
+        """Versión async de paginate_queryset (`total` no se usa: no hay conteo)"""
+        return self._procesar_filas(await _filas(self._consulta(queryset, request, view)))
+
+    def _consulta(self, queryset, request, view):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering_campos = self.get_ordering(view)
+
+        self.cursor = request.query_params.get(self.cursor_query_param)
+        self.reverso = False
+        if self.cursor:
+            valores, self.reverso = decode_cursor(self.cursor)
+            valores = self._valores_cursor(queryset.model, valores)
+            queryset = queryset.filter(self._filtro_posicion(self.ordering_campos, valores, self.reverso))
+
+        orden = [f'-{c}' if self.reverso else c for c in self.ordering_campos]
+        return queryset.order_by(*orden)[:self.page_size + 1]
+
+    def _procesar_filas(self, filas):
+        cursor, reverso = self.cursor, self.reverso
+        hay_mas = len(filas) > self.page_size
+        filas = filas[:self.page_size]
+        if reverso:
+            filas.reverse()
+
+        # En sentido directo: hay siguiente si sobró una fila; hay anterior si
+        # se llegó mediante un cursor. En sentido reverso es al revés.
+        self.tiene_siguiente = hay_mas if not reverso else bool(cursor)
+        self.tiene_anterior = bool(cursor) if not reverso else hay_mas
+        self.primera = self._valores_fila(filas[0], self.ordering_campos) if filas else None
+        self.ultima = self._valores_fila(filas[-1], self.ordering_campos) if filas else None
+        return filas
+
+    def _enlace(self, valores, reverso):
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, 'paginacion', MODO_CURSOR)
+        return replace_query_param(url, self.cursor_query_param, encode_cursor(valores, reverso))
+
+    def get_next_link(self):
+        if not self.tiene_siguiente or self.ultima is None:
+            return None
+        return self._enlace(self.ultima, False)
+
+    def get_previous_link(self):
+        if not self.tiene_anterior or self.primera is None:
+            return None
+        return self._enlace(self.primera, True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+def modo_paginacion(request) -> str:
+    """Determina el modo de paginación solicitado"""
+    modo = request.query_params.get('paginacion')
+    if modo == MODO_CURSOR or request.query_params.get('cursor') is not None:
+        return MODO_CURSOR
+    return MODO_PAGINA
+
+
+def get_paginator(request):
+    """Devuelve una instancia del paginador correspondiente al modo pedido"""
+    if modo_paginacion(request) == MODO_CURSOR:
+        return KeysetPagination()
+    return StandardPagination()
+
+
+class PaginacionSeleccionableMixin:
+    """
+    Mixin para GenericAPIView: elige el paginador según la petición.
+
+    Los ViewSets pueden definir `cursor_ordering` para el modo cursor.
+    """
+    cursor_ordering = ('id',)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            self._paginator = get_paginator(self.request)
+        return self._paginator
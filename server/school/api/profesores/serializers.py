@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from school.models import Profesor
+from school.api.campos import CamposDinamicosMixin
 
 
-class ProfesorSerializer(serializers.ModelSerializer):
+class ProfesorSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     institucion_nombre = serializers.CharField(source='institucion.nombre', read_only=True)
     
     class Meta:
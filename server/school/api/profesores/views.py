@@ -1,14 +1,19 @@
 from rest_framework import viewsets
 from school.models import Profesor
 from school.api.profesores.serializers import ProfesorSerializer
+from school.api.query_plans import QueryPlanMixin
+from school.api.pagination import PaginacionSeleccionableMixin
+from school.api.condicional import PeticionCondicionalMixin
+from school.api.lectura_valores import LecturaValoresMixin
+from school.api.campos import SeleccionCamposMixin
 
 
-class ProfesorViewSet(viewsets.ModelViewSet):
+class ProfesorViewSet(PeticionCondicionalMixin, PaginacionSeleccionableMixin, SeleccionCamposMixin, QueryPlanMixin, LecturaValoresMixin, viewsets.ModelViewSet):
     queryset = Profesor.objects.all()
     serializer_class = ProfesorSerializer
     
     def get_queryset(self):
-        queryset = Profesor.objects.all()
+        queryset = super().get_queryset()
         institucion_id = self.request.query_params.get('institucion', None)
         if institucion_id:
             queryset = queryset.filter(institucion_id=institucion_id)
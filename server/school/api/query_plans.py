@@ -0,0 +1,146 @@
+"""
+Planes de consulta declarativos para los ViewSets
+
+Cada serializer declara campos con `source` punteado (ej. 'institucion.nombre').
+A partir de esos campos se deriva un plan de consulta (select_related,
+prefetch_related y only) que los ViewSets aplican automáticamente, de modo
+que listar una página cueste un número constante de consultas.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, Tuple
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """Plan de consulta derivado de un serializer"""
+    select_related: Tuple[str, ...] = ()
+    prefetch_related: Tuple[str, ...] = ()
+    only: Optional[Tuple[str, ...]] = field(default=None)
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        """Aplica el plan a un queryset"""
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.only:
+            queryset = queryset.only(*self.only)
+        return queryset
+
+
+def _campo_modelo(model, nombre):
+    """Obtiene un campo del modelo o None si no existe"""
+    try:
+        return model._meta.get_field(nombre)
+    except FieldDoesNotExist:
+        return None
+
+
+def _fuentes(serializer_class, campos=None):
+    """Devuelve los `source` de los campos de lectura del serializer (solo `campos` si se indican)"""
+    for nombre, campo in serializer_class().fields.items():
+        if campos is not None and nombre not in campos:
+            continue
+        if campo.write_only or isinstance(campo, serializers.SerializerMethodField):
+            continue
+        if campo.source == '*':
+            continue
+        yield campo.source
+
+
+# Acotada: la clave incluye los campos pedidos con ?fields=/?omit=, que elige el cliente
+@lru_cache(maxsize=256)
+def build_query_plan(
+    serializer_class, model=None, use_only: bool = True,
+    campos: Optional[Tuple[str, ...]] = None, adicionales: Tuple[str, ...] = (),
+) -> QueryPlan:
+    """
+    Deriva el plan de consulta a partir de los `source` del serializer.
+
+    - Relaciones directas (FK / OneToOne) -> select_related
+    - Relaciones inversas o muchos-a-muchos -> prefetch_related
+    - Columnas usadas -> only() (si use_only y no hay prefetch)
+
+    Con `campos` (ver school.api.campos) solo se consideran esos campos del
+    serializer; `adicionales` son columnas que se cargan aunque ningún campo
+    las use (ej. las del orden del paginador por cursor).
+    """
+    model = model or serializer_class.Meta.model
+    select_related = []
+    prefetch_related = []
+    only = []
+    usa_only = use_only
+
+    for source in _fuentes(serializer_class, campos):
+        actual = model
+        camino = []
+        partes = source.split('.')
+        for indice, parte in enumerate(partes):
+            campo = _campo_modelo(actual, parte)
+            if campo is None:
+                # Propiedad o método del modelo: no se puede restringir columnas
+                if indice == 0:
+                    usa_only = False
+                break
+            camino.append(parte)
+            es_ultimo = indice == len(partes) - 1
+            if not campo.is_relation:
+                only.append('__'.join(camino))
+                break
+            if campo.many_to_many or campo.one_to_many:
+                prefetch_related.append('__'.join(camino))
+                usa_only = False
+                break
+            if es_ultimo:
+                # Relación serializada por PK (ej. 'institucion')
+                only.append('__'.join(camino))
+                break
+            # FK o OneToOne intermedio: se recorre con JOIN
+            select_related.append('__'.join(camino))
+            only.append('__'.join(camino))
+            actual = campo.related_model
+
+    # Los campos auto_now deben cargarse: save() sobre una instancia con
+    # campos diferidos solo escribe los campos cargados
+    only.extend(
+        campo.name for campo in model._meta.concrete_fields if getattr(campo, 'auto_now', False)
+    )
+    only.extend(adicionales)
+
+    return QueryPlan(
+        select_related=tuple(dict.fromkeys(select_related)),
+        prefetch_related=tuple(dict.fromkeys(prefetch_related)),
+        only=tuple(dict.fromkeys(['pk'] + only)) if usa_only else None,
+    )
+
+
+class QueryPlanMixin:
+    """
+    Mixin para ModelViewSets que aplica el plan de consulta del serializer.
+
+    Los ViewSets pueden sobrescribir `query_plan` con un QueryPlan explícito
+    o desactivar only() con `query_plan_use_only = False`.
+    """
+    query_plan = None
+    query_plan_use_only = True
+
+    def get_query_plan(self) -> QueryPlan:
+        if self.query_plan is not None:
+            return self.query_plan
+        # Con ?fields=/?omit=/?format=compact (SeleccionCamposMixin) solo se leen esos campos
+        campos = self.get_campos_respuesta() if hasattr(self, 'get_campos_respuesta') else None
+        return build_query_plan(
+            self.get_serializer_class(),
+            model=self.queryset.model,
+            use_only=self.query_plan_use_only,
+            campos=campos,
+            adicionales=tuple(getattr(self, 'cursor_ordering', None) or ()) if campos is not None else (),
+        )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        return self.get_query_plan().apply(queryset)
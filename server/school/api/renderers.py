@@ -0,0 +1,68 @@
+"""
+Renderer JSON rápido
+
+JSONRapidoRenderer produce los mismos bytes que el JSONRenderer de DRF
+(separadores compactos, UTF-8 sin escapar, U+2028/U+2029 escapados) usando
+orjson, que codifica en C. Fechas, Decimal, lazy strings y demás tipos que
+orjson no representa igual pasan por el `default` del JSONEncoder de DRF.
+
+Se usa el JSONRenderer de DRF (json de la biblioteca estándar) cuando:
+    - orjson no está instalado (`pip install orjson`; incluido en
+      requirements-produccion.txt);
+    - se pide sangría (API navegable, `Accept: application/json; indent=4`)
+      o la configuración de DRF no es la compacta/UTF-8/estricta por defecto;
+    - orjson no puede codificar los datos (enteros de más de 64 bits,
+      claves de diccionario que no son str).
+
+Diferencias con el JSONRenderer de DRF: los float fuera de [1e-4, 1e16) se
+escriben sin exponente o sin '+' (1e-05 -> 0.00001, 1e+16 -> 1e16; el mismo
+número al decodificar) y NaN/Infinity se escriben como null en lugar de
+producir un error. Las respuestas de la API no contienen float: los
+DecimalField se serializan como cadenas.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+SEPARADOR_LINEA = '\u2028'.encode('utf-8')
+SEPARADOR_PARRAFO = '\u2029'.encode('utf-8')
+
+
+class JSONRapidoRenderer(JSONRenderer):
+    """JSONRenderer de DRF acelerado con orjson (ver el docstring del módulo)"""
+
+    def __init__(self):
+        super().__init__()
+        self.rapido = orjson is not None and self.compact and not self.ensure_ascii and self.strict
+        if self.rapido:
+            self.opciones = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            self.default = self.encoder_class().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not self.rapido or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            contenido = orjson.dumps(data, default=self.default, option=self.opciones)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Igual que DRF: JSON que también es un subconjunto válido de JavaScript
+        if SEPARADOR_LINEA in contenido:
+            contenido = contenido.replace(SEPARADOR_LINEA, b'\\u2028')
+        if SEPARADOR_PARRAFO in contenido:
+            contenido = contenido.replace(SEPARADOR_PARRAFO, b'\\u2029')
+        return contenido
+
+
+class JSONCompactoRenderer(JSONRapidoRenderer):
+    """
+    `?format=compact`: el mismo JSON; la vista emite la representación
+    compacta del serializer (school.api.campos). Registrado para que la
+    negociación de DRF acepte el formato en lugar de responder 404.
+    """
+    format = 'compact'
@@ -1,15 +1,16 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from school.models import Periodo, Grado, Materia, Calificacion, Personal
+from school.api.campos import CamposDinamicosMixin
 
 
-class PeriodoSerializer(serializers.ModelSerializer):
+class PeriodoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     class Meta:
         model = Periodo
         fields = ['id', 'nombre', 'fecha_inicio', 'fecha_fin']
 
 
-class GradoSerializer(serializers.ModelSerializer):
+class GradoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     institucion_nombre = serializers.CharField(source='institucion.nombre', read_only=True)
     
     class Meta:
@@ -17,7 +18,7 @@ class GradoSerializer(serializers.ModelSerializer):
         fields = ['id', 'nombre', 'descripcion', 'institucion', 'institucion_nombre']
 
 
-class MateriaSerializer(serializers.ModelSerializer):
+class MateriaSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     profesor_nombre = serializers.CharField(source='profesor.nombre', read_only=True)
     profesor_apellido = serializers.CharField(source='profesor.apellido', read_only=True)
     grado_nombre = serializers.CharField(source='grado.nombre', read_only=True)
@@ -28,7 +29,7 @@ class MateriaSerializer(serializers.ModelSerializer):
 
 
 
-class CalificacionSerializer(serializers.ModelSerializer):
+class CalificacionSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     alumno_nombre = serializers.CharField(source='alumno.nombre', read_only=True)
     alumno_apellido = serializers.CharField(source='alumno.apellido', read_only=True)
     materia_nombre = serializers.CharField(source='materia.nombre', read_only=True)
@@ -39,9 +40,11 @@ class CalificacionSerializer(serializers.ModelSerializer):
         fields = ['id', 'alumno', 'alumno_nombre', 'alumno_apellido', 'materia', 'materia_nombre', 'periodo', 'periodo_nombre', 'calificacion']
 
 
-class PersonalSerializer(serializers.ModelSerializer):
+class PersonalSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     institucion_nombre = serializers.CharField(source='institucion.nombre', read_only=True)
     fechaIngreso = serializers.DateField(source='fecha_ingreso', read_only=True)
+    # ?format=compact: sin el alias fechaIngreso
+    campos_compactos = ('id', 'nombre', 'apellido', 'cedula', 'cargo', 'fecha_ingreso', 'estado', 'email', 'telefono', 'institucion', 'institucion_nombre')
     
     class Meta:
         model = Personal
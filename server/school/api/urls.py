@@ -3,6 +3,9 @@ from rest_framework.routers import DefaultRouter
 from school.api.instituciones.views import InstitucionViewSet
 from school.api.profesores.views import ProfesorViewSet
 from school.api.alumnos.views import AlumnoViewSet
+from school.api.dashboard.views import DashboardViewSet
+from school.api.busqueda.views import BusquedaViewSet
+from school.api.asincronas import views as asincronas
 from . import views
 
 router = DefaultRouter()
@@ -16,7 +19,18 @@ router.register(r'estudiantes', AlumnoViewSet, basename='estudiante')  # Alias p
 router.register(r'calificaciones', views.CalificacionViewSet)
 router.register(r'personal', views.PersonalViewSet)
 router.register(r'auth', views.AuthViewSet, basename='auth')
+router.register(r'dashboard', DashboardViewSet, basename='dashboard')
+router.register(r'busqueda', BusquedaViewSet, basename='busqueda')
+
+# Variantes async de las lecturas más frecuentes (ver school/api/asincronas/views.py)
+rutas_async = [
+    path('alumnos/', asincronas.AlumnoListaAsyncView.as_view(), name='async-alumno-list'),
+    path('alumnos/<str:pk>/', asincronas.AlumnoDetalleAsyncView.as_view(), name='async-alumno-detail'),
+    path('calificaciones/', asincronas.CalificacionListaAsyncView.as_view(), name='async-calificacion-list'),
+    path('dashboard/stats/', asincronas.EstadisticasAsyncView.as_view(), name='async-dashboard-stats'),
+]
 
 urlpatterns = [
+    path('async/', include(rutas_async)),
     path('', include(router.urls)),  # Las rutas ya están bajo /api/ desde core/urls.py
 ]
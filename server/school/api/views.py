@@ -1,41 +1,60 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import authenticate
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import Q
+from decimal import Decimal, InvalidOperation
 from school.models import Periodo, Grado, Materia, Calificacion, Personal
 from school.api.serializers import (
     PeriodoSerializer, GradoSerializer,
     MateriaSerializer,
     CalificacionSerializer, PersonalSerializer, UserSerializer
 )
+from school.api.query_plans import QueryPlanMixin
+from school.api.lectura_valores import LecturaValoresMixin
+from school.api.campos import SeleccionCamposMixin
+from school.api.pagination import PaginacionSeleccionableMixin, StandardPagination
+from school.api.cache_respuestas import CacheRespuestaMixin
+from school.api.condicional import PeticionCondicionalMixin
+from school.services.calificacion_service import CalificacionService
+from school.services.resumen_calificaciones_service import ResumenCalificacionesService, FILTROS as FILTROS_RESUMEN
+from school.cache import obtener_o_calcular
+from school.busqueda import buscador
+from school.api.exports import exportar
+from school.api.importacion import leer_filas
+from school.api.autenticacion import (
+    UsuarioFirmado, emitir_acceso, emitir_refresh, revocar_refresh, rol_de, rotar_refresh
+)
 
 
-class PeriodoViewSet(viewsets.ModelViewSet):
+class PeriodoViewSet(CacheRespuestaMixin, PeticionCondicionalMixin, PaginacionSeleccionableMixin, SeleccionCamposMixin, LecturaValoresMixin, viewsets.ModelViewSet):
     queryset = Periodo.objects.all()
     serializer_class = PeriodoSerializer
+    cache_namespaces = ('periodos',)
 
 
-class GradoViewSet(viewsets.ModelViewSet):
+class GradoViewSet(CacheRespuestaMixin, PeticionCondicionalMixin, PaginacionSeleccionableMixin, SeleccionCamposMixin, QueryPlanMixin, LecturaValoresMixin, viewsets.ModelViewSet):
     queryset = Grado.objects.all()
     serializer_class = GradoSerializer
+    cache_namespaces = ('grados', 'instituciones')  # incluye institucion_nombre
     
     def get_queryset(self):
-        queryset = Grado.objects.all()
+        queryset = super().get_queryset()
         institucion_id = self.request.query_params.get('institucion', None)
         if institucion_id:
             queryset = queryset.filter(institucion_id=institucion_id)
         return queryset
 
 
-class MateriaViewSet(viewsets.ModelViewSet):
+class MateriaViewSet(PeticionCondicionalMixin, PaginacionSeleccionableMixin, SeleccionCamposMixin, QueryPlanMixin, LecturaValoresMixin, viewsets.ModelViewSet):
     queryset = Materia.objects.all()
     serializer_class = MateriaSerializer
     
     def get_queryset(self):
-        queryset = Materia.objects.all()
+        queryset = super().get_queryset()
         grado_id = self.request.query_params.get('grado', None)
         profesor_id = self.request.query_params.get('profesor', None)
         
@@ -47,12 +66,25 @@ class MateriaViewSet(viewsets.ModelViewSet):
 
 
 
-class CalificacionViewSet(viewsets.ModelViewSet):
+class CalificacionViewSet(PeticionCondicionalMixin, PaginacionSeleccionableMixin, SeleccionCamposMixin, QueryPlanMixin, LecturaValoresMixin, viewsets.ModelViewSet):
     queryset = Calificacion.objects.all()
     serializer_class = CalificacionSerializer
+    # Orden del modo cursor: agrupa por periodo y alumno (desempate por id)
+    cursor_ordering = ('periodo_id', 'alumno_id', 'id')
+    COLUMNAS_EXPORTACION = [
+        ('id', 'id'),
+        ('alumno', 'alumno_id'),
+        ('alumno_nombre', 'alumno__nombre'),
+        ('alumno_apellido', 'alumno__apellido'),
+        ('materia', 'materia_id'),
+        ('materia_nombre', 'materia__nombre'),
+        ('periodo', 'periodo_id'),
+        ('periodo_nombre', 'periodo__nombre'),
+        ('calificacion', 'calificacion'),
+    ]
     
     def get_queryset(self):
-        queryset = Calificacion.objects.all()
+        queryset = super().get_queryset()
         alumno_id = self.request.query_params.get('alumno', None)
         materia_id = self.request.query_params.get('materia', None)
         periodo_id = self.request.query_params.get('periodo', None)
@@ -64,14 +96,99 @@ class CalificacionViewSet(viewsets.ModelViewSet):
         if periodo_id:
             queryset = queryset.filter(periodo_id=periodo_id)
         return queryset
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Carga masiva de calificaciones (upsert por alumno, materia y periodo).
+        
+        Acepta un arreglo JSON de objetos {alumno, materia, periodo, calificacion},
+        un cuerpo text/csv con esa cabecera, o un archivo CSV en el campo 'archivo'.
+        
+        Returns:
+            200 OK: { recibidas, guardadas, errores: [{fila, errores}] }
+            400 Bad Request: formato inválido o ninguna fila válida
+        """
+        filas = leer_filas(request, 'calificaciones')
+        if filas is None:
+            return Response(
+                {'error': 'Se esperaba un arreglo de calificaciones o un CSV'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        resultado = CalificacionService().carga_masiva(filas)
+        codigo = status.HTTP_200_OK
+        if filas and not resultado['guardadas']:
+            codigo = status.HTTP_400_BAD_REQUEST
+        return Response(resultado, status=codigo)
+    
+    @action(detail=False, methods=['get'])
+    def resumen(self, request):
+        """
+        Resumen agregado de calificaciones (promedios, mínimo, máximo, aprobación y puesto).
+        
+        Query params:
+            agrupar: dimensiones separadas por coma (alumno, materia, grado, periodo);
+                     la primera es la que se ordena por puesto dentro de las demás.
+                     Por defecto 'alumno'.
+            alumno, materia, periodo, grado, institucion: filtros por ID
+            aprobatoria: nota mínima para aprobar (por defecto CALIFICACION_APROBATORIA)
+            fuente: 'calificaciones' para no usar el resumen materializado
+            cache: 'false' para omitir la caché
+            page, page_size, sin_conteo: paginación por número de página
+        """
+        servicio = ResumenCalificacionesService()
+        try:
+            agrupar = servicio.validar_agrupacion(request.query_params.get('agrupar', '').split(','))
+            aprobatoria = request.query_params.get('aprobatoria')
+            aprobatoria = Decimal(aprobatoria) if aprobatoria else None
+        except (ValueError, InvalidOperation) as e:
+            return Response(
+                {'error': str(e) if isinstance(e, ValueError) else 'Nota aprobatoria inválida'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        filtros = {nombre: request.query_params.get(nombre) for nombre in FILTROS_RESUMEN}
+        
+        def calcular():
+            paginator = StandardPagination()
+            filas = paginator.paginate_queryset(
+                servicio.resumen(agrupar, filtros, aprobatoria,
+                                 fuente=request.query_params.get('fuente', 'auto')),
+                request, view=self
+            )
+            return paginator.get_paginated_response(servicio.formatear(filas, agrupar)).data
+        
+        ttl = getattr(settings, 'RESUMEN_CACHE_TTL', 300)
+        if not ttl or request.query_params.get('cache', '').lower() == 'false':
+            return Response(calcular())
+        partes = ('resumen', sorted(request.query_params.lists()), request.build_absolute_uri('/'))
+        return Response(obtener_o_calcular(['calificaciones'], partes, calcular, timeout=ttl))
+    
+    @action(detail=False, methods=['get'])
+    def exportar(self, request):
+        """Exporta las calificaciones filtradas en streaming (?formato=csv|jsonl)"""
+        return exportar(request, self.get_queryset(), self.COLUMNAS_EXPORTACION, 'calificaciones')
 
 
-class PersonalViewSet(viewsets.ModelViewSet):
+class PersonalViewSet(PeticionCondicionalMixin, PaginacionSeleccionableMixin, SeleccionCamposMixin, QueryPlanMixin, LecturaValoresMixin, viewsets.ModelViewSet):
     queryset = Personal.objects.all()
     serializer_class = PersonalSerializer
+    COLUMNAS_EXPORTACION = [
+        ('id', 'id'),
+        ('nombre', 'nombre'),
+        ('apellido', 'apellido'),
+        ('cedula', 'cedula'),
+        ('cargo', 'cargo'),
+        ('fecha_ingreso', 'fecha_ingreso'),
+        ('estado', 'estado'),
+        ('email', 'email'),
+        ('telefono', 'telefono'),
+        ('institucion', 'institucion_id'),
+        ('institucion_nombre', 'institucion__nombre'),
+    ]
     
     def get_queryset(self):
-        queryset = Personal.objects.all()
+        queryset = super().get_queryset()
         cargo = self.request.query_params.get('cargo', None)
         institucion_id = self.request.query_params.get('institucion', None)
         estado = self.request.query_params.get('estado', None)
@@ -84,12 +201,13 @@ class PersonalViewSet(viewsets.ModelViewSet):
         if estado is not None:
             queryset = queryset.filter(estado=estado.lower() == 'true')
         if search:
-            queryset = queryset.filter(
-                Q(nombre__icontains=search) | 
-                Q(apellido__icontains=search) | 
-                Q(cedula__icontains=search)
-            )
+            queryset = buscador('personal').filtrar(queryset, search)
         return queryset
+    
+    @action(detail=False, methods=['get'])
+    def exportar(self, request):
+        """Exporta el personal filtrado en streaming (?formato=csv|jsonl)"""
+        return exportar(request, self.get_queryset(), self.COLUMNAS_EXPORTACION, 'personal')
 
 
 # Authentication ViewSet for user login/logout operations
@@ -100,6 +218,7 @@ class AuthViewSet(viewsets.ViewSet):
     Endpoints:
         POST /api/auth/login/ - User login
         POST /api/auth/logout/ - User logout
+        POST /api/auth/refresh/ - New signed access token (AUTH_TOKEN_MODO=firmado)
         GET /api/auth/me/ - Get current user info
         
     Educational System Roles:
@@ -125,6 +244,8 @@ class AuthViewSet(viewsets.ViewSet):
             
         Returns:
             200 OK: { token, user: { id, username, email, rol, ... } }
+                    with AUTH_TOKEN_MODO=firmado also { access, refresh, expires_in }
+                    (token == access, see school.api.autenticacion)
             401 Unauthorized: { error: "Invalid credentials" }
         """
         username = request.data.get('username')
@@ -138,25 +259,16 @@ class AuthViewSet(viewsets.ViewSet):
         
         user = authenticate(username=username, password=password)
         if user:
-            token, _ = Token.objects.get_or_create(user=user)
-            
-            # Determine user role based on Django permissions:
-            # - Administrador: superuser (full access to system management)
-            # - Docente: staff member (can manage courses and students)
-            # - Estudiante: regular user (can access learning materials)
-            if user.is_superuser:
-                rol = 'Administrador'
-            elif user.is_staff:
-                rol = 'Docente'
-            else:
-                rol = 'Estudiante'
+            # Determine user role based on Django permissions (see rol_de):
+            # Administrador (superuser), Docente (staff) or Estudiante
+            rol = rol_de(user)
             
             # Include 'rol' in user object for frontend compatibility (auth.ts expects response.user.rol)
             user_data = UserSerializer(user).data
             user_data['rol'] = rol  # Add role to user object
             
             return Response({
-                'token': token.key,
+                **self._tokens(user),
                 'user': user_data,
                 'rol': rol,  # Also at top level for flexibility
                 'is_staff': user.is_staff,
@@ -168,8 +280,54 @@ class AuthViewSet(viewsets.ViewSet):
                 status=status.HTTP_401_UNAUTHORIZED
             )
     
+    @staticmethod
+    def _tokens(user):
+        """DB token (default) or signed access + refresh token, per AUTH_TOKEN_MODO"""
+        if settings.AUTH_TOKEN_MODO == 'firmado':
+            access, expires_in = emitir_acceso(user)
+            return {'token': access, 'access': access, 'refresh': emitir_refresh(user), 'expires_in': expires_in}
+        token, _ = Token.objects.get_or_create(user=user)
+        return {'token': token.key}
+    
+    @action(detail=False, methods=['post'])
+    def refresh(self, request):
+        """
+        Exchange a refresh token for a new signed access token.
+        The refresh token is rotated: the response carries a new one.
+        
+        Request Body:
+            - refresh (str): Refresh token from login or a previous refresh
+            
+        Returns:
+            200 OK: { token, access, refresh, expires_in, rol }
+            401 Unauthorized: invalid, expired, revoked or reused refresh token
+        """
+        valor = request.data.get('refresh')
+        if not valor or not isinstance(valor, str):
+            return Response(
+                {'error': 'Refresh token is required'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            user, nuevo = rotar_refresh(valor)
+        except AuthenticationFailed as e:
+            return Response({'error': str(e.detail)}, status=status.HTTP_401_UNAUTHORIZED)
+        access, expires_in = emitir_acceso(user)
+        return Response({
+            'token': access,
+            'access': access,
+            'refresh': nuevo,
+            'expires_in': expires_in,
+            'rol': rol_de(user),
+        })
+    
     @action(detail=False, methods=['post'])
     def logout(self, request):
+        if isinstance(request.user, UsuarioFirmado):
+            # The signed access token stays valid until it expires (AUTH_ACCESO_TTL);
+            # revoke the given refresh token, or all of them if none is sent
+            revocar_refresh(request.user.pk, request.data.get('refresh'))
+            return Response({'message': 'Logout exitoso'})
         if request.user.is_authenticated:
             try:
                 request.user.auth_token.delete()
@@ -186,6 +344,8 @@ class AuthViewSet(viewsets.ViewSet):
     
     @action(detail=False, methods=['get'])
     def me(self, request):
+        if isinstance(request.user, UsuarioFirmado):
+            return Response(request.auth['datos'])  # From the signed claims, no query
         if request.user.is_authenticated:
             return Response(UserSerializer(request.user).data)
         else:
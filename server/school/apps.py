@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class SchoolConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'school'
+
+    def ready(self):
+        from django.conf import settings
+        from school import signals  # noqa: F401  (registra los receivers)
+        from core.conexiones import precalentar
+
+        if getattr(settings, 'DB_PRECALENTAR', False):
+            precalentar()
@@ -0,0 +1,7 @@
+"""
+Búsqueda de alumnos y personal (sin acentos, con ranking y autocompletado)
+"""
+from .motor import Buscador, buscador
+from .normalizacion import normalizar
+
+__all__ = ['Buscador', 'buscador', 'normalizar']
@@ -0,0 +1,132 @@
+"""
+Índice de búsqueda en memoria
+
+Respaldo para bases sin pg_trgm (SQLite en desarrollo y pruebas). Guarda el
+texto normalizado de cada fila y un índice invertido de subcadenas de 3
+caracteres: los candidatos de un término son la intersección de las listas
+de sus subcadenas, y luego se confirma el contenido sobre el texto. Para
+autocompletar mantiene una lista ordenada de palabras y busca el prefijo con
+bisect.
+"""
+import bisect
+import heapq
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from school.busqueda.normalizacion import similitud, subcadenas, trigramas
+
+
+def _orden(par: Tuple[int, float]):
+    return -par[1], par[0]
+
+
+class IndiceMemoria:
+    """Índice invertido pk -> texto normalizado"""
+
+    def __init__(self):
+        self.textos: Dict[int, str] = {}
+        self._subcadenas: Dict[str, Set[int]] = defaultdict(set)
+        self._palabras: Optional[List[Tuple[str, int]]] = None
+        self._lock = threading.RLock()
+        self.version = None
+
+    def __len__(self):
+        return len(self.textos)
+
+    def cargar(self, filas: Iterable[Tuple[int, str]]) -> None:
+        """Reemplaza el contenido con pares (pk, texto normalizado)"""
+        with self._lock:
+            self.textos = {}
+            self._subcadenas = defaultdict(set)
+            for pk, texto in filas:
+                self._agregar(pk, texto)
+            self._palabras = None
+
+    def _agregar(self, pk: int, texto: str) -> None:
+        self.textos[pk] = texto
+        for subcadena in subcadenas(texto):
+            self._subcadenas[subcadena].add(pk)
+
+    def agregar(self, pk: int, texto: str) -> None:
+        with self._lock:
+            self._eliminar(pk)
+            self._agregar(pk, texto)
+            self._palabras = None
+
+    def _eliminar(self, pk: int) -> None:
+        anterior = self.textos.pop(pk, None)
+        if anterior is None:
+            return
+        for subcadena in subcadenas(anterior):
+            pks = self._subcadenas.get(subcadena)
+            if pks is not None:
+                pks.discard(pk)
+                if not pks:
+                    del self._subcadenas[subcadena]
+
+    def eliminar(self, pk: int) -> None:
+        with self._lock:
+            self._eliminar(pk)
+            self._palabras = None
+
+    def _contienen(self, termino: str, universo: Optional[Set[int]] = None) -> Set[int]:
+        """Filas cuyo texto contiene `termino`"""
+        if len(termino) >= 3:
+            listas = sorted((self._subcadenas.get(s, set()) for s in subcadenas(termino)), key=len)
+            posibles = set(listas[0])
+            for lista in listas[1:]:
+                posibles &= lista
+                if not posibles:
+                    break
+        else:
+            posibles = set(self.textos)
+        if universo is not None:
+            posibles &= universo
+        return {pk for pk in posibles if termino in self.textos[pk]}
+
+    def candidatos(self, terminos: Sequence[str]) -> Set[int]:
+        """Filas que contienen todos los términos"""
+        with self._lock:
+            resultado = None
+            for termino in sorted(terminos, key=len, reverse=True):
+                resultado = self._contienen(termino, resultado)
+                if not resultado:
+                    return set()
+            return resultado if resultado is not None else set(self.textos)
+
+    def _con_prefijo(self, prefijo: str) -> Set[int]:
+        if self._palabras is None:
+            self._palabras = sorted(
+                (palabra, pk) for pk, texto in self.textos.items() for palabra in texto.split(' ')
+            )
+        inicio = bisect.bisect_left(self._palabras, (prefijo,))
+        resultado = set()
+        for palabra, pk in self._palabras[inicio:]:
+            if not palabra.startswith(prefijo):
+                break
+            resultado.add(pk)
+        return resultado
+
+    def candidatos_prefijo(self, terminos: Sequence[str]) -> Set[int]:
+        """Filas con alguna palabra que empieza por el último término y que contienen los demás"""
+        with self._lock:
+            resultado = self._con_prefijo(terminos[-1])
+            for termino in terminos[:-1]:
+                if not resultado:
+                    break
+                resultado = self._contienen(termino, resultado)
+            return resultado
+
+    def ordenar(self, pks: Iterable[int], consulta: str,
+                limite: Optional[int] = None) -> List[Tuple[int, float]]:
+        """(pk, puntaje) ordenados por similitud descendente y luego por pk"""
+        trigramas_consulta = trigramas(consulta)
+        with self._lock:
+            puntajes = [
+                (pk, similitud(trigramas_consulta, trigramas(self.textos[pk])))
+                for pk in pks if pk in self.textos
+            ]
+        if limite is not None and limite < len(puntajes):
+            return heapq.nsmallest(limite, puntajes, key=_orden)
+        puntajes.sort(key=_orden)
+        return puntajes
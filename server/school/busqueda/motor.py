@@ -0,0 +1,211 @@
+"""
+Motor de búsqueda por modelo
+
+Cada Buscador conoce los campos de texto de su modelo y resuelve tres
+operaciones sobre un queryset ya filtrado:
+
+    filtrar()       filas que contienen todos los términos (para ?search=)
+    buscar()        mejores resultados ordenados por similitud
+    autocompletar() filas con una palabra que empieza por el último término
+
+En PostgreSQL se usa la expresión indexada con GIN/pg_trgm (migración 0006):
+school_inmutable_unaccent(lower(campo1 || ' ' || campo2 ...)) con LIKE y
+SIMILARITY(). En otras bases se usa el índice en memoria (IndiceMemoria),
+sincronizado por señales y por la versión del espacio de nombres en la caché;
+las mismas funciones SQL se registran en SQLite para los casos en que el
+índice en memoria devolvería demasiados candidatos para un `pk IN (...)`.
+"""
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+from django.db import connections
+from django.db.models import FloatField, Func, Q, QuerySet, Value
+from core.replicas import lecturas_primaria
+from school.busqueda.indice_memoria import IndiceMemoria
+from school.busqueda.normalizacion import normalizar, similitud, terminos, trigramas
+from school.cache import invalidar, version
+from school.models import Alumno, Personal
+
+
+FUNCION_UNACCENT = 'school_inmutable_unaccent'
+
+# Con más candidatos que parámetros admite la base se filtra con SQL en lugar
+# de pk IN (...); se reserva un margen para los demás filtros del queryset
+MAX_CANDIDATOS_IN = 5000
+MARGEN_PARAMETROS = 100
+
+TAMANO_LOTE = 500
+
+
+class TextoBusqueda(Func):
+    """unaccent(lower(campo1 || ' ' || campo2 ...)); debe coincidir con el índice"""
+    function = FUNCION_UNACCENT
+    template = '%(function)s(lower(%(expressions)s))'
+    arg_joiner = " || ' ' || "
+
+
+class Similitud(Func):
+    """similarity() de pg_trgm (registrada también en SQLite)"""
+    function = 'SIMILARITY'
+    output_field = FloatField()
+
+
+def _similitud_sqlite(texto, consulta):
+    if texto is None or consulta is None:
+        return None
+    return similitud(trigramas(consulta), trigramas(texto))
+
+
+def registrar_funciones_sqlite(connection) -> None:
+    """Registra en una conexión SQLite las funciones que en PostgreSQL crea la migración"""
+    connection.connection.create_function(FUNCION_UNACCENT, 1, normalizar, deterministic=True)
+    connection.connection.create_function('SIMILARITY', 2, _similitud_sqlite, deterministic=True)
+
+
+class Buscador:
+    """Búsqueda de texto sobre un modelo"""
+
+    def __init__(self, nombre: str, model, campos: Sequence[str]):
+        self.nombre = nombre
+        self.model = model
+        self.campos = tuple(campos)
+        self.namespace = f'busqueda.{nombre}'
+        self._indice = IndiceMemoria()
+        self._lock = threading.Lock()
+
+    # --- Infraestructura -------------------------------------------------
+
+    def expresion(self) -> TextoBusqueda:
+        return TextoBusqueda(*self.campos)
+
+    def texto(self, instancia) -> str:
+        """Texto normalizado de una instancia (igual al de la expresión SQL)"""
+        return normalizar(' '.join(str(getattr(instancia, campo) or '') for campo in self.campos))
+
+    @staticmethod
+    def usa_sql(queryset: QuerySet) -> bool:
+        return connections[queryset.db].vendor == 'postgresql'
+
+    @staticmethod
+    def max_candidatos(queryset: QuerySet) -> int:
+        """Máximo de pks para un IN (...): MAX_CANDIDATOS_IN, o menos si el límite de variables de SQLite es menor"""
+        conexion = connections[queryset.db]
+        conexion.ensure_connection()
+        try:
+            limite = conexion.connection.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        except AttributeError:
+            return MAX_CANDIDATOS_IN
+        return min(limite - MARGEN_PARAMETROS, MAX_CANDIDATOS_IN)
+
+    def indice(self) -> IndiceMemoria:
+        """Índice en memoria actualizado (se reconstruye si cambió la versión)"""
+        actual = version(self.namespace)
+        if self._indice.version != actual:
+            with self._lock:
+                if self._indice.version != actual:
+                    with lecturas_primaria():
+                        filas = self.model.objects.values_list('pk', *self.campos).iterator(chunk_size=5000)
+                        self._indice.cargar(
+                            (fila[0], normalizar(' '.join(str(valor or '') for valor in fila[1:])))
+                            for fila in filas
+                        )
+                    self._indice.version = actual
+        return self._indice
+
+    def registrar_cambio(self, instancia, eliminada: bool = False) -> None:
+        """Aplica un alta/baja/cambio al índice local e invalida el de otros procesos"""
+        sincronizado = self._indice.version is not None and self._indice.version == version(self.namespace)
+        invalidar(self.namespace)
+        if not sincronizado:
+            return
+        if eliminada:
+            self._indice.eliminar(instancia.pk)
+        else:
+            self._indice.agregar(instancia.pk, self.texto(instancia))
+        self._indice.version = version(self.namespace)
+
+    def invalidar(self) -> None:
+        """Para cargas masivas que no emiten señales"""
+        invalidar(self.namespace)
+
+    # --- Operaciones -----------------------------------------------------
+
+    def _filtro_sql(self, queryset: QuerySet, palabras: Sequence[str], prefijo: bool = False) -> QuerySet:
+        queryset = queryset.alias(texto_busqueda=self.expresion())
+        contenidas = palabras[:-1] if prefijo else palabras
+        for palabra in contenidas:
+            queryset = queryset.filter(texto_busqueda__contains=palabra)
+        if prefijo:
+            ultima = palabras[-1]
+            queryset = queryset.filter(
+                Q(texto_busqueda__startswith=ultima) | Q(texto_busqueda__contains=f' {ultima}')
+            )
+        return queryset
+
+    def filtrar(self, queryset: QuerySet, consulta: str) -> QuerySet:
+        """Filas del queryset que contienen todos los términos, sin importar acentos"""
+        palabras = terminos(consulta)
+        if not palabras:
+            return queryset
+        if not self.usa_sql(queryset):
+            candidatos = self.indice().candidatos(palabras)
+            if len(candidatos) <= self.max_candidatos(queryset):
+                return queryset.filter(pk__in=candidatos)
+        return self._filtro_sql(queryset, palabras)
+
+    def _ordenar_sql(self, queryset: QuerySet, consulta: str, limite: int) -> List[Tuple[object, float]]:
+        filas = (
+            queryset
+            .annotate(puntaje=Similitud(self.expresion(), Value(consulta)))
+            .order_by('-puntaje', 'pk')[:limite]
+        )
+        return [(fila, fila.puntaje) for fila in filas]
+
+    def _ordenar_memoria(self, queryset: QuerySet, candidatos, consulta: str,
+                         limite: int) -> List[Tuple[object, float]]:
+        # Sin filtros adicionales todos los candidatos son válidos: basta con los primeros
+        sin_filtros = not queryset.query.where
+        ordenados = self.indice().ordenar(candidatos, consulta, limite if sin_filtros else None)
+        elegidos: List[Tuple[int, float]] = []
+        for inicio in range(0, len(ordenados), TAMANO_LOTE):
+            lote = ordenados[inicio:inicio + TAMANO_LOTE]
+            permitidos = set(queryset.filter(pk__in=[pk for pk, _ in lote]).values_list('pk', flat=True))
+            elegidos.extend(par for par in lote if par[0] in permitidos)
+            if len(elegidos) >= limite:
+                break
+        elegidos = elegidos[:limite]
+        objetos = queryset.in_bulk([pk for pk, _ in elegidos])
+        return [(objetos[pk], puntaje) for pk, puntaje in elegidos if pk in objetos]
+
+    def buscar(self, queryset: QuerySet, consulta: str, limite: int = 20) -> List[Tuple[object, float]]:
+        """[(objeto, puntaje)] de las filas que contienen todos los términos, por similitud"""
+        palabras = terminos(consulta)
+        if not palabras:
+            return []
+        normalizada = ' '.join(palabras)
+        if self.usa_sql(queryset):
+            return self._ordenar_sql(self._filtro_sql(queryset, palabras), normalizada, limite)
+        candidatos = self.indice().candidatos(palabras)
+        return self._ordenar_memoria(queryset, candidatos, normalizada, limite)
+
+    def autocompletar(self, queryset: QuerySet, consulta: str, limite: int = 10) -> List[Tuple[object, float]]:
+        """Como buscar(), pero el último término se toma como prefijo de palabra"""
+        palabras = terminos(consulta)
+        if not palabras:
+            return []
+        normalizada = ' '.join(palabras)
+        if self.usa_sql(queryset):
+            return self._ordenar_sql(self._filtro_sql(queryset, palabras, prefijo=True), normalizada, limite)
+        candidatos = self.indice().candidatos_prefijo(palabras)
+        return self._ordenar_memoria(queryset, candidatos, normalizada, limite)
+
+
+BUSCADORES: Dict[str, Buscador] = {
+    'alumnos': Buscador('alumnos', Alumno, ('nombre', 'apellido', 'matricula')),
+    'personal': Buscador('personal', Personal, ('nombre', 'apellido', 'cedula')),
+}
+
+
+def buscador(nombre: str) -> Optional[Buscador]:
+    """Buscador registrado por nombre ('alumnos', 'personal')"""
+    return BUSCADORES.get(nombre)
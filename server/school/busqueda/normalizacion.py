@@ -0,0 +1,50 @@
+"""
+Normalización de texto y trigramas para la búsqueda
+
+normalizar() reproduce en Python la expresión indexada en PostgreSQL
+(unaccent(lower(...))): minúsculas, sin acentos ni diéresis, espacios
+colapsados. Los trigramas y la similitud siguen las reglas de pg_trgm para
+que el índice en memoria ordene igual que SIMILARITY() en la base de datos.
+"""
+import re
+import unicodedata
+from typing import FrozenSet, List, Set
+
+
+_ESPACIOS = re.compile(r'\s+')
+_NO_ALFANUMERICO = re.compile(r'[^0-9a-z]+')
+
+
+def normalizar(texto) -> str:
+    """'  José  NÚÑEZ ' -> 'jose nunez'"""
+    texto = unicodedata.normalize('NFKD', str(texto or '')).lower()
+    texto = ''.join(caracter for caracter in texto if not unicodedata.combining(caracter))
+    return _ESPACIOS.sub(' ', texto).strip()
+
+
+def terminos(consulta) -> List[str]:
+    """Términos normalizados de una consulta (separados por espacios)"""
+    return normalizar(consulta).split()
+
+
+def trigramas(texto: str) -> FrozenSet[str]:
+    """Trigramas estilo pg_trgm: por palabra alfanumérica, con relleno '  p '"""
+    resultado = set()
+    for palabra in _NO_ALFANUMERICO.split(texto):
+        if palabra:
+            relleno = f'  {palabra} '
+            resultado.update(relleno[i:i + 3] for i in range(len(relleno) - 2))
+    return frozenset(resultado)
+
+
+def similitud(consulta: FrozenSet[str], texto: FrozenSet[str]) -> float:
+    """Trigramas compartidos / trigramas totales (similarity() de pg_trgm)"""
+    if not consulta or not texto:
+        return 0.0
+    compartidos = len(consulta & texto)
+    return compartidos / (len(consulta) + len(texto) - compartidos)
+
+
+def subcadenas(texto: str) -> Set[str]:
+    """Subcadenas de 3 caracteres (sin relleno) para filtrar candidatos por contenido"""
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
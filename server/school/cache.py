@@ -0,0 +1,57 @@
+"""
+Caché versionada por espacio de nombres
+
+Cada espacio de nombres (ej. 'calificaciones') tiene un número de versión
+guardado en la caché. Las claves incluyen esa versión, por lo que invalidar
+un espacio completo es un solo incremento: las entradas anteriores quedan
+huérfanas y expiran por su TTL.
+
+Los valores se calculan leyendo de la base primaria (ver core.replicas).
+"""
+import hashlib
+import json
+from typing import Any, Callable, Iterable
+from django.core.cache import cache
+from core.replicas import lecturas_primaria
+
+
+def _clave_version(namespace: str) -> str:
+    return f'school:version:{namespace}'
+
+
+def version(namespace: str) -> int:
+    """Versión actual del espacio de nombres"""
+    return cache.get_or_set(_clave_version(namespace), 1, timeout=None)
+
+
+def invalidar(*namespaces: str) -> None:
+    """Invalida todas las entradas de los espacios de nombres dados"""
+    for namespace in namespaces:
+        clave = _clave_version(namespace)
+        try:
+            cache.incr(clave)
+        except ValueError:
+            # La versión no existía (o expiró): cualquier valor nuevo sirve
+            cache.set(clave, 2, timeout=None)
+
+
+def construir_clave(namespaces: Iterable[str], *partes: Any) -> str:
+    """Clave que depende de las versiones de los espacios y de `partes`"""
+    namespaces = list(namespaces)
+    versiones = [f'{ns}.{version(ns)}' for ns in namespaces]
+    huella = hashlib.sha1(
+        json.dumps(partes, default=str, sort_keys=True).encode('utf-8')
+    ).hexdigest()
+    return f"school:{'+'.join(versiones)}:{huella}"
+
+
+def obtener_o_calcular(namespaces: Iterable[str], partes: tuple, calcular: Callable[[], Any],
+                       timeout: int = 300) -> Any:
+    """Devuelve el valor cacheado o lo calcula y lo guarda"""
+    clave = construir_clave(namespaces, *partes)
+    valor = cache.get(clave)
+    if valor is None:
+        with lecturas_primaria():
+            valor = calcular()
+        cache.set(clave, valor, timeout=timeout)
+    return valor
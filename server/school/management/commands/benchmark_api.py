@@ -0,0 +1,283 @@
+"""
+Mide latencia (p50/p99) y cantidad de consultas de cada endpoint del router.
+
+Recorre router.registry de school.api.urls y, según lo que implemente cada
+viewset, mide con el cliente de pruebas de Django:
+
+    list       GET /api/<prefijo>/
+    retrieve   GET /api/<prefijo>/<id>/   (id del primer elemento del listado)
+    create     POST /api/<prefijo>/       (copia del detalle con campos únicos cambiados)
+    acciones   GET de las acciones extra sin detalle (ej. /api/dashboard/stats/)
+
+Cada alta se ejecuta en una transacción propia que se revierte, de modo que
+la base queda intacta; antes de revertir se ejecutan sus callbacks
+on_commit (resúmenes, índice de búsqueda) para medir el trabajo completo.
+Las lecturas no se envuelven en una transacción: con réplicas configuradas
+se miden contra las réplicas. Los resultados se guardan como línea base en
+JSON y se pueden comparar con una anterior. Si alguna respuesta medida no es
+2xx el comando termina con error (y no guarda la línea base). Para datos
+representativos, generar antes el conjunto sintético con
+`python manage.py seed_bench_data`.
+
+Uso:
+    python manage.py benchmark_api --json base.json
+    python manage.py benchmark_api --endpoints grados calificaciones --repeticiones 50
+    python manage.py benchmark_api --comparar base.json --tolerancia 0.25 --estricto
+"""
+import json
+import platform
+import statistics
+import time
+from datetime import datetime
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from school.api.urls import router
+from school.busqueda.motor import BUSCADORES
+from school.models import Periodo
+
+
+# Prefijos que no se miden (autenticación: requiere credenciales y sesión)
+SIN_MEDIR = {'auth'}
+
+# Acciones extra excluidas: recorren la tabla completa (se miden aparte)
+ACCIONES_EXCLUIDAS = {'exportar'}
+
+# Query string necesaria por operación ('<prefijo>:<operación>')
+PARAMETROS = {
+    'busqueda:list': 'q=perez',
+    'busqueda:autocompletar': 'q=per',
+    'calificaciones:resumen': 'agrupar=alumno',
+}
+
+SEPARADOR = '─' * 100
+
+
+def _percentil(valores, percentil):
+    """Percentil por interpolación (n=100 de statistics.quantiles)"""
+    if len(valores) == 1:
+        return valores[0]
+    return statistics.quantiles(valores, n=100, method='inclusive')[percentil - 1]
+
+
+def _consumir(respuesta) -> bytes:
+    if respuesta.streaming:
+        return b''.join(respuesta.streaming_content)
+    return respuesta.content
+
+
+class Command(BaseCommand):
+    help = 'Mide p50/p99 y consultas por endpoint y guarda/compara una línea base JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoints', nargs='+', help='Prefijos del router a medir (por defecto todos)')
+        parser.add_argument('--repeticiones', type=int, default=30)
+        parser.add_argument('--calentamiento', type=int, default=3, help='Peticiones previas no medidas')
+        parser.add_argument('--sin-cache', action='store_true',
+                            help='Agregar cache=false para medir sin la caché de respuestas')
+        parser.add_argument('--json', dest='json_path', help='Guardar la línea base en un archivo JSON')
+        parser.add_argument('--comparar', help='Línea base JSON con la que comparar')
+        parser.add_argument('--tolerancia', type=float, default=0.25,
+                            help='Aumento relativo de p50/p99 tolerado al comparar (0.25 = 25%%)')
+        parser.add_argument('--estricto', action='store_true',
+                            help='Terminar con error si hay regresiones respecto de --comparar')
+
+    # --- Medición --------------------------------------------------------
+
+    def _medir(self, peticion, repeticiones, calentamiento):
+        """Ejecuta `peticion` y devuelve las estadísticas de las repeticiones medidas"""
+        tiempos, consultas = [], []
+        respuesta = cuerpo = None
+        for indice in range(calentamiento + repeticiones):
+            with CaptureQueriesContext(connection) as ctx:
+                inicio = time.perf_counter()
+                respuesta = peticion()
+                cuerpo = _consumir(respuesta)
+                transcurrido = (time.perf_counter() - inicio) * 1000
+            if indice >= calentamiento:
+                tiempos.append(transcurrido)
+                consultas.append(len(ctx))
+        return {
+            'estado': respuesta.status_code,
+            'p50_ms': round(_percentil(tiempos, 50), 2),
+            'p99_ms': round(_percentil(tiempos, 99), 2),
+            'media_ms': round(statistics.fmean(tiempos), 2),
+            'consultas': int(statistics.median(consultas)),
+            'consultas_max': max(consultas),
+            'bytes': len(cuerpo),
+        }, cuerpo
+
+    def _crear(self, client, url, datos):
+        """POST dentro de una transacción revertida, con sus callbacks on_commit ejecutados"""
+        with transaction.atomic():
+            respuesta = client.post(url, data=json.dumps(datos), content_type='application/json')
+            # Como captureOnCommitCallbacks(execute=True): la transacción no se confirma
+            for entrada in list(connection.run_on_commit):
+                entrada[1]()
+            transaction.set_rollback(True)
+        return respuesta
+
+    @staticmethod
+    def _datos_creacion(prefijo, detalle, secuencia, periodo):
+        """Cuerpo de alta a partir del detalle de un elemento existente"""
+        datos = {clave: valor for clave, valor in detalle.items() if clave != 'id' and valor is not None}
+        if 'matricula' in datos:
+            datos['matricula'] = f'BENCHAPI-{secuencia:06d}'
+        if 'cedula' in datos:
+            datos['cedula'] = f'BENCHAPI-{secuencia:06d}'
+        if prefijo == 'calificaciones':
+            datos['periodo'] = periodo.pk  # (alumno, materia, periodo) es único
+        return datos
+
+    def _operaciones(self, client, prefijo, viewset, sufijo):
+        """(nombre, url, función de petición) a medir para un prefijo del router"""
+        base = f'/api/{prefijo}/'
+
+        def url(operacion, ruta=base):
+            parametros = '&'.join(p for p in (PARAMETROS.get(f'{prefijo}:{operacion}'), sufijo) if p)
+            return f'{ruta}?{parametros}' if parametros else ruta
+
+        operaciones = []
+        if hasattr(viewset, 'list'):
+            listado = url('list')
+            operaciones.append(('list', listado, lambda: client.get(listado)))
+        for accion in viewset.get_extra_actions():
+            if accion.detail or 'get' not in accion.mapping or accion.url_path in ACCIONES_EXCLUIDAS:
+                continue
+            destino = url(accion.url_path, f'{base}{accion.url_path}/')
+            operaciones.append((accion.url_path, destino, lambda destino=destino: client.get(destino)))
+        return operaciones
+
+    def _primer_elemento(self, client, prefijo):
+        respuesta = client.get(f'/api/{prefijo}/', {'page_size': 1, 'cache': 'false'})
+        if respuesta.status_code != 200:
+            return None
+        datos = respuesta.json()
+        filas = datos.get('results', datos) if isinstance(datos, dict) else datos
+        return filas[0] if filas and isinstance(filas[0], dict) and 'id' in filas[0] else None
+
+    def handle(self, *args, **options):
+        # Client() envía 'Host: testserver', que ALLOWED_HOSTS rechaza (400 DisallowedHost)
+        host = next((h for h in settings.ALLOWED_HOSTS if h != '*' and not h.startswith('.')), 'testserver')
+        client = Client(HTTP_HOST=host)
+        prefijos = [registro for registro in router.registry if registro[0] not in SIN_MEDIR]
+        if options['endpoints']:
+            desconocidos = set(options['endpoints']) - {prefijo for prefijo, _, _ in prefijos}
+            if desconocidos:
+                raise CommandError(f"Endpoints desconocidos: {', '.join(sorted(desconocidos))}")
+            prefijos = [registro for registro in prefijos if registro[0] in options['endpoints']]
+        sufijo = 'cache=false' if options['sin_cache'] else ''
+        repeticiones, calentamiento = options['repeticiones'], options['calentamiento']
+        resultados = {}
+
+        fallidas = []
+
+        def registrar(clave, url, estadisticas):
+            resultados[clave] = dict(estadisticas, url=url)
+            if not 200 <= estadisticas['estado'] < 300:
+                fallidas.append(f"{clave} ({url}) -> {estadisticas['estado']}")
+            self.stdout.write(
+                f"{clave:<38} {estadisticas['estado']:>3}  p50 {estadisticas['p50_ms']:>9} ms  "
+                f"p99 {estadisticas['p99_ms']:>9} ms  {estadisticas['consultas']:>3}q  "
+                f"{estadisticas['bytes']:>9} B"
+            )
+
+        # Periodo auxiliar para que las altas de calificaciones no choquen con las existentes
+        periodo = Periodo.objects.create(nombre='BENCHAPI', fecha_inicio='2000-01-01', fecha_fin='2000-12-31')
+        try:
+            for prefijo, viewset, _ in prefijos:
+                for operacion, url, peticion in self._operaciones(client, prefijo, viewset, sufijo):
+                    estadisticas, _ = self._medir(peticion, repeticiones, calentamiento)
+                    registrar(f'GET {prefijo} {operacion}', url, estadisticas)
+
+                if not hasattr(viewset, 'list') or not (hasattr(viewset, 'retrieve') or hasattr(viewset, 'create')):
+                    continue
+                primero = self._primer_elemento(client, prefijo)
+                if primero is None:
+                    continue
+                if hasattr(viewset, 'retrieve'):
+                    detalle_url = f"/api/{prefijo}/{primero['id']}/" + (f'?{sufijo}' if sufijo else '')
+                    estadisticas, cuerpo = self._medir(lambda: client.get(detalle_url), repeticiones, calentamiento)
+                    registrar(f'GET {prefijo} retrieve', detalle_url, estadisticas)
+                    detalle = json.loads(cuerpo) if estadisticas['estado'] == 200 else primero
+                else:
+                    detalle = primero
+                if hasattr(viewset, 'create'):
+                    secuencia = iter(range(1, calentamiento + repeticiones + 1))
+                    alta_url = f'/api/{prefijo}/'
+                    estadisticas, _ = self._medir(
+                        lambda: self._crear(client, alta_url,
+                                            self._datos_creacion(prefijo, detalle, next(secuencia), periodo)),
+                        repeticiones, calentamiento,
+                    )
+                    registrar(f'POST {prefijo} create', alta_url, estadisticas)
+
+        finally:
+            periodo.delete()
+            # Los índices de búsqueda en memoria recibieron las altas revertidas
+            for motor in BUSCADORES.values():
+                motor.invalidar()
+
+        if fallidas:
+            # Una línea base con páginas de error no mide los endpoints
+            raise CommandError('Respuestas que no son 2xx:\n  ' + '\n  '.join(fallidas))
+
+        linea_base = {
+            'meta': {
+                'fecha': datetime.now().isoformat(timespec='seconds'),
+                'base_de_datos': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'repeticiones': repeticiones,
+                'sin_cache': options['sin_cache'],
+            },
+            'resultados': resultados,
+        }
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as archivo:
+                json.dump(linea_base, archivo, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Línea base guardada en {options['json_path']}"))
+
+        if options['comparar']:
+            self._comparar(resultados, options['comparar'], options['tolerancia'], options['estricto'])
+
+    # --- Comparación -----------------------------------------------------
+
+    def _comparar(self, resultados, ruta, tolerancia, estricto):
+        try:
+            with open(ruta, encoding='utf-8') as archivo:
+                anterior = json.load(archivo)['resultados']
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f'No se pudo leer la línea base {ruta}: {e}')
+
+        self.stdout.write(SEPARADOR)
+        regresiones = []
+        for clave, actual in resultados.items():
+            base = anterior.get(clave)
+            if base is None:
+                self.stdout.write(f'{clave:<38} (nuevo)')
+                continue
+            motivos = []
+            for metrica in ('p50_ms', 'p99_ms'):
+                if base[metrica] and actual[metrica] > base[metrica] * (1 + tolerancia):
+                    motivos.append(f'{metrica} {base[metrica]} -> {actual[metrica]}')
+            if actual['consultas'] > base['consultas']:
+                motivos.append(f"consultas {base['consultas']} -> {actual['consultas']}")
+            cambio = (actual['p50_ms'] - base['p50_ms']) / base['p50_ms'] * 100 if base['p50_ms'] else 0
+            linea = f'{clave:<38} p50 {cambio:+7.1f}%  consultas {base["consultas"]:>3} -> {actual["consultas"]:<3}'
+            if motivos:
+                regresiones.append(clave)
+                self.stdout.write(self.style.ERROR(f"{linea}  {'; '.join(motivos)}"))
+            else:
+                self.stdout.write(linea)
+
+        if regresiones:
+            mensaje = f'{len(regresiones)} operaciones empeoraron respecto de {ruta}'
+            if estricto:
+                raise CommandError(mensaje)
+            self.stdout.write(self.style.WARNING(mensaje))
+        else:
+            self.stdout.write(self.style.SUCCESS('Sin regresiones'))
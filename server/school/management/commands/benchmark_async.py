@@ -0,0 +1,210 @@
+"""
+Compara el rendimiento concurrente de las lecturas sync y async bajo ASGI.
+
+Cada ruta se mide dos veces contra la aplicación de core.asgi en el mismo
+proceso (sin red): la vista sync (/api/<ruta>) y su variante async
+(/api/async/<ruta>, ver school/api/asincronas). N clientes concurrentes
+(tareas asyncio) envían peticiones hasta completar el total y se informa
+peticiones por segundo, p50/p99 y consultas por petición.
+
+La latencia de una base remota se simula sumando --latencia-ms a cada
+consulta con un execute_wrapper que duerme el hilo (como la espera de red
+del driver); sin ella una base local responde en microsegundos y la
+diferencia entre ambos modos no es visible.
+
+Uso:
+    python manage.py benchmark_async
+    python manage.py benchmark_async --latencia-ms 40 --concurrencia 64 --peticiones 800
+    python manage.py benchmark_async --rutas alumnos/ calificaciones/?page=2 --json async.json
+"""
+import asyncio
+import json
+import statistics
+import time
+from collections import Counter
+from datetime import datetime
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from school.models import Alumno
+
+
+# '{alumno}' se reemplaza por el ID del primer alumno
+RUTAS = [
+    'alumnos/',
+    'alumnos/?page=3',
+    'alumnos/{alumno}/',
+    'calificaciones/',
+    'calificaciones/?paginacion=cursor',
+    'dashboard/stats/?cache=false',
+]
+
+SEPARADOR = '─' * 110
+
+
+class LatenciaSimulada:
+    """execute_wrapper que retrasa cada consulta (espera bloqueante, como la red)"""
+
+    def __init__(self, segundos: float):
+        self.segundos = segundos
+
+    def __call__(self, execute, sql, params, many, context):
+        time.sleep(self.segundos)
+        return execute(sql, params, many, context)
+
+    def instalar(self, sender=None, connection=None, **kwargs):
+        """Receptor de connection_created: cada conexión nueva (de cualquier hilo) lo incluye"""
+        if connection is not None and self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+    def __enter__(self):
+        connection_created.connect(self.instalar)
+        for conexion in connections.all(initialized_only=True):
+            self.instalar(connection=conexion)
+        return self
+
+    def __exit__(self, *exc):
+        connection_created.disconnect(self.instalar)
+        for conexion in connections.all(initialized_only=True):
+            if self in conexion.execute_wrappers:
+                conexion.execute_wrappers.remove(self)
+
+
+def _percentil(valores, percentil):
+    if len(valores) == 1:
+        return valores[0]
+    return statistics.quantiles(valores, n=100, method='inclusive')[percentil - 1]
+
+
+async def _peticion(app, ruta: str, host: str):
+    """GET a la aplicación ASGI; devuelve (estado, cabeceras, cuerpo)"""
+    camino, _, query = ruta.partition('?')
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': camino, 'raw_path': camino.encode(),
+        'query_string': query.encode(), 'root_path': '',
+        'headers': [(b'host', host.encode()), (b'accept', b'application/json')],
+        'client': ('127.0.0.1', 0), 'server': (host, 80),
+    }
+    recibido = False
+    respuesta = {'estado': None, 'cabeceras': {}, 'cuerpo': []}
+
+    async def receive():
+        nonlocal recibido
+        if not recibido:
+            recibido = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # El cliente no se desconecta: Django cancela esta espera al terminar
+        await asyncio.Event().wait()
+
+    async def send(mensaje):
+        if mensaje['type'] == 'http.response.start':
+            respuesta['estado'] = mensaje['status']
+            respuesta['cabeceras'] = {k.decode().lower(): v.decode() for k, v in mensaje['headers']}
+        elif mensaje['type'] == 'http.response.body':
+            respuesta['cuerpo'].append(mensaje.get('body', b''))
+
+    await app(scope, receive, send)
+    return respuesta['estado'], respuesta['cabeceras'], b''.join(respuesta['cuerpo'])
+
+
+async def _correr(app, ruta, host, concurrencia, total):
+    """`total` peticiones repartidas entre `concurrencia` clientes"""
+    pendientes = iter(range(total))
+    latencias, consultas, estados = [], [], Counter()
+
+    async def cliente():
+        for _ in pendientes:
+            inicio = time.perf_counter()
+            estado, cabeceras, _ = await _peticion(app, ruta, host)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            estados[estado] += 1
+            if 'x-consultas-sql' in cabeceras:
+                consultas.append(int(cabeceras['x-consultas-sql']))
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(concurrencia)))
+    transcurrido = time.perf_counter() - inicio
+    return {
+        'por_segundo': round(total / transcurrido, 1),
+        'p50_ms': round(_percentil(latencias, 50), 2),
+        'p99_ms': round(_percentil(latencias, 99), 2),
+        'consultas': int(statistics.median(consultas)) if consultas else None,
+        'estados': {str(estado): cantidad for estado, cantidad in sorted(estados.items(), key=str)},
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compara peticiones/s de las lecturas sync y async bajo ASGI con latencia de base simulada'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rutas', nargs='+', default=RUTAS,
+                            help="Rutas relativas a /api/ con variante async ('{alumno}' = primer alumno)")
+        parser.add_argument('--latencia-ms', type=float, default=20, help='Retraso añadido a cada consulta')
+        parser.add_argument('--concurrencia', type=int, default=32, help='Clientes simultáneos')
+        parser.add_argument('--peticiones', type=int, default=400, help='Peticiones medidas por ruta y modo')
+        parser.add_argument('--calentamiento', type=int, default=20, help='Peticiones previas no medidas')
+        parser.add_argument('--json', dest='json_path', help='Guardar los resultados en un archivo JSON')
+
+    def handle(self, *args, **options):
+        from core.asgi import application
+
+        if options['concurrencia'] < 1 or options['peticiones'] < 2:
+            raise CommandError('--concurrencia debe ser >= 1 y --peticiones >= 2')
+        alumno = Alumno.objects.order_by('pk').values_list('pk', flat=True).first()
+        if alumno is None and any('{alumno}' in ruta for ruta in options['rutas']):
+            raise CommandError('No hay alumnos: generar datos con `python manage.py seed_bench_data`')
+        host = next((h for h in settings.ALLOWED_HOSTS if h != '*' and not h.startswith('.')), 'localhost')
+
+        self.stdout.write(
+            f"Latencia simulada {options['latencia_ms']:g} ms por consulta, concurrencia "
+            f"{options['concurrencia']}, {options['peticiones']} peticiones por ruta y modo "
+            f"({connection.vendor})"
+        )
+        self.stdout.write(SEPARADOR)
+        self.stdout.write(f"{'ruta':<36} {'modo':<6} {'req/s':>9} {'p50 ms':>10} {'p99 ms':>10} "
+                          f"{'consultas':>10}  estados")
+
+        resultados = {}
+        with LatenciaSimulada(options['latencia_ms'] / 1000):
+            for ruta in options['rutas']:
+                ruta = ruta.lstrip('/').format(alumno=alumno)
+                par = {}
+                for modo, prefijo in (('sync', '/api/'), ('async', '/api/async/')):
+                    url = prefijo + ruta
+                    if options['calentamiento']:
+                        asyncio.run(_correr(application, url, host, options['concurrencia'],
+                                            options['calentamiento']))
+                    par[modo] = dict(
+                        asyncio.run(_correr(application, url, host, options['concurrencia'],
+                                            options['peticiones'])),
+                        url=url,
+                    )
+                    self._fila(ruta, modo, par[modo])
+                par['aceleracion'] = round(par['async']['por_segundo'] / par['sync']['por_segundo'], 2)
+                self.stdout.write(f"{'':<36} {'':<6} x{par['aceleracion']}")
+                resultados[ruta] = par
+
+        self.stdout.write(SEPARADOR)
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as archivo:
+                json.dump({
+                    'meta': {
+                        'fecha': datetime.now().isoformat(timespec='seconds'),
+                        'base_de_datos': connection.vendor,
+                        'latencia_ms': options['latencia_ms'],
+                        'concurrencia': options['concurrencia'],
+                        'peticiones': options['peticiones'],
+                    },
+                    'resultados': resultados,
+                }, archivo, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {options['json_path']}"))
+
+    def _fila(self, ruta, modo, resultado):
+        consultas = resultado['consultas'] if resultado['consultas'] is not None else '-'
+        estados = ' '.join(f'{estado}:{cantidad}' for estado, cantidad in resultado['estados'].items())
+        self.stdout.write(
+            f"{ruta:<36} {modo:<6} {resultado['por_segundo']:>9} {resultado['p50_ms']:>10} "
+            f"{resultado['p99_ms']:>10} {consultas:>10}  {estados}"
+        )
@@ -0,0 +1,114 @@
+"""
+Compara la búsqueda anterior (icontains con OR) con el motor de búsqueda.
+
+Crea alumnos sintéticos dentro de una transacción que se revierte al final,
+de modo que la base queda intacta.
+
+Uso:
+    python manage.py benchmark_busqueda
+    python manage.py benchmark_busqueda --filas 100000 --repeticiones 5
+    python manage.py benchmark_busqueda --consultas "jose" "perez gar" --json resultados.json
+"""
+import json
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from school.busqueda import buscador
+from school.models import Alumno
+
+
+NOMBRES = ['José', 'María', 'Ángel', 'Sofía', 'Martín', 'Lucía', 'Andrés', 'Valentina',
+           'Iván', 'Camila', 'Julián', 'Inés', 'Raúl', 'Mónica', 'Óscar', 'Verónica']
+APELLIDOS = ['Pérez', 'González', 'Rodríguez', 'Fernández', 'López', 'Martínez', 'Sánchez',
+             'Gómez', 'Díaz', 'Hernández', 'Muñoz', 'Álvarez', 'Jiménez', 'Núñez', 'Ibáñez']
+
+CONSULTAS = ['perez', 'gonzalez maria', 'NUÑEZ', 'jos', 'zzz', 'BEN-00421']
+
+
+class Command(BaseCommand):
+    help = 'Mide la búsqueda de alumnos (icontains vs índice) con datos sintéticos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=100_000)
+        parser.add_argument('--repeticiones', type=int, default=5)
+        parser.add_argument('--consultas', nargs='+', default=CONSULTAS)
+        parser.add_argument('--json', dest='json_path', help='Guardar resultados en un archivo JSON')
+
+    @staticmethod
+    def _medir(funcion, repeticiones):
+        tiempos = []
+        resultado = None
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            resultado = funcion()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        return round(statistics.median(tiempos), 2), resultado
+
+    def _crear_datos(self, filas):
+        aleatorio = random.Random(42)
+        lote = []
+        for indice in range(filas):
+            lote.append(Alumno(
+                nombre=aleatorio.choice(NOMBRES),
+                apellido=f'{aleatorio.choice(APELLIDOS)} {aleatorio.choice(APELLIDOS)}',
+                matricula=f'BEN-{indice:07d}',
+            ))
+            if len(lote) == 5000:
+                Alumno.objects.bulk_create(lote)
+                lote = []
+        Alumno.objects.bulk_create(lote)
+
+    def handle(self, *args, **options):
+        motor = buscador('alumnos')
+        repeticiones = options['repeticiones']
+        resultados = []
+
+        with transaction.atomic():
+            inicio = time.perf_counter()
+            self._crear_datos(options['filas'])
+            motor.invalidar()
+            self.stdout.write(
+                f"{options['filas']} alumnos sintéticos creados en {time.perf_counter() - inicio:.1f} s "
+                f"({connection.vendor})"
+            )
+            if connection.vendor != 'postgresql':
+                ms, indice = self._medir(motor.indice, 1)
+                self.stdout.write(f'Índice en memoria construido en {ms} ms ({len(indice)} filas)')
+
+            queryset = Alumno.objects.all()
+            for consulta in options['consultas']:
+                anterior_ms, anterior = self._medir(lambda: queryset.filter(
+                    Q(nombre__icontains=consulta) |
+                    Q(apellido__icontains=consulta) |
+                    Q(matricula__icontains=consulta)
+                ).count(), repeticiones)
+                filtrar_ms, filtrados = self._medir(
+                    lambda: motor.filtrar(queryset, consulta).count(), repeticiones)
+                buscar_ms, _ = self._medir(lambda: motor.buscar(queryset, consulta, 20), repeticiones)
+                autocompletar_ms, _ = self._medir(
+                    lambda: motor.autocompletar(queryset, consulta, 10), repeticiones)
+
+                fila = {
+                    'consulta': consulta,
+                    'icontains': {'ms': anterior_ms, 'filas': anterior},
+                    'filtrar': {'ms': filtrar_ms, 'filas': filtrados},
+                    'buscar_top20_ms': buscar_ms,
+                    'autocompletar_top10_ms': autocompletar_ms,
+                }
+                resultados.append(fila)
+                self.stdout.write(
+                    f"{consulta!r:<18} icontains {anterior_ms:>9} ms ({anterior:>6})  "
+                    f"filtrar {filtrar_ms:>9} ms ({filtrados:>6})  "
+                    f"buscar {buscar_ms:>9} ms  autocompletar {autocompletar_ms:>9} ms"
+                )
+
+            transaction.set_rollback(True)
+        motor.invalidar()
+
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as archivo:
+                json.dump(resultados, archivo, indent=2, default=str)
+            self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {options['json_path']}"))
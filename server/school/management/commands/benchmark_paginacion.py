@@ -0,0 +1,98 @@
+"""
+Compara la latencia de páginas profundas entre los modos de paginación.
+
+Uso:
+    python manage.py benchmark_paginacion
+    python manage.py benchmark_paginacion --endpoints calificaciones personal --repeticiones 10
+    python manage.py benchmark_paginacion --json resultados.json
+"""
+import json
+import statistics
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import resolve
+from school.api.pagination import KeysetPagination, encode_cursor
+from school.models import Alumno, Calificacion, Personal
+
+
+ENDPOINTS = {
+    'calificaciones': Calificacion,
+    'personal': Personal,
+    'estudiantes': Alumno,
+}
+
+
+class Command(BaseCommand):
+    help = 'Mide la latencia de páginas profundas: página vs página sin conteo vs cursor'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoints', nargs='+', default=list(ENDPOINTS), choices=list(ENDPOINTS))
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--profundidades', nargs='+', type=float, default=[0.0, 0.5, 0.9],
+                            help='Fracciones del total de filas donde empieza la página')
+        parser.add_argument('--repeticiones', type=int, default=5)
+        parser.add_argument('--json', dest='json_path', help='Guardar resultados en un archivo JSON')
+
+    def _medir(self, client, url, repeticiones):
+        tiempos = []
+        consultas = 0
+        for _ in range(repeticiones):
+            with CaptureQueriesContext(connection) as ctx:
+                inicio = time.perf_counter()
+                respuesta = client.get(url)
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+            consultas = len(ctx)
+            if respuesta.status_code != 200:
+                raise CommandError(f'{url} devolvió {respuesta.status_code}')
+        return {'mediana_ms': round(statistics.median(tiempos), 2), 'consultas': consultas}
+
+    def handle(self, *args, **options):
+        # Client() envía 'Host: testserver', que ALLOWED_HOSTS rechaza (400 DisallowedHost)
+        host = next((h for h in settings.ALLOWED_HOSTS if h != '*' and not h.startswith('.')), 'testserver')
+        client = Client(HTTP_HOST=host)
+        page_size = options['page_size']
+        resultados = []
+
+        for nombre in options['endpoints']:
+            modelo = ENDPOINTS[nombre]
+            base = f'/api/{nombre}/'
+            vista = resolve(base).func.cls
+            ordering = KeysetPagination().get_ordering(vista)
+            total = modelo.objects.count()
+            if total == 0:
+                self.stdout.write(self.style.WARNING(f'{nombre}: sin datos, se omite'))
+                continue
+
+            for fraccion in options['profundidades']:
+                offset = min(int(total * fraccion) // page_size * page_size, max(total - page_size, 0))
+                pagina = offset // page_size + 1
+                # Cursor equivalente: la fila anterior al inicio de la página
+                cursor = ''
+                if offset > 0:
+                    valores = modelo.objects.order_by(*ordering).values_list(*ordering)[offset - 1]
+                    cursor = f'&cursor={encode_cursor(valores)}'
+
+                fila = {'endpoint': nombre, 'total': total, 'pagina': pagina}
+                fila['pagina_ms'] = self._medir(
+                    client, f'{base}?page={pagina}&page_size={page_size}', options['repeticiones'])
+                fila['sin_conteo_ms'] = self._medir(
+                    client, f'{base}?page={pagina}&page_size={page_size}&sin_conteo=true', options['repeticiones'])
+                fila['cursor_ms'] = self._medir(
+                    client, f'{base}?paginacion=cursor&page_size={page_size}{cursor}', options['repeticiones'])
+                resultados.append(fila)
+
+                self.stdout.write(
+                    f"{nombre:<15} pág {pagina:>6}  "
+                    f"página {fila['pagina_ms']['mediana_ms']:>8} ms ({fila['pagina_ms']['consultas']}q)  "
+                    f"sin conteo {fila['sin_conteo_ms']['mediana_ms']:>8} ms ({fila['sin_conteo_ms']['consultas']}q)  "
+                    f"cursor {fila['cursor_ms']['mediana_ms']:>8} ms ({fila['cursor_ms']['consultas']}q)"
+                )
+
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as archivo:
+                json.dump(resultados, archivo, indent=2, default=str)
+            self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {options['json_path']}"))
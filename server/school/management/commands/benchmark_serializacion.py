@@ -0,0 +1,164 @@
+"""
+Compara la serialización de listados: serializer de DRF vs lectura por
+valores (school.api.lectura_valores), y JSONRenderer de DRF vs
+JSONRapidoRenderer (school.api.renderers).
+
+Por cada endpoint se leen las mismas N filas (con el plan de consulta del
+ViewSet) y se mide, en mediana de varias repeticiones:
+
+    serializer+json    list(queryset) -> Serializer(many=True).data -> JSONRenderer
+    valores+json       values_list    -> PlanValores.representar    -> JSONRenderer
+    valores+orjson     values_list    -> PlanValores.representar    -> JSONRapidoRenderer
+
+Los tres deben producir exactamente los mismos bytes; si no, el comando
+termina con error indicando la primera diferencia. Además se piden las
+páginas de cada endpoint por HTTP (modo página y cursor) con
+API_LECTURA_VALORES activado y desactivado y se comparan los cuerpos.
+
+Uso:
+    python manage.py benchmark_serializacion
+    python manage.py benchmark_serializacion --endpoints calificaciones --filas 1000 --repeticiones 20
+    python manage.py benchmark_serializacion --json serializacion.json
+"""
+import json
+import statistics
+import time
+from datetime import datetime
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import resolve
+from rest_framework.renderers import JSONRenderer
+from school.api.lectura_valores import build_values_plan
+from school.api.query_plans import QueryPlanMixin, build_query_plan
+from school.api.renderers import JSONRapidoRenderer, orjson
+
+
+ENDPOINTS = ['calificaciones', 'personal', 'materias', 'grados', 'periodos', 'profesores', 'instituciones']
+
+SEPARADOR = '─' * 96
+
+
+def _mediana_ms(tiempos):
+    return round(statistics.median(tiempos) * 1000, 3)
+
+
+def _primera_diferencia(a: bytes, b: bytes) -> str:
+    indice = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+    return f'byte {indice}: {a[indice - 40:indice + 40]!r} != {b[indice - 40:indice + 40]!r}'
+
+
+class Command(BaseCommand):
+    help = 'Mide serializer vs lectura por valores y JSONRenderer vs orjson, verificando bytes idénticos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoints', nargs='+', default=ENDPOINTS, choices=ENDPOINTS)
+        parser.add_argument('--filas', type=int, default=1000, help='Filas serializadas por endpoint')
+        parser.add_argument('--repeticiones', type=int, default=10)
+        parser.add_argument('--sin-http', action='store_true', help='No comparar las respuestas HTTP')
+        parser.add_argument('--json', dest='json_path', help='Guardar los resultados en un archivo JSON')
+
+    def handle(self, *args, **options):
+        if options['filas'] < 1 or options['repeticiones'] < 1:
+            raise CommandError('--filas y --repeticiones deben ser >= 1')
+        self.stdout.write(
+            f"{options['filas']} filas por endpoint, {options['repeticiones']} repeticiones "
+            f"({connection.vendor}; orjson {'sí' if orjson else 'no instalado: se usa json'})"
+        )
+        self.stdout.write(SEPARADOR)
+        self.stdout.write(f"{'endpoint':<16} {'modo':<17} {'filas':>6} {'consulta ms':>12} {'armado ms':>10} "
+                          f"{'render ms':>10} {'total ms':>10} {'x':>6}")
+
+        resultados = {}
+        for nombre in options['endpoints']:
+            resultados[nombre] = self._medir(nombre, options['filas'], options['repeticiones'])
+        self.stdout.write(SEPARADOR)
+
+        if not options['sin_http']:
+            for nombre in options['endpoints']:
+                self._comparar_http(nombre)
+            self.stdout.write(self.style.SUCCESS('Respuestas HTTP idénticas con y sin lectura por valores'))
+
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as archivo:
+                json.dump({
+                    'meta': {
+                        'fecha': datetime.now().isoformat(timespec='seconds'),
+                        'base_de_datos': connection.vendor,
+                        'filas': options['filas'],
+                        'repeticiones': options['repeticiones'],
+                        'orjson': orjson.__version__ if orjson else None,
+                    },
+                    'resultados': resultados,
+                }, archivo, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {options['json_path']}"))
+
+    def _medir(self, nombre, filas, repeticiones):
+        vista = resolve(f'/api/{nombre}/').func.cls
+        serializer_class = vista.serializer_class
+        queryset = vista.queryset.model.objects.order_by('pk')
+        if issubclass(vista, QueryPlanMixin):
+            queryset = build_query_plan(serializer_class, model=vista.queryset.model).apply(queryset)
+        plan = build_values_plan(serializer_class, model=vista.queryset.model)
+        if plan is None:
+            raise CommandError(f'{serializer_class.__name__} no admite lectura por valores')
+
+        modos = {
+            'serializer+json': (
+                lambda: list(queryset[:filas]),
+                lambda objetos: serializer_class(objetos, many=True).data,
+                JSONRenderer(),
+            ),
+            'valores+json': (lambda: list(plan.consulta(queryset)[:filas]), plan.representar, JSONRenderer()),
+            'valores+orjson': (lambda: list(plan.consulta(queryset)[:filas]), plan.representar, JSONRapidoRenderer()),
+        }
+        medidas, cuerpos = {}, {}
+        for modo, (consultar, armar, renderer) in modos.items():
+            tiempos = {'consulta': [], 'armado': [], 'render': []}
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                leidas = consultar()
+                consultado = time.perf_counter()
+                datos = armar(leidas)
+                armado = time.perf_counter()
+                cuerpo = renderer.render(datos)
+                fin = time.perf_counter()
+                tiempos['consulta'].append(consultado - inicio)
+                tiempos['armado'].append(armado - consultado)
+                tiempos['render'].append(fin - armado)
+            cuerpos[modo] = cuerpo
+            medidas[modo] = {etapa: _mediana_ms(valores) for etapa, valores in tiempos.items()}
+            medidas[modo]['total'] = round(sum(medidas[modo].values()), 3)
+            medidas[modo]['filas'] = len(leidas)
+            medidas[modo]['bytes'] = len(cuerpo)
+
+        referencia = cuerpos['serializer+json']
+        for modo, cuerpo in cuerpos.items():
+            if cuerpo != referencia:
+                raise CommandError(f'{nombre}: {modo} difiere del serializer ({_primera_diferencia(referencia, cuerpo)})')
+
+        base = medidas['serializer+json']['total']
+        for modo, medida in medidas.items():
+            medida['aceleracion'] = round(base / medida['total'], 2) if medida['total'] else None
+            self.stdout.write(
+                f"{nombre:<16} {modo:<17} {medida['filas']:>6} {medida['consulta']:>12} {medida['armado']:>10} "
+                f"{medida['render']:>10} {medida['total']:>10} {medida['aceleracion']:>6}"
+            )
+        return medidas
+
+    def _comparar_http(self, nombre):
+        """Mismos bytes por HTTP en modo página, página sin conteo y cursor"""
+        host = next((h for h in settings.ALLOWED_HOSTS if h != '*' and not h.startswith('.')), 'testserver')
+        client = Client(HTTP_HOST=host)
+        for url in (f'/api/{nombre}/?page_size=100', f'/api/{nombre}/?page=2&page_size=5&sin_conteo=true',
+                    f'/api/{nombre}/?paginacion=cursor&page_size=100'):
+            # ?cache=false: las respuestas cacheadas de datos de referencia no reflejarían el cambio
+            url += '&cache=false'
+            with override_settings(API_LECTURA_VALORES=False):
+                esperada = client.get(url)
+            obtenida = client.get(url)
+            if esperada.status_code != 200 or obtenida.status_code != 200:
+                raise CommandError(f'{url} devolvió {esperada.status_code}/{obtenida.status_code}')
+            if esperada.content != obtenida.content:
+                raise CommandError(f'{url}: {_primera_diferencia(esperada.content, obtenida.content)}')
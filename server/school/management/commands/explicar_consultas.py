@@ -0,0 +1,148 @@
+"""
+Reproduce las combinaciones de filtros de los listados y muestra sus planes (EXPLAIN).
+
+Para cada endpoint arma el queryset exactamente como lo hace el viewset
+(get_queryset + filtros de la query string), aplica el orden y el tamaño de
+la primera página (modo página y modo cursor) y ejecuta EXPLAIN. Las
+consultas filtradas que recorren la tabla principal completa se marcan como
+problema (índice faltante o no usado); los ordenamientos en memoria se
+informan como aviso.
+
+Uso:
+    python manage.py explicar_consultas
+    python manage.py explicar_consultas --endpoints personal calificaciones --planes
+    python manage.py explicar_consultas --estricto     # sale con error si hay problemas
+    python manage.py explicar_consultas --json planes.json
+"""
+import itertools
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import resolve
+from rest_framework.test import APIRequestFactory
+from school.api.pagination import KeysetPagination
+from school.models import Alumno, Calificacion, Grado, Materia, Personal
+
+
+# Endpoint -> (modelo, {parámetro de la query string: lookup para obtener un valor de muestra})
+ENDPOINTS = {
+    'personal': (Personal, {'institucion': 'institucion_id', 'cargo': 'cargo', 'estado': 'estado'}),
+    'calificaciones': (Calificacion, {'alumno': 'alumno_id', 'materia': 'materia_id', 'periodo': 'periodo_id'}),
+    'materias': (Materia, {'grado': 'grado_id', 'profesor': 'profesor_id'}),
+    'estudiantes': (Alumno, {'grado': 'grado_id', 'institucion': 'grado__institucion_id'}),
+    'grados': (Grado, {'institucion': 'institucion_id'}),
+}
+
+# Filtros poco selectivos (booleanos): recorrer en orden de pk con LIMIT es el mejor plan
+POCO_SELECTIVOS = {
+    'personal': {'estado'},
+}
+
+MODOS = ('pagina', 'cursor')
+
+TAMANO_PAGINA = 20
+
+
+def _valor_muestra(modelo, lookup):
+    """Un valor existente (no nulo) del lookup, formateado para la query string"""
+    valor = (
+        modelo.objects.exclude(**{f'{lookup}__isnull': True})
+        .order_by('pk').values_list(lookup, flat=True).first()
+    )
+    if isinstance(valor, bool):
+        return 'true' if valor else 'false'
+    return valor
+
+
+def _analizar(plan: str, tabla: str, filtrada: bool, selectiva: bool):
+    """(problemas, avisos) del plan: recorridos completos y ordenamientos en memoria"""
+    problemas, avisos = set(), set()
+    for linea in plan.splitlines():
+        texto = linea.strip()
+        if connection.vendor == 'postgresql':
+            recorrido = f'Seq Scan on {tabla}' in texto
+            ordenamiento = texto.startswith('Sort') or '->  Sort' in texto
+        else:
+            recorrido = f'SCAN {tabla}' in texto and 'INDEX' not in texto
+            ordenamiento = 'USE TEMP B-TREE FOR ORDER BY' in texto
+        # Sin filtros, recorrer en orden de pk con LIMIT es lo esperado
+        if recorrido and filtrada:
+            (problemas if selectiva else avisos).add('recorrido completo')
+        if ordenamiento:
+            avisos.add('ordenamiento en memoria')
+    return sorted(problemas), sorted(avisos)
+
+
+class Command(BaseCommand):
+    help = 'Muestra el plan de ejecución de cada combinación de filtros de los listados'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoints', nargs='+', default=list(ENDPOINTS), choices=list(ENDPOINTS))
+        parser.add_argument('--planes', action='store_true', help='Imprimir el plan completo')
+        parser.add_argument('--estricto', action='store_true',
+                            help='Terminar con error si alguna consulta filtrada recorre la tabla completa')
+        parser.add_argument('--json', dest='json_path', help='Guardar resultados en un archivo JSON')
+
+    def _queryset(self, vista_cls, parametros, modo):
+        """Queryset de la primera página tal como lo construye el viewset"""
+        factory = APIRequestFactory()
+        consulta = dict(parametros, paginacion=modo) if modo == 'cursor' else parametros
+        vista = vista_cls(action_map={'get': 'list'}, kwargs={}, format_kwarg=None)
+        vista.request = vista.initialize_request(factory.get('/', consulta))
+        queryset = vista.get_queryset_condicional()
+        if modo == 'cursor':
+            queryset = queryset.order_by(*KeysetPagination().get_ordering(vista))
+        elif not queryset.ordered:
+            queryset = queryset.order_by('pk')
+        return queryset[:TAMANO_PAGINA]
+
+    def handle(self, *args, **options):
+        resultados = []
+        con_problemas = 0
+
+        for nombre in options['endpoints']:
+            modelo, parametros = ENDPOINTS[nombre]
+            vista_cls = resolve(f'/api/{nombre}/').func.cls
+            tabla = modelo._meta.db_table
+            muestras = {parametro: _valor_muestra(modelo, lookup) for parametro, lookup in parametros.items()}
+            disponibles = [parametro for parametro, valor in muestras.items() if valor is not None]
+            if not modelo.objects.exists():
+                self.stdout.write(self.style.WARNING(f'{nombre}: sin datos, se omite'))
+                continue
+
+            for cantidad in range(len(disponibles) + 1):
+                for combinacion in itertools.combinations(disponibles, cantidad):
+                    filtros = {parametro: muestras[parametro] for parametro in combinacion}
+                    for modo in MODOS:
+                        plan = self._queryset(vista_cls, filtros, modo).explain()
+                        problemas, avisos = _analizar(
+                            plan, tabla, filtrada=bool(filtros),
+                            selectiva=not set(filtros) <= POCO_SELECTIVOS.get(nombre, set()),
+                        )
+                        con_problemas += bool(problemas)
+                        resultados.append({
+                            'endpoint': nombre, 'filtros': filtros, 'modo': modo,
+                            'problemas': problemas, 'avisos': avisos, 'plan': plan,
+                        })
+                        etiqueta = ','.join(combinacion) or '(sin filtros)'
+                        if problemas:
+                            estado = self.style.ERROR(', '.join(problemas + avisos))
+                        elif avisos:
+                            estado = self.style.WARNING(', '.join(avisos))
+                        else:
+                            estado = self.style.SUCCESS('ok')
+                        self.stdout.write(f'{nombre:<15} {modo:<7} {etiqueta:<30} {estado}')
+                        if options['planes']:
+                            for linea in plan.splitlines():
+                                self.stdout.write(f'    {linea}')
+
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as archivo:
+                json.dump(resultados, archivo, indent=2, default=str)
+            self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {options['json_path']}"))
+
+        if con_problemas:
+            mensaje = f'{con_problemas} consultas filtradas recorren la tabla completa'
+            if options['estricto']:
+                raise CommandError(mensaje)
+            self.stdout.write(self.style.WARNING(mensaje))
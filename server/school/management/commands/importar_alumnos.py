@@ -0,0 +1,46 @@
+"""
+Importa alumnos desde un archivo CSV.
+
+Uso:
+    python manage.py importar_alumnos alumnos.csv
+    python manage.py importar_alumnos alumnos.csv --lote 1000
+
+El CSV debe tener cabecera con las columnas
+nombre, apellido, matricula, fecha_nacimiento, correo, grado
+(las matrículas vacías se generan automáticamente).
+"""
+from django.core.management.base import BaseCommand, CommandError
+from school.api.importacion import leer_csv
+from school.exceptions.domain_exceptions import MatriculaDuplicadaError
+from school.services.alumno_service import AlumnoService
+
+
+class Command(BaseCommand):
+    help = 'Importa alumnos en bloque desde un archivo CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Ruta al archivo CSV')
+        parser.add_argument('--lote', type=int, default=AlumnoService.TAMANO_LOTE,
+                            help='Tamaño de lote para bulk_create')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['archivo'], encoding='utf-8-sig') as archivo:
+                filas = leer_csv(archivo.read())
+        except OSError as e:
+            raise CommandError(f'No se pudo leer el archivo: {e}')
+
+        servicio = AlumnoService()
+        servicio.TAMANO_LOTE = options['lote']
+        try:
+            resultado = servicio.importar_alumnos(filas)
+        except MatriculaDuplicadaError as e:
+            raise CommandError(str(e))
+
+        for error in resultado['errores']:
+            # +2: la fila 0 del CSV es la línea 2 (después de la cabecera)
+            self.stderr.write(f"Línea {error['fila'] + 2}: {error['errores']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Importados {resultado['creadas']} de {resultado['recibidas']} alumnos "
+            f"({len(resultado['errores'])} con errores)"
+        ))
@@ -0,0 +1,60 @@
+"""
+Reconstruye o verifica el resumen materializado de calificaciones (alumno x periodo).
+
+Uso:
+    python manage.py rebuild_grade_summaries              # backfill completo
+    python manage.py rebuild_grade_summaries --verificar  # solo comprobar consistencia
+    python manage.py rebuild_grade_summaries --lote 500
+"""
+from django.core.management.base import BaseCommand, CommandError
+from school.cache import invalidar
+from school.models import Alumno
+from school.services.resumen_materializado_service import ResumenMaterializadoService
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye (o verifica con --verificar) los resúmenes alumno x periodo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=1000, help='Alumnos por lote')
+        parser.add_argument('--verificar', action='store_true',
+                            help='No escribe; informa discrepancias y termina con error si las hay')
+        parser.add_argument('--mostrar', type=int, default=20,
+                            help='Cantidad máxima de discrepancias a listar')
+
+    def _lotes_de_alumnos(self, tamano):
+        """IDs de alumnos en lotes keyset (memoria acotada)"""
+        ultimo = 0
+        while True:
+            ids = list(
+                Alumno.objects.filter(pk__gt=ultimo).order_by('pk').values_list('pk', flat=True)[:tamano]
+            )
+            if not ids:
+                return
+            yield ids
+            ultimo = ids[-1]
+
+    def handle(self, *args, **options):
+        servicio = ResumenMaterializadoService()
+
+        if options['verificar']:
+            discrepancias = []
+            for ids in self._lotes_de_alumnos(options['lote']):
+                discrepancias.extend(servicio.verificar(alumno_ids=ids))
+            for discrepancia in discrepancias[:options['mostrar']]:
+                self.stdout.write(
+                    f"alumno={discrepancia['alumno']} periodo={discrepancia['periodo']} "
+                    f"{discrepancia['tipo']}: esperado={discrepancia['esperado']} "
+                    f"guardado={discrepancia['guardado']}"
+                )
+            if discrepancias:
+                raise CommandError(f'{len(discrepancias)} resúmenes inconsistentes')
+            self.stdout.write(self.style.SUCCESS('Resúmenes consistentes'))
+            return
+
+        escritos = 0
+        for ids in self._lotes_de_alumnos(options['lote']):
+            escritos += servicio.recalcular(alumno_ids=ids)
+            self.stdout.write(f'  ... {escritos} resúmenes (hasta alumno {ids[-1]})')
+        invalidar('calificaciones')
+        self.stdout.write(self.style.SUCCESS(f'{escritos} resúmenes reconstruidos'))
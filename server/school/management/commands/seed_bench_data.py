@@ -0,0 +1,247 @@
+"""
+Genera un conjunto de datos grande y determinista para los benchmarks de la API.
+
+Con la misma semilla y escala produce siempre los mismos datos (los ids
+dependen de la base). Todas las filas llevan el prefijo BENCH para poder
+eliminarlas con --limpiar sin tocar los datos reales.
+
+Tamaños con --escala 1 (por defecto):
+    50 instituciones, 2.000 profesores, 3.000 personal, 2.000 grados,
+    12.000 materias, 5 periodos, 200.000 alumnos, 5.000.000 calificaciones
+
+Uso:
+    python manage.py seed_bench_data                  # escala completa
+    python manage.py seed_bench_data --escala 0.01    # 2.000 alumnos, 50.000 calificaciones
+    python manage.py seed_bench_data --limpiar        # elimina los datos BENCH y vuelve a generar
+    python manage.py seed_bench_data --limpiar --solo-limpiar
+"""
+import math
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from school.busqueda.motor import BUSCADORES
+from school.cache import invalidar
+from school.models import (
+    Alumno, Calificacion, Grado, Institucion, Materia, Periodo, Personal, Profesor, ResumenCalificacion,
+)
+
+
+PREFIJO = 'BENCH'
+
+TAMANOS = {
+    'instituciones': 50,
+    'grados': 2_000,
+    'alumnos': 200_000,
+    'calificaciones': 5_000_000,
+}
+PROFESORES_POR_INSTITUCION = 40
+PERSONAL_POR_INSTITUCION = 60
+MATERIAS_POR_GRADO = 6
+
+NOMBRES = ['José', 'María', 'Ángel', 'Sofía', 'Martín', 'Lucía', 'Andrés', 'Valentina',
+           'Iván', 'Camila', 'Julián', 'Inés', 'Raúl', 'Mónica', 'Óscar', 'Verónica']
+APELLIDOS = ['Pérez', 'González', 'Rodríguez', 'Fernández', 'López', 'Martínez', 'Sánchez',
+             'Gómez', 'Díaz', 'Hernández', 'Muñoz', 'Álvarez', 'Jiménez', 'Núñez', 'Ibáñez']
+MATERIAS = ['Matemática', 'Lengua', 'Historia', 'Geografía', 'Biología', 'Física',
+            'Química', 'Inglés', 'Arte', 'Educación Física']
+CARGOS = [cargo for cargo, _ in Personal.CARGO_CHOICES]
+
+CACHES = ['instituciones', 'periodos', 'grados', 'calificaciones', 'estadisticas']
+
+
+class Command(BaseCommand):
+    help = 'Genera datos sintéticos deterministas (prefijo BENCH) para los benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--escala', type=float, default=1.0,
+                            help='Factor sobre los tamaños por defecto (200k alumnos, 5M calificaciones)')
+        for nombre, valor in TAMANOS.items():
+            parser.add_argument(f'--{nombre}', type=int, help=f'Cantidad de {nombre} (por defecto {valor} x escala)')
+        parser.add_argument('--semilla', type=int, default=42)
+        parser.add_argument('--lote', type=int, default=5000, help='Filas por bulk_create')
+        parser.add_argument('--limpiar', action='store_true', help='Eliminar los datos BENCH existentes antes')
+        parser.add_argument('--solo-limpiar', action='store_true', help='Con --limpiar, no generar datos nuevos')
+        parser.add_argument('--sin-resumenes', action='store_true',
+                            help='No reconstruir el resumen materializado de calificaciones')
+
+    # --- Utilidades ------------------------------------------------------
+
+    def _insertar(self, modelo, filas, lote):
+        """bulk_create por lotes de un iterable (memoria acotada)"""
+        total = 0
+        pendientes = []
+        for fila in filas:
+            pendientes.append(fila)
+            if len(pendientes) >= lote:
+                modelo.objects.bulk_create(pendientes, batch_size=lote)
+                total += len(pendientes)
+                pendientes = []
+                if total % (lote * 100) == 0:
+                    self.stdout.write(f'  ... {total} {modelo.__name__}')
+        modelo.objects.bulk_create(pendientes, batch_size=lote)
+        return total + len(pendientes)
+
+    @staticmethod
+    def _pks(modelo, **filtros):
+        return list(modelo.objects.filter(**filtros).order_by('pk').values_list('pk', flat=True))
+
+    def _limpiar(self):
+        """Borra las filas BENCH sin cargar objetos ni emitir señales (millones de filas)"""
+        alumnos = Alumno.objects.filter(matricula__startswith=f'{PREFIJO}-')
+        instituciones = Institucion.objects.filter(nombre__startswith=PREFIJO)
+        consultas = [
+            Calificacion.objects.filter(alumno__in=alumnos),
+            ResumenCalificacion.objects.filter(alumno__in=alumnos),
+            Calificacion.objects.filter(materia__grado__institucion__in=instituciones),
+            alumnos,
+            Materia.objects.filter(grado__institucion__in=instituciones),
+            Grado.objects.filter(institucion__in=instituciones),
+            Personal.objects.filter(institucion__in=instituciones),
+            Profesor.objects.filter(institucion__in=instituciones),
+            instituciones,
+            Calificacion.objects.filter(periodo__nombre__startswith=PREFIJO),
+            ResumenCalificacion.objects.filter(periodo__nombre__startswith=PREFIJO),
+            Periodo.objects.filter(nombre__startswith=PREFIJO),
+        ]
+        with transaction.atomic():
+            for queryset in consultas:
+                borradas = queryset._raw_delete(queryset.db)
+                if borradas:
+                    self.stdout.write(f'  {queryset.model.__name__}: {borradas} filas eliminadas')
+
+    # --- Generación ------------------------------------------------------
+
+    def handle(self, *args, **options):
+        if options['limpiar']:
+            self._limpiar()
+            if options['solo_limpiar']:
+                self._invalidar()
+                return
+        if Alumno.objects.filter(matricula__startswith=f'{PREFIJO}-').exists():
+            raise CommandError('Ya existen datos BENCH; use --limpiar para regenerarlos')
+
+        tamanos = {
+            nombre: options[nombre] if options[nombre] is not None else max(1, round(valor * options['escala']))
+            for nombre, valor in TAMANOS.items()
+        }
+        aleatorio = random.Random(options['semilla'])
+        lote = options['lote']
+        inicio = time.perf_counter()
+
+        # Cada alumno recibe calificaciones en pares (materia, periodo) distintos de su grado
+        por_alumno = math.ceil(tamanos['calificaciones'] / tamanos['alumnos'])
+        cantidad_periodos = max(4, math.ceil(por_alumno / MATERIAS_POR_GRADO))
+
+        with transaction.atomic():
+            instituciones = self._insertar(Institucion, (
+                Institucion(
+                    nombre=f'{PREFIJO} Institución {indice:03d}',
+                    direccion=f'Calle {aleatorio.randint(1, 200)} #{aleatorio.randint(1, 999)}',
+                    telefono=f'0212-{aleatorio.randint(1_000_000, 9_999_999)}',
+                    correo=f'institucion{indice}@bench.test',
+                ) for indice in range(tamanos['instituciones'])
+            ), lote)
+            institucion_pks = self._pks(Institucion, nombre__startswith=PREFIJO)
+
+            periodos = self._insertar(Periodo, (
+                Periodo(
+                    nombre=f'{PREFIJO} Periodo {indice + 1}',
+                    fecha_inicio=date(2020, 1, 1) + timedelta(days=120 * indice),
+                    fecha_fin=date(2020, 1, 1) + timedelta(days=120 * indice + 110),
+                ) for indice in range(cantidad_periodos)
+            ), lote)
+            periodo_pks = self._pks(Periodo, nombre__startswith=PREFIJO)
+
+            profesores = self._insertar(Profesor, (
+                Profesor(
+                    nombre=aleatorio.choice(NOMBRES), apellido=aleatorio.choice(APELLIDOS),
+                    correo=f'profesor{indice}@bench.test', institucion_id=institucion_pk,
+                )
+                for institucion_pk in institucion_pks
+                for indice in range(PROFESORES_POR_INSTITUCION)
+            ), lote)
+            profesor_pks = self._pks(Profesor, institucion_id__in=institucion_pks)
+
+            personal = self._insertar(Personal, (
+                Personal(
+                    nombre=aleatorio.choice(NOMBRES), apellido=aleatorio.choice(APELLIDOS),
+                    cedula=f'{PREFIJO}-P-{numero:07d}', cargo=aleatorio.choice(CARGOS),
+                    fecha_ingreso=date(2000, 1, 1) + timedelta(days=aleatorio.randint(0, 9000)),
+                    estado=aleatorio.random() < 0.9, institucion_id=institucion_pk,
+                )
+                for numero, institucion_pk in enumerate(
+                    pk for pk in institucion_pks for _ in range(PERSONAL_POR_INSTITUCION)
+                )
+            ), lote)
+
+            grados = self._insertar(Grado, (
+                Grado(
+                    nombre=f'{indice % 12 + 1}° {chr(65 + indice // 12 % 26)}',
+                    institucion_id=institucion_pks[indice % len(institucion_pks)],
+                ) for indice in range(tamanos['grados'])
+            ), lote)
+            grado_pks = self._pks(Grado, institucion_id__in=institucion_pks)
+
+            materias = self._insertar(Materia, (
+                Materia(
+                    nombre=MATERIAS[(indice + desfase) % len(MATERIAS)], grado_id=grado_pk,
+                    profesor_id=profesor_pks[aleatorio.randrange(len(profesor_pks))],
+                )
+                for desfase, grado_pk in enumerate(grado_pks)
+                for indice in range(MATERIAS_POR_GRADO)
+            ), lote)
+            materias_por_grado = {}
+            for materia_pk, grado_pk in (
+                Materia.objects.filter(grado_id__in=grado_pks).order_by('pk').values_list('pk', 'grado_id')
+            ):
+                materias_por_grado.setdefault(grado_pk, []).append(materia_pk)
+
+            alumnos = self._insertar(Alumno, (
+                Alumno(
+                    nombre=aleatorio.choice(NOMBRES),
+                    apellido=f'{aleatorio.choice(APELLIDOS)} {aleatorio.choice(APELLIDOS)}',
+                    matricula=f'{PREFIJO}-{indice:07d}',
+                    fecha_nacimiento=date(2005, 1, 1) + timedelta(days=aleatorio.randint(0, 4000)),
+                    correo=f'alumno{indice}@bench.test',
+                    grado_id=grado_pks[indice % len(grado_pks)],
+                ) for indice in range(tamanos['alumnos'])
+            ), lote)
+            self.stdout.write(
+                f'{instituciones} instituciones, {periodos} periodos, {profesores} profesores, '
+                f'{personal} personal, {grados} grados, {materias} materias, {alumnos} alumnos'
+            )
+
+        with transaction.atomic():
+            calificaciones = self._insertar(
+                Calificacion, self._calificaciones(aleatorio, tamanos, materias_por_grado, periodo_pks), lote)
+        self.stdout.write(f'{calificaciones} calificaciones')
+
+        if not options['sin_resumenes']:
+            call_command('rebuild_grade_summaries', stdout=self.stdout)
+        self._invalidar()
+        self.stdout.write(self.style.SUCCESS(f'Datos generados en {time.perf_counter() - inicio:.1f} s'))
+
+    def _calificaciones(self, aleatorio, tamanos, materias_por_grado, periodo_pks):
+        """Reparte las calificaciones entre los alumnos en pares (materia, periodo) sin repetir"""
+        base, resto = divmod(tamanos['calificaciones'], tamanos['alumnos'])
+        alumnos = Alumno.objects.filter(matricula__startswith=f'{PREFIJO}-').order_by('pk')
+        for indice, (alumno_pk, grado_pk) in enumerate(alumnos.values_list('pk', 'grado_id').iterator(chunk_size=5000)):
+            pares = [(materia, periodo) for periodo in periodo_pks for materia in materias_por_grado.get(grado_pk, [])]
+            cantidad = min(base + (indice < resto), len(pares))
+            for materia_pk, periodo_pk in aleatorio.sample(pares, cantidad):
+                yield Calificacion(
+                    alumno_id=alumno_pk, materia_id=materia_pk, periodo_id=periodo_pk,
+                    calificacion=Decimal(aleatorio.randint(0, 2000)) / 100,
+                )
+
+    @staticmethod
+    def _invalidar():
+        """Las inserciones masivas no emiten señales: se invalidan cachés e índices"""
+        for namespace in CACHES:
+            invalidar(namespace)
+        for motor in BUSCADORES.values():
+            motor.invalidar()
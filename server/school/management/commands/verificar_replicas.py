@@ -0,0 +1,130 @@
+"""
+Verifica las réplicas de lectura y el enrutamiento de core.replicas.
+
+Por cada réplica mide la latencia (SELECT 1) y compara con la primaria el
+número de filas y la última modificación (`actualizado_en`) de cada modelo
+de school; la diferencia de fechas es una cota del retraso de replicación.
+Luego comprueba las decisiones del router: una lectura va a una réplica,
+una escritura y las lecturas posteriores van a 'default'.
+
+Prueba local con dos bases (copia estática, sin replicación real):
+    SQLite:    copiar db.sqlite3 a replica.sqlite3 y declarar el alias con
+               TEST={'MIRROR': 'default'} en un settings local
+    Postgres:  createdb -T bench bench_replica
+               DB_REPLICAS=localhost/bench_replica python manage.py verificar_replicas
+
+Uso:
+    python manage.py verificar_replicas
+    python manage.py verificar_replicas --estricto --max-retraso 30
+"""
+import contextvars
+import statistics
+import time
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, router
+from django.db.models import Count, Max
+from core.replicas import RouterReplicas, aliases_replica
+from school.models import Alumno
+
+
+MUESTRAS_LATENCIA = 5
+
+
+def _latencia_ms(alias) -> float:
+    with connections[alias].cursor() as cursor:
+        tiempos = []
+        for _ in range(MUESTRAS_LATENCIA):
+            inicio = time.perf_counter()
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def _resumen(alias, modelos):
+    """(filas, última modificación) por modelo en la base `alias`"""
+    resumen = {}
+    for modelo in modelos:
+        agregados = {'filas': Count('pk')}
+        if any(campo.name == 'actualizado_en' for campo in modelo._meta.fields):
+            agregados['ultima'] = Max('actualizado_en')
+        datos = modelo.objects.using(alias).aggregate(**agregados)
+        resumen[modelo._meta.label] = (datos['filas'], datos.get('ultima'))
+    return resumen
+
+
+class Command(BaseCommand):
+    help = 'Compara las réplicas con la primaria y comprueba el enrutamiento de lecturas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-retraso', type=float, default=60,
+                            help='Segundos de retraso aparente tolerados por réplica')
+        parser.add_argument('--estricto', action='store_true',
+                            help='Terminar con error si una réplica falla, está atrasada o el router no la usa')
+
+    def handle(self, *args, **options):
+        replicas = aliases_replica()
+        if not replicas:
+            raise CommandError("No hay réplicas configuradas (DB_REPLICAS o alias con TEST={'MIRROR': 'default'})")
+        enrutador = next((r for r in router.routers if isinstance(r, RouterReplicas)), None)
+        if enrutador is None:
+            raise CommandError("DATABASE_ROUTERS no incluye 'core.replicas.RouterReplicas'")
+
+        modelos = [modelo for modelo in apps.get_app_config('school').get_models() if not modelo._meta.proxy]
+        self.stdout.write(f'Estrategia: {enrutador.selector.estrategia}; réplicas: {", ".join(replicas)}')
+        primaria = _resumen(DEFAULT_DB_ALIAS, modelos)
+        self.stdout.write(f'{DEFAULT_DB_ALIAS:<12} {_latencia_ms(DEFAULT_DB_ALIAS):>8.2f} ms')
+
+        problemas = []
+        for alias in replicas:
+            try:
+                latencia = _latencia_ms(alias)
+                resumen = _resumen(alias, modelos)
+            except DatabaseError as e:
+                problemas.append(f'{alias}: {e}')
+                self.stdout.write(self.style.ERROR(f'{alias:<12} sin conexión: {e}'))
+                continue
+            diferencias, retraso = [], 0.0
+            for etiqueta, (filas, ultima) in primaria.items():
+                filas_replica, ultima_replica = resumen[etiqueta]
+                if filas != filas_replica:
+                    diferencias.append(f'{etiqueta} {filas_replica}/{filas}')
+                if ultima and (ultima_replica is None or ultima_replica < ultima):
+                    retraso = max(retraso, (ultima - ultima_replica).total_seconds() if ultima_replica else float('inf'))
+            estado = 'al día' if not diferencias and not retraso else (
+                f'retraso aparente {retraso:.0f} s; filas distintas: {", ".join(diferencias) or "-"}'
+            )
+            self.stdout.write(f'{alias:<12} {latencia:>8.2f} ms  {estado}')
+            if retraso > options['max_retraso']:
+                problemas.append(f'{alias}: retraso aparente de {retraso:.0f} s')
+
+        problemas.extend(self._comprobar_enrutamiento(replicas))
+        if problemas:
+            mensaje = 'Problemas: ' + '; '.join(problemas)
+            if options['estricto']:
+                raise CommandError(mensaje)
+            self.stdout.write(self.style.WARNING(mensaje))
+        else:
+            self.stdout.write(self.style.SUCCESS('Réplicas y enrutamiento correctos'))
+
+    def _comprobar_enrutamiento(self, replicas):
+        """Decisiones del router en un contexto aislado (como una petición nueva)"""
+        def decisiones():
+            lectura = router.db_for_read(Alumno)
+            repetida = router.db_for_read(Alumno)
+            escritura = router.db_for_write(Alumno)
+            posterior = router.db_for_read(Alumno)
+            return lectura, repetida, escritura, posterior
+
+        lectura, repetida, escritura, posterior = contextvars.Context().run(decisiones)
+        self.stdout.write(
+            f'Enrutamiento: lectura -> {lectura}, otra lectura -> {repetida}, '
+            f'escritura -> {escritura}, lectura posterior -> {posterior}'
+        )
+        problemas = []
+        if lectura not in replicas or repetida != lectura:
+            problemas.append('las lecturas no van a una misma réplica')
+        if escritura != DEFAULT_DB_ALIAS or posterior != DEFAULT_DB_ALIAS:
+            problemas.append('después de escribir las lecturas no van a la primaria')
+        return problemas
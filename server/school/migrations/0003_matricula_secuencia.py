@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school', '0002_personal'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatriculaSecuencia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefijo', models.CharField(max_length=20, unique=True)),
+                ('siguiente', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school', '0003_matricula_secuencia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenCalificacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('suma', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('promedio', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('minima', models.DecimalField(decimal_places=2, max_digits=5, null=True)),
+                ('maxima', models.DecimalField(decimal_places=2, max_digits=5, null=True)),
+                ('aprobadas', models.PositiveIntegerField(default=0)),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+                ('alumno', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumenes', to='school.alumno')),
+                ('periodo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumenes', to='school.periodo')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['periodo', '-promedio'], name='resumen_periodo_promedio_idx')],
+                'unique_together': {('alumno', 'periodo')},
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+"""
+Índices de búsqueda por trigramas (solo PostgreSQL)
+
+Crea pg_trgm y unaccent, un envoltorio IMMUTABLE de unaccent (requisito para
+usarlo en un índice) e índices GIN sobre el texto normalizado que consulta
+school.busqueda.motor.TextoBusqueda. En otras bases no hace nada: la
+búsqueda usa el índice en memoria.
+"""
+from django.db import migrations
+
+
+INDICES = {
+    'school_alumno_busqueda_trgm': ('school_alumno', ('nombre', 'apellido', 'matricula')),
+    'school_personal_busqueda_trgm': ('school_personal', ('nombre', 'apellido', 'cedula')),
+}
+
+
+def crear_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+    schema_editor.execute(
+        "CREATE OR REPLACE FUNCTION school_inmutable_unaccent(text) RETURNS text AS "
+        "$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$ "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT"
+    )
+    for nombre, (tabla, columnas) in INDICES.items():
+        expresion = " || ' ' || ".join(columnas)
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} '
+            f'USING gin (school_inmutable_unaccent(lower({expresion})) gin_trgm_ops)'
+        )
+
+
+def eliminar_indices(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for nombre in INDICES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {nombre}')
+    schema_editor.execute('DROP FUNCTION IF EXISTS school_inmutable_unaccent(text)')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school', '0005_actualizado_en'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
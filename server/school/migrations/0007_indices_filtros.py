@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school', '0006_busqueda_trigramas'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='alumno',
+            name='grado',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='alumnos', to='school.grado'),
+        ),
+        migrations.AlterField(
+            model_name='calificacion',
+            name='alumno',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='calificaciones', to='school.alumno'),
+        ),
+        migrations.AlterField(
+            model_name='calificacion',
+            name='materia',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='calificaciones', to='school.materia'),
+        ),
+        migrations.AlterField(
+            model_name='calificacion',
+            name='periodo',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='calificaciones', to='school.periodo'),
+        ),
+        migrations.AlterField(
+            model_name='materia',
+            name='grado',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='materias', to='school.grado'),
+        ),
+        migrations.AlterField(
+            model_name='personal',
+            name='institucion',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='personal', to='school.institucion'),
+        ),
+        migrations.AddIndex(
+            model_name='alumno',
+            index=models.Index(fields=['grado', 'id'], name='alumno_grado_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='calificacion',
+            index=models.Index(fields=['periodo', 'alumno', 'id'], name='calificacion_cursor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='calificacion',
+            index=models.Index(fields=['materia', 'periodo'], name='calif_materia_periodo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='materia',
+            index=models.Index(fields=['grado', 'profesor'], name='materia_grado_profesor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personal',
+            index=models.Index(fields=['institucion', 'cargo', 'estado'], name='personal_inst_cargo_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personal',
+            index=models.Index(fields=['cargo', 'estado'], name='personal_cargo_estado_idx'),
+        ),
+    ]
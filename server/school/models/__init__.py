@@ -9,6 +9,9 @@ from .materia import Materia
 from .alumno import Alumno
 from .calificacion import Calificacion
 from .personal import Personal
+from .matricula_secuencia import MatriculaSecuencia
+from .resumen_calificacion import ResumenCalificacion
+from .refresh_token import RefreshToken
 
 __all__ = [
     'Institucion',
@@ -19,5 +22,8 @@ __all__ = [
     'Alumno',
     'Calificacion',
     'Personal',
+    'MatriculaSecuencia',
+    'ResumenCalificacion',
+    'RefreshToken',
 ]
 
@@ -8,7 +8,14 @@ class Alumno(models.Model):
     matricula = models.CharField(max_length=20, unique=True)
     fecha_nacimiento = models.DateField(blank=True, null=True)
     correo = models.EmailField(blank=True, null=True)
-    grado = models.ForeignKey(Grado, on_delete=models.SET_NULL, null=True, related_name="alumnos")
+    grado = models.ForeignKey(Grado, on_delete=models.SET_NULL, null=True, related_name="alumnos", db_index=False)
+    actualizado_en = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Filtro por grado (y JOIN desde grado__institucion) con el orden por id del listado
+            models.Index(fields=['grado', 'id'], name='alumno_grado_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nombre} {self.apellido}"
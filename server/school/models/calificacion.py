@@ -5,13 +5,22 @@ from .periodo import Periodo
 
 
 class Calificacion(models.Model):
-    alumno = models.ForeignKey(Alumno, on_delete=models.CASCADE, related_name="calificaciones")
-    materia = models.ForeignKey(Materia, on_delete=models.CASCADE, related_name="calificaciones")
-    periodo = models.ForeignKey(Periodo, on_delete=models.CASCADE, related_name="calificaciones")
+    alumno = models.ForeignKey(Alumno, on_delete=models.CASCADE, related_name="calificaciones", db_index=False)
+    materia = models.ForeignKey(Materia, on_delete=models.CASCADE, related_name="calificaciones", db_index=False)
+    periodo = models.ForeignKey(Periodo, on_delete=models.CASCADE, related_name="calificaciones", db_index=False)
     calificacion = models.DecimalField(max_digits=5, decimal_places=2)
+    actualizado_en = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         unique_together = ('alumno', 'materia', 'periodo')
+        # Los índices de FK sueltos son redundantes: alumno lo cubre unique_together,
+        # periodo el índice del cursor y materia el de (materia, periodo)
+        indexes = [
+            # Orden del modo cursor (periodo, alumno, id) y filtro por periodo
+            models.Index(fields=['periodo', 'alumno', 'id'], name='calificacion_cursor_idx'),
+            # Filtro por materia o por materia y periodo
+            models.Index(fields=['materia', 'periodo'], name='calif_materia_periodo_idx'),
+        ]
 
     def __str__(self):
         return f"{self.alumno} - {self.materia}: {self.calificacion}"
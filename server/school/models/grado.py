@@ -6,6 +6,7 @@ class Grado(models.Model):
     nombre = models.CharField(max_length=50)
     descripcion = models.TextField(blank=True, null=True)
     institucion = models.ForeignKey(Institucion, on_delete=models.CASCADE, related_name="grados")
+    actualizado_en = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.nombre} - {self.institucion.nombre}"
@@ -6,6 +6,7 @@ class Institucion(models.Model):
     direccion = models.CharField(max_length=255)
     telefono = models.CharField(max_length=20, blank=True, null=True)
     correo = models.EmailField(blank=True, null=True)
+    actualizado_en = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return self.nombre
@@ -7,7 +7,13 @@ class Materia(models.Model):
     nombre = models.CharField(max_length=100)
     descripcion = models.TextField(blank=True, null=True)
     profesor = models.ForeignKey(Profesor, on_delete=models.SET_NULL, null=True, related_name="materias")
-    grado = models.ForeignKey(Grado, on_delete=models.CASCADE, related_name="materias")
+    grado = models.ForeignKey(Grado, on_delete=models.CASCADE, related_name="materias", db_index=False)
+    actualizado_en = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['grado', 'profesor'], name='materia_grado_profesor_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nombre} ({self.grado.nombre})"
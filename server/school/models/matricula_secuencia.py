@@ -0,0 +1,10 @@
+from django.db import models
+
+
+class MatriculaSecuencia(models.Model):
+    """Contador por prefijo de matrícula (ej. EST-MAR-GON) para generar sufijos en O(1)"""
+    prefijo = models.CharField(max_length=20, unique=True)
+    siguiente = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.prefijo} -> {self.siguiente}"
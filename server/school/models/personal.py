@@ -17,7 +17,15 @@ class Personal(models.Model):
     estado = models.BooleanField(default=True)
     email = models.EmailField(blank=True, null=True)
     telefono = models.CharField(max_length=20, blank=True, null=True)
-    institucion = models.ForeignKey(Institucion, on_delete=models.CASCADE, related_name="personal", null=True, blank=True)
+    institucion = models.ForeignKey(Institucion, on_delete=models.CASCADE, related_name="personal", null=True, blank=True, db_index=False)
+    actualizado_en = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Filtros del listado: institucion, cargo y estado (en ese orden de selectividad)
+            models.Index(fields=['institucion', 'cargo', 'estado'], name='personal_inst_cargo_estado_idx'),
+            models.Index(fields=['cargo', 'estado'], name='personal_cargo_estado_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nombre} {self.apellido} - {self.cargo}"
@@ -8,6 +8,7 @@ class Profesor(models.Model):
     correo = models.EmailField(blank=True, null=True)
     telefono = models.CharField(max_length=20, blank=True, null=True)
     institucion = models.ForeignKey(Institucion, on_delete=models.CASCADE, related_name="profesores")
+    actualizado_en = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.nombre} {self.apellido}"
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.db import models
+
+
+class RefreshToken(models.Model):
+    """
+    Token de refresco del modo de acceso firmado (AUTH_TOKEN_MODO=firmado).
+
+    Solo se guarda la huella SHA-256 del valor entregado al cliente; cada uso
+    lo revoca y emite uno nuevo (rotación). Ver school.api.autenticacion.
+    """
+    usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="refresh_tokens")
+    huella = models.CharField(max_length=64, unique=True)
+    creado_en = models.DateTimeField(auto_now_add=True)
+    expira_en = models.DateTimeField()
+    revocado_en = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['usuario', 'revocado_en'], name='refresh_usuario_revocado_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.usuario_id} hasta {self.expira_en:%Y-%m-%d %H:%M}"
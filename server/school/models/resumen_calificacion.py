@@ -0,0 +1,30 @@
+from django.db import models
+from .alumno import Alumno
+from .periodo import Periodo
+
+
+class ResumenCalificacion(models.Model):
+    """
+    Resumen desnormalizado de las calificaciones de un alumno en un periodo.
+
+    Se mantiene de forma incremental desde Calificacion (señales y carga
+    masiva); ver school.services.resumen_materializado_service.
+    """
+    alumno = models.ForeignKey(Alumno, on_delete=models.CASCADE, related_name="resumenes")
+    periodo = models.ForeignKey(Periodo, on_delete=models.CASCADE, related_name="resumenes")
+    total = models.PositiveIntegerField(default=0)
+    suma = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    promedio = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    minima = models.DecimalField(max_digits=5, decimal_places=2, null=True)
+    maxima = models.DecimalField(max_digits=5, decimal_places=2, null=True)
+    aprobadas = models.PositiveIntegerField(default=0)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('alumno', 'periodo')
+        indexes = [
+            models.Index(fields=['periodo', '-promedio'], name='resumen_periodo_promedio_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.alumno} - {self.periodo}: {self.promedio}"
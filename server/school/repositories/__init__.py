@@ -3,9 +3,11 @@ Repositories para acceso a datos
 """
 from .alumno_repository import AlumnoRepository
 from .grado_repository import GradoRepository
+from .matricula_secuencia_repository import MatriculaSecuenciaRepository
 
 __all__ = [
     'AlumnoRepository',
     'GradoRepository',
+    'MatriculaSecuenciaRepository',
 ]
 
@@ -1,19 +1,33 @@
 """
 Repository para operaciones de acceso a datos de Alumno
 """
-from typing import Optional, List
-from django.db.models import Q
+from typing import Optional, Iterable, List
+from django.db.models import Q, QuerySet
+from school.busqueda import buscador
 from school.models import Alumno
 
 
 class AlumnoRepository:
     """Repositorio para operaciones de acceso a datos de Alumno"""
     
+    @staticmethod
+    def base_queryset() -> QuerySet:
+        """Queryset base: carga el grado en el mismo JOIN y ordena por ID"""
+        return Alumno.objects.select_related('grado').order_by('id')
+    
     @staticmethod
     def get_by_id(alumno_id: int) -> Optional[Alumno]:
         """Obtiene un alumno por ID"""
         try:
-            return Alumno.objects.get(id=alumno_id)
+            return AlumnoRepository.base_queryset().get(id=alumno_id)
+        except Alumno.DoesNotExist:
+            return None
+    
+    @staticmethod
+    async def aget_by_id(alumno_id: int) -> Optional[Alumno]:
+        """Versión async de get_by_id (aget)"""
+        try:
+            return await AlumnoRepository.base_queryset().aget(id=alumno_id)
         except Alumno.DoesNotExist:
             return None
     
@@ -26,28 +40,59 @@ class AlumnoRepository:
             return None
     
     @staticmethod
-    def get_all() -> List[Alumno]:
-        """Obtiene todos los alumnos"""
-        return list(Alumno.objects.all())
+    def get_all() -> QuerySet:
+        """Obtiene todos los alumnos (queryset perezoso)"""
+        return AlumnoRepository.base_queryset()
     
     @staticmethod
-    def filter_by_grado(grado_id: int) -> List[Alumno]:
+    def filter_by_grado(grado_id: int, queryset: QuerySet = None) -> QuerySet:
         """Filtra alumnos por grado"""
-        return list(Alumno.objects.filter(grado_id=grado_id))
+        queryset = AlumnoRepository.base_queryset() if queryset is None else queryset
+        return queryset.filter(grado_id=grado_id)
     
     @staticmethod
-    def filter_by_institucion(institucion_id: int) -> List[Alumno]:
+    def filter_by_institucion(institucion_id: int, queryset: QuerySet = None) -> QuerySet:
         """Filtra alumnos por institución"""
-        return list(Alumno.objects.filter(grado__institucion_id=institucion_id))
+        queryset = AlumnoRepository.base_queryset() if queryset is None else queryset
+        return queryset.filter(grado__institucion_id=institucion_id)
+    
+    @staticmethod
+    def search(search_term: str, queryset: QuerySet = None) -> QuerySet:
+        """Busca alumnos por nombre, apellido o matrícula (sin distinguir acentos)"""
+        queryset = AlumnoRepository.base_queryset() if queryset is None else queryset
+        return buscador('alumnos').filtrar(queryset, search_term)
+    
+    @staticmethod
+    def only_columns(columnas: Iterable[str], queryset: QuerySet = None) -> QuerySet:
+        """Carga solo esas columnas (y el ID); sin JOIN con grado si no se pide ninguna suya"""
+        queryset = AlumnoRepository.base_queryset() if queryset is None else queryset
+        columnas = list(dict.fromkeys(['id', *columnas]))
+        if not any(columna.startswith('grado__') for columna in columnas):
+            queryset = queryset.select_related(None)
+        return queryset.only(*columnas)
+    
+    @staticmethod
+    def existing_matriculas(matriculas: Iterable[str]) -> List[str]:
+        """Devuelve cuáles de las matrículas dadas ya existen (una consulta)"""
+        matriculas = set(matriculas)
+        if not matriculas:
+            return []
+        return list(Alumno.objects.filter(matricula__in=matriculas).values_list('matricula', flat=True))
+    
+    @staticmethod
+    def matriculas_con_prefijos(bases: Iterable[str]) -> List[str]:
+        """Matrículas iguales a alguna base o de la forma 'base-N' (una consulta)"""
+        condicion = Q()
+        for base in set(bases):
+            condicion |= Q(matricula=base) | Q(matricula__startswith=f"{base}-")
+        if not condicion:
+            return []
+        return list(Alumno.objects.filter(condicion).values_list('matricula', flat=True))
     
     @staticmethod
-    def search(search_term: str) -> List[Alumno]:
-        """Busca alumnos por nombre, apellido o matrícula"""
-        return list(Alumno.objects.filter(
-            Q(nombre__icontains=search_term) |
-            Q(apellido__icontains=search_term) |
-            Q(matricula__icontains=search_term)
-        ))
+    def bulk_create(alumnos: List[Alumno], batch_size: int = 500) -> List[Alumno]:
+        """Inserta alumnos en lotes"""
+        return Alumno.objects.bulk_create(alumnos, batch_size=batch_size)
     
     @staticmethod
     def create(**kwargs) -> Alumno:
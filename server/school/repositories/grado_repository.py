@@ -1,7 +1,7 @@
 """
 Repository para operaciones de acceso a datos de Grado
 """
-from typing import Optional
+from typing import Optional, Iterable, List
 from school.models import Grado
 
 
@@ -20,4 +20,11 @@ class GradoRepository:
     def exists(grado_id: int) -> bool:
         """Verifica si un grado existe"""
         return Grado.objects.filter(id=grado_id).exists()
-
+    
+    @staticmethod
+    def existing_ids(grado_ids: Iterable[int]) -> List[int]:
+        """Devuelve cuáles de los IDs dados existen (una consulta)"""
+        grado_ids = set(grado_ids)
+        if not grado_ids:
+            return []
+        return list(Grado.objects.filter(id__in=grado_ids).values_list('id', flat=True))
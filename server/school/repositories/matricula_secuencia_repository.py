@@ -0,0 +1,60 @@
+"""
+Repository para los contadores de sufijos de matrícula
+"""
+from typing import Callable, Dict, Iterable, List
+from django.db import transaction
+from django.db.models import F
+from school.models import MatriculaSecuencia
+
+
+class MatriculaSecuenciaRepository:
+    """Repositorio para reservar sufijos de matrícula por prefijo"""
+    
+    @staticmethod
+    def _bloquear(prefijos: Iterable[str]) -> Dict[str, MatriculaSecuencia]:
+        """
+        Bloquea y lee los contadores de los prefijos dados.
+        
+        El UPDATE sin cambios toma el bloqueo de fila en PostgreSQL (como
+        select_for_update) y el bloqueo de escritura en SQLite, donde
+        select_for_update no tiene efecto; así la lectura posterior no puede
+        intercalarse con otra reserva concurrente.
+        """
+        prefijos = list(prefijos)
+        MatriculaSecuencia.objects.filter(prefijo__in=prefijos).update(siguiente=F('siguiente'))
+        return {s.prefijo: s for s in MatriculaSecuencia.objects.filter(prefijo__in=prefijos)}
+    
+    @staticmethod
+    def reservar(
+        conteos: Dict[str, int],
+        valores_iniciales: Callable[[List[str]], Dict[str, int]],
+    ) -> Dict[str, List[int]]:
+        """
+        Reserva `conteos[prefijo]` sufijos consecutivos por prefijo.
+        
+        Args:
+            conteos: cantidad de sufijos a reservar por prefijo
+            valores_iniciales: función que, para los prefijos sin contador,
+                devuelve el primer sufijo libre (se usa una sola vez por prefijo)
+        
+        Returns:
+            Sufijos reservados por prefijo (0 significa la matrícula base)
+        """
+        with transaction.atomic():
+            secuencias = MatriculaSecuenciaRepository._bloquear(conteos)
+            faltantes = [prefijo for prefijo in conteos if prefijo not in secuencias]
+            if faltantes:
+                iniciales = valores_iniciales(faltantes)
+                MatriculaSecuencia.objects.bulk_create(
+                    [MatriculaSecuencia(prefijo=p, siguiente=iniciales.get(p, 0)) for p in faltantes],
+                    ignore_conflicts=True,
+                )
+                secuencias.update(MatriculaSecuenciaRepository._bloquear(faltantes))
+            
+            reservados = {}
+            for prefijo, cantidad in conteos.items():
+                secuencia = secuencias[prefijo]
+                reservados[prefijo] = list(range(secuencia.siguiente, secuencia.siguiente + cantidad))
+                secuencia.siguiente += cantidad
+            MatriculaSecuencia.objects.bulk_update(list(secuencias.values()), ['siguiente'])
+        return reservados
@@ -2,8 +2,16 @@
 Services para lógica de negocio
 """
 from .alumno_service import AlumnoService
+from .calificacion_service import CalificacionService
+from .estadisticas_service import EstadisticasService
+from .resumen_calificaciones_service import ResumenCalificacionesService
+from .resumen_materializado_service import ResumenMaterializadoService
 
 __all__ = [
     'AlumnoService',
+    'CalificacionService',
+    'EstadisticasService',
+    'ResumenCalificacionesService',
+    'ResumenMaterializadoService',
 ]
 
@@ -1,9 +1,20 @@
 """
 Servicio con lógica de negocio para Alumnos
 """
-from typing import Optional, List, Dict
+import re
+from collections import Counter
+from operator import attrgetter
+from typing import Optional, List, Dict, Iterable, Set
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_date
+from school.busqueda import buscador
+from school.cache import invalidar
 from school.repositories.alumno_repository import AlumnoRepository
 from school.repositories.grado_repository import GradoRepository
+from school.repositories.matricula_secuencia_repository import MatriculaSecuenciaRepository
 from school.exceptions.domain_exceptions import (
     AlumnoNotFoundError,
     MatriculaDuplicadaError,
@@ -12,12 +23,64 @@ from school.exceptions.domain_exceptions import (
 from school.models import Alumno
 
 
+def _grado_id(alumno: Alumno) -> Optional[int]:
+    return alumno.grado_id if alumno.grado else None
+
+
+def _grado_nombre(alumno: Alumno) -> Optional[str]:
+    return alumno.grado.nombre if alumno.grado else None
+
+
 class AlumnoService:
     """Servicio con lógica de negocio para Alumnos"""
     
+    TAMANO_LOTE = 500
+    
+    # Clave del diccionario de _to_dict -> cómo se obtiene del modelo
+    REPRESENTACION = {
+        'id': attrgetter('id'),
+        'nombre': attrgetter('nombre'),
+        'apellido': attrgetter('apellido'),
+        'matricula': attrgetter('matricula'),
+        'fecha_nacimiento': attrgetter('fecha_nacimiento'),
+        'correo': attrgetter('correo'),
+        'grado_id': _grado_id,
+        'grado_nombre': _grado_nombre,
+        # Campos adicionales para compatibilidad con frontend
+        'cedula': attrgetter('matricula'),
+        'email': attrgetter('correo'),
+        'fechaNacimiento': attrgetter('fecha_nacimiento'),
+        'gradoEstudioId': _grado_id,
+        'direccion': lambda alumno: '',
+        'telefono': lambda alumno: '',
+        'nombreRepresentante': lambda alumno: '',
+        'telefonoRepresentante': lambda alumno: '',
+        'año': lambda alumno: None,
+        'periodo': lambda alumno: '',
+        'estado': lambda alumno: True,
+        'fechaIngreso': lambda alumno: None,
+    }
+    
+    # Columnas que lee cada clave (las de valor fijo no leen ninguna)
+    COLUMNAS_CAMPO = {
+        'id': ('id',),
+        'nombre': ('nombre',),
+        'apellido': ('apellido',),
+        'matricula': ('matricula',),
+        'fecha_nacimiento': ('fecha_nacimiento',),
+        'correo': ('correo',),
+        'grado_id': ('grado__nombre',),
+        'grado_nombre': ('grado__nombre',),
+        'cedula': ('matricula',),
+        'email': ('correo',),
+        'fechaNacimiento': ('fecha_nacimiento',),
+        'gradoEstudioId': ('grado__nombre',),
+    }
+    
     def __init__(self):
         self.alumno_repo = AlumnoRepository()
         self.grado_repo = GradoRepository()
+        self.secuencia_repo = MatriculaSecuenciaRepository()
     
     def crear_alumno(self, datos: Dict) -> Dict:
         """Crea un nuevo alumno con validaciones de negocio"""
@@ -61,22 +124,44 @@ class AlumnoService:
             raise AlumnoNotFoundError(f"Alumno con ID {alumno_id} no existe")
         return self._to_dict(alumno)
     
-    def listar_alumnos(self, filtros: Dict = None) -> List[Dict]:
-        """Lista alumnos con filtros opcionales"""
+    async def aobtener_alumno(self, alumno_id: int) -> Alumno:
+        """
+        Versión async de obtener_alumno: devuelve el modelo (con su grado)
+        para que la vista calcule los validadores sin otra consulta.
+        """
+        alumno = await self.alumno_repo.aget_by_id(alumno_id)
+        if not alumno:
+            raise AlumnoNotFoundError(f"Alumno con ID {alumno_id} no existe")
+        return alumno
+    
+    def listar_alumnos(self, filtros: Dict = None, campos: Optional[Iterable[str]] = None) -> QuerySet:
+        """
+        Lista alumnos con filtros opcionales.
+        
+        Devuelve un queryset perezoso (con el grado cargado por JOIN) para que
+        la capa de API lo pagine; usar serializar_alumnos() sobre la página.
+        Con `campos` solo se cargan las columnas que esos campos leen.
+        """
         filtros = filtros or {}
+        alumnos = self.alumno_repo.get_all()
         
-        if filtros.get('grado_id') or filtros.get('grado'):
-            grado_id = filtros.get('grado_id') or filtros.get('grado')
-            alumnos = self.alumno_repo.filter_by_grado(grado_id)
-        elif filtros.get('institucion_id') or filtros.get('institucion'):
-            institucion_id = filtros.get('institucion_id') or filtros.get('institucion')
-            alumnos = self.alumno_repo.filter_by_institucion(institucion_id)
-        elif filtros.get('search'):
-            alumnos = self.alumno_repo.search(filtros['search'])
-        else:
-            alumnos = self.alumno_repo.get_all()
+        grado_id = filtros.get('grado_id') or filtros.get('grado')
+        if grado_id:
+            alumnos = self.alumno_repo.filter_by_grado(grado_id, alumnos)
+        institucion_id = filtros.get('institucion_id') or filtros.get('institucion')
+        if institucion_id:
+            alumnos = self.alumno_repo.filter_by_institucion(institucion_id, alumnos)
+        if filtros.get('search'):
+            alumnos = self.alumno_repo.search(filtros['search'], alumnos)
+        if campos is not None:
+            columnas = [columna for campo in campos for columna in self.COLUMNAS_CAMPO.get(campo, ())]
+            alumnos = self.alumno_repo.only_columns(columnas, alumnos)
         
-        return [self._to_dict(alumno) for alumno in alumnos]
+        return alumnos
+    
+    def serializar_alumnos(self, alumnos: Iterable[Alumno], campos: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Convierte una página de alumnos a diccionarios (solo `campos` si se indican)"""
+        return [self._to_dict(alumno, campos) for alumno in alumnos]
     
     def actualizar_alumno(self, alumno_id: int, datos: Dict) -> Dict:
         """Actualiza un alumno con validaciones"""
@@ -123,44 +208,209 @@ class AlumnoService:
             raise AlumnoNotFoundError(f"Alumno con ID {alumno_id} no existe")
         self.alumno_repo.delete(alumno)
     
-    def _generar_matricula(self, nombre: str, apellido: str) -> str:
-        """Genera una matrícula única basada en nombre y apellido"""
-        prefijo_nombre = (nombre or 'EST')[:3].upper()
-        prefijo_apellido = (apellido or '000')[:3].upper()
-        base_matricula = f"EST-{prefijo_nombre}-{prefijo_apellido}"
+    def importar_alumnos(self, filas: Iterable[Dict]) -> Dict:
+        """
+        Importa alumnos en bloque con operaciones por conjuntos.
         
-        # Si ya existe, agregar número incremental
-        contador = 1
-        matricula = base_matricula
-        while self.alumno_repo.get_by_matricula(matricula):
-            matricula = f"{base_matricula}-{contador}"
-            contador += 1
+        - Valida cada fila en memoria (nombre, apellido, fecha, correo).
+        - Valida todos los grados con una sola consulta `id__in`.
+        - Verifica las matrículas explícitas con una sola consulta `matricula__in`.
+        - Para las matrículas generadas, obtiene en una consulta todas las
+          existentes con los prefijos involucrados y asigna los sufijos en memoria.
+        - Inserta con bulk_create en lotes dentro de una transacción.
         
-        return matricula
-    
-    def _to_dict(self, alumno: Alumno) -> Dict:
-        """Convierte un modelo Alumno a diccionario"""
+        Las filas inválidas no se insertan y se devuelven en `errores` con su
+        índice (base 0).
+        """
+        filas = list(filas)
+        errores: List[Dict] = []
+        validas: List[tuple] = []
+        
+        for indice, fila in enumerate(filas):
+            datos, errores_fila = self._validar_fila_importacion(fila)
+            if errores_fila:
+                errores.append({'fila': indice, 'errores': errores_fila})
+            else:
+                validas.append((indice, datos))
+        
+        # Grados: una consulta
+        grados_pedidos = {d['grado_id'] for _, d in validas if d['grado_id']}
+        grados_existentes = set(self.grado_repo.existing_ids(grados_pedidos))
+        
+        # Matrículas explícitas: una consulta + duplicados dentro de la carga
+        explicitas = [d['matricula'] for _, d in validas if d['matricula']]
+        ocupadas = set(self.alumno_repo.existing_matriculas(explicitas))
+        
+        candidatas = []
+        vistas: Set[str] = set()
+        for indice, datos in validas:
+            errores_fila = {}
+            if datos['grado_id'] and datos['grado_id'] not in grados_existentes:
+                errores_fila['grado'] = [f"Grado con ID {datos['grado_id']} no existe"]
+            matricula = datos['matricula']
+            if matricula and (matricula in ocupadas or matricula in vistas):
+                errores_fila['matricula'] = [f"Ya existe un alumno con matrícula {matricula}"]
+            if errores_fila:
+                errores.append({'fila': indice, 'errores': errores_fila})
+                continue
+            if matricula:
+                vistas.add(matricula)
+            candidatas.append((indice, datos))
+        
+        # Matrículas generadas: sufijos asignados en memoria
+        pendientes = [d for _, d in candidatas if not d['matricula']]
+        if pendientes:
+            asignadas = self._asignar_matriculas(
+                [self._base_matricula(d['nombre'], d['apellido']) for d in pendientes],
+                reservadas=vistas,
+            )
+            for datos, matricula in zip(pendientes, asignadas):
+                datos['matricula'] = matricula
+        
+        alumnos = [Alumno(**datos) for _, datos in candidatas]
+        try:
+            with transaction.atomic():
+                self.alumno_repo.bulk_create(alumnos, batch_size=self.TAMANO_LOTE)
+        except IntegrityError as e:
+            # Otra inscripción concurrente tomó alguna matrícula
+            raise MatriculaDuplicadaError(f"Conflicto de matrícula durante la importación: {e}")
+        if alumnos:
+            # bulk_create no emite señales
+            invalidar('estadisticas')
+            buscador('alumnos').invalidar()
+        
+        errores.sort(key=lambda error: error['fila'])
         return {
-            'id': alumno.id,
-            'nombre': alumno.nombre,
-            'apellido': alumno.apellido,
-            'matricula': alumno.matricula,
-            'fecha_nacimiento': alumno.fecha_nacimiento,
-            'correo': alumno.correo,
-            'grado_id': alumno.grado_id if alumno.grado else None,
-            'grado_nombre': alumno.grado.nombre if alumno.grado else None,
-            # Campos adicionales para compatibilidad con frontend
-            'cedula': alumno.matricula,
-            'email': alumno.correo,
-            'fechaNacimiento': alumno.fecha_nacimiento,
-            'gradoEstudioId': alumno.grado_id if alumno.grado else None,
-            'direccion': '',
-            'telefono': '',
-            'nombreRepresentante': '',
-            'telefonoRepresentante': '',
-            'año': None,
-            'periodo': '',
-            'estado': True,
-            'fechaIngreso': None,
+            'recibidas': len(filas),
+            'creadas': len(alumnos),
+            'alumnos': [
+                {'fila': indice, 'id': alumno.pk, 'matricula': alumno.matricula}
+                for (indice, _), alumno in zip(candidatas, alumnos)
+            ],
+            'errores': errores,
         }
-
+    
+    def _validar_fila_importacion(self, fila) -> tuple:
+        """Valida una fila de importación; devuelve (datos, errores)"""
+        if not isinstance(fila, dict):
+            return None, {'non_field_errors': ['Cada fila debe ser un objeto']}
+        
+        errores = {}
+        nombre = self._texto_fila(fila.get('nombre'))
+        apellido = self._texto_fila(fila.get('apellido'))
+        if len(nombre) < 2:
+            errores['nombre'] = ['El nombre debe tener al menos 2 caracteres']
+        if len(apellido) < 2:
+            errores['apellido'] = ['El apellido debe tener al menos 2 caracteres']
+        
+        matricula = self._texto_fila(fila.get('matricula') or fila.get('cedula')) or None
+        if matricula and len(matricula) > Alumno._meta.get_field('matricula').max_length:
+            errores['matricula'] = ['La matrícula no puede superar 20 caracteres']
+        
+        fecha = fila.get('fecha_nacimiento') or fila.get('fechaNacimiento') or None
+        if fecha:
+            try:
+                fecha = parse_date(fecha.strip()) if isinstance(fecha, str) else None
+            except ValueError:
+                fecha = None
+            if fecha is None:
+                errores['fecha_nacimiento'] = ['Formato de fecha inválido (use AAAA-MM-DD)']
+        
+        correo = self._texto_fila(fila.get('correo') or fila.get('email')) or None
+        if correo:
+            try:
+                validate_email(correo)
+            except ValidationError:
+                errores['correo'] = ['Correo electrónico inválido']
+        
+        grado_id = fila.get('grado_id') or fila.get('grado') or fila.get('gradoEstudioId') or None
+        if grado_id:
+            try:
+                grado_id = int(grado_id)
+            except (TypeError, ValueError):
+                errores['grado'] = ['Debe ser un ID entero']
+        
+        if errores:
+            return None, errores
+        return {
+            'nombre': nombre,
+            'apellido': apellido,
+            'matricula': matricula,
+            'fecha_nacimiento': fecha,
+            'correo': correo,
+            'grado_id': grado_id,
+        }, {}
+    
+    def _asignar_matriculas(self, bases: List[str], reservadas: Set[str] = frozenset()) -> List[str]:
+        """
+        Asigna matrículas únicas para una lista de bases (con repeticiones).
+        
+        Los sufijos salen del contador por prefijo (MatriculaSecuencia), que
+        se reserva en bloque y bajo bloqueo, por lo que el coste no depende
+        de cuántos alumnos comparten el prefijo y es seguro con inscripciones
+        concurrentes. Se sigue la convención base, base-1, base-2, ...
+        Si un sufijo reservado choca con una matrícula cargada manualmente
+        (o con `reservadas`), se reserva otro.
+        """
+        asignadas: List[Optional[str]] = [None] * len(bases)
+        pendientes = list(range(len(bases)))
+        while pendientes:
+            conteos = Counter(bases[i] for i in pendientes)
+            sufijos = self.secuencia_repo.reservar(conteos, self._sufijos_iniciales)
+            candidatas = {}
+            for i in pendientes:
+                sufijo = sufijos[bases[i]].pop(0)
+                candidatas[i] = bases[i] if sufijo == 0 else f"{bases[i]}-{sufijo}"
+            ocupadas = set(self.alumno_repo.existing_matriculas(candidatas.values())) | set(reservadas)
+            pendientes = []
+            for i, matricula in candidatas.items():
+                if matricula in ocupadas:
+                    pendientes.append(i)
+                else:
+                    asignadas[i] = matricula
+        return asignadas
+    
+    def _sufijos_iniciales(self, bases: List[str]) -> Dict[str, int]:
+        """Primer sufijo libre por base según las matrículas existentes (una consulta)"""
+        maximos: Dict[str, int] = {}
+        for matricula in self.alumno_repo.matriculas_con_prefijos(bases):
+            candidatos = [(matricula, 0), self._separar_matricula(matricula)]
+            for base, sufijo in candidatos:
+                if base in bases:
+                    maximos[base] = max(maximos.get(base, -1), sufijo)
+        return {base: maximos[base] + 1 if base in maximos else 0 for base in bases}
+    
+    @staticmethod
+    def _texto_fila(valor) -> str:
+        """Valor de una celda como texto (las filas JSON pueden traer números)"""
+        return str(valor).strip() if valor is not None else ''
+    
+    @staticmethod
+    def _separar_matricula(matricula: str) -> tuple:
+        """Separa 'base-N' en (base, N); una matrícula sin sufijo es (matrícula, 0)"""
+        base, _, resto = matricula.rpartition('-')
+        if base and re.fullmatch(r'[1-9][0-9]*', resto):
+            return base, int(resto)
+        return matricula, 0
+    
+    @staticmethod
+    def _base_matricula(nombre: str, apellido: str) -> str:
+        """Base de matrícula: EST-<3 letras nombre>-<3 letras apellido>"""
+        prefijo_nombre = (nombre or 'EST')[:3].upper()
+        prefijo_apellido = (apellido or '000')[:3].upper()
+        return f"EST-{prefijo_nombre}-{prefijo_apellido}"
+    
+    def _generar_matricula(self, nombre: str, apellido: str) -> str:
+        """Genera una matrícula única basada en nombre y apellido"""
+        return self._asignar_matriculas([self._base_matricula(nombre, apellido)])[0]
+    
+    def _to_dict(self, alumno: Alumno, campos: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Convierte un modelo Alumno a diccionario.
+        
+        Con `campos` solo incluye esas claves y no lee las demás columnas
+        (el alumno puede venir de listar_alumnos con .only()).
+        """
+        if campos is None:
+            return {clave: obtener(alumno) for clave, obtener in self.REPRESENTACION.items()}
+        return {campo: self.REPRESENTACION[campo](alumno) for campo in campos if campo in self.REPRESENTACION}
@@ -0,0 +1,140 @@
+"""
+Servicio con lógica de negocio para Calificaciones
+"""
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.db import transaction
+from school.cache import invalidar
+from school.models import Alumno, Calificacion, Materia, Periodo
+from school.services.resumen_materializado_service import ResumenMaterializadoService
+
+
+class CalificacionService:
+    """Servicio con lógica de negocio para Calificaciones"""
+
+    TAMANO_LOTE = 1000
+
+    def __init__(self):
+        campo = Calificacion._meta.get_field('calificacion')
+        self.max_digitos = campo.max_digits
+        self.decimales = campo.decimal_places
+
+    def _validar_fila(self, fila) -> Tuple[Optional[Dict], Dict]:
+        """Valida tipos de una fila; devuelve (datos, errores)"""
+        if not isinstance(fila, dict):
+            return None, {'non_field_errors': ['Cada fila debe ser un objeto']}
+
+        errores = {}
+        datos = {}
+        for campo in ('alumno', 'materia', 'periodo'):
+            valor = fila.get(campo, fila.get(f'{campo}_id'))
+            if valor in (None, ''):
+                errores[campo] = ['Este campo es requerido.']
+                continue
+            try:
+                if isinstance(valor, bool):
+                    # int(True) == 1: un booleano JSON no es un ID
+                    raise TypeError
+                datos[campo] = int(valor)
+            except (TypeError, ValueError):
+                errores[campo] = ['Debe ser un ID entero.']
+
+        valor = fila.get('calificacion')
+        if valor in (None, ''):
+            errores['calificacion'] = ['Este campo es requerido.']
+        else:
+            try:
+                nota = Decimal(str(valor).strip())
+                if not nota.is_finite():
+                    raise InvalidOperation
+                nota = nota.quantize(Decimal(1).scaleb(-self.decimales))
+                if len(nota.as_tuple().digits) > self.max_digitos:
+                    errores['calificacion'] = [
+                        f'No debe tener más de {self.max_digitos} dígitos en total.'
+                    ]
+                else:
+                    datos['calificacion'] = nota
+            except InvalidOperation:
+                errores['calificacion'] = ['Debe ser un número decimal válido.']
+        return datos, errores
+
+    def carga_masiva(self, filas: Iterable[Dict]) -> Dict:
+        """
+        Inserta o actualiza calificaciones en bloque.
+
+        - Valida tipos por fila.
+        - Valida alumnos, materias y periodos con una consulta `id__in` por modelo.
+        - Hace upsert sobre (alumno, materia, periodo) con bulk_create
+          (update_conflicts) dentro de una única transacción.
+
+        Las filas inválidas no se guardan y se devuelven en `errores` con su
+        índice (base 0). Si una clave se repite, gana la última fila.
+        """
+        filas = list(filas)
+        errores: List[Dict] = []
+        validas: Dict[tuple, tuple] = {}
+
+        for indice, fila in enumerate(filas):
+            datos, errores_fila = self._validar_fila(fila)
+            if errores_fila:
+                errores.append({'fila': indice, 'errores': errores_fila})
+                continue
+            clave = (datos['alumno'], datos['materia'], datos['periodo'])
+            if clave in validas:
+                anterior = validas[clave][0]
+                errores.append({
+                    'fila': anterior,
+                    'errores': {'non_field_errors': [
+                        f'Fila duplicada (alumno, materia, periodo); se usa la fila {indice}'
+                    ]},
+                })
+            validas[clave] = (indice, datos)
+
+        # Validación de claves foráneas: una consulta por modelo
+        existentes = {
+            'alumno': set(Alumno.objects.filter(
+                id__in={c[0] for c in validas}).values_list('id', flat=True)),
+            'materia': set(Materia.objects.filter(
+                id__in={c[1] for c in validas}).values_list('id', flat=True)),
+            'periodo': set(Periodo.objects.filter(
+                id__in={c[2] for c in validas}).values_list('id', flat=True)),
+        }
+
+        objetos = []
+        for clave, (indice, datos) in validas.items():
+            errores_fk = {
+                campo: [f'No existe {campo} con ID {datos[campo]}.']
+                for campo in ('alumno', 'materia', 'periodo')
+                if datos[campo] not in existentes[campo]
+            }
+            if errores_fk:
+                errores.append({'fila': indice, 'errores': errores_fk})
+                continue
+            objetos.append(Calificacion(
+                alumno_id=datos['alumno'],
+                materia_id=datos['materia'],
+                periodo_id=datos['periodo'],
+                calificacion=datos['calificacion'],
+            ))
+
+        with transaction.atomic():
+            Calificacion.objects.bulk_create(
+                objetos,
+                batch_size=self.TAMANO_LOTE,
+                update_conflicts=True,
+                unique_fields=['alumno', 'materia', 'periodo'],
+                update_fields=['calificacion', 'actualizado_en'],
+            )
+            # bulk_create no emite señales: actualizar resúmenes e invalidar cachés aquí
+            ResumenMaterializadoService().recalcular(
+                pares={(obj.alumno_id, obj.periodo_id) for obj in objetos}
+            )
+        if objetos:
+            invalidar('calificaciones')
+
+        errores.sort(key=lambda error: error['fila'])
+        return {
+            'recibidas': len(filas),
+            'guardadas': len(objetos),
+            'errores': errores,
+        }
@@ -0,0 +1,78 @@
+"""
+Servicio de estadísticas del dashboard
+
+Devuelve los conteos de alumnos, profesores, personal, materias y grados
+(globales o de una institución) en una sola consulta: cada conteo es una
+subconsulta escalar `(SELECT COUNT(*) FROM (...))` generada desde el ORM.
+El resultado se guarda en la caché versionada (espacio 'estadisticas'),
+que las señales invalidan al guardar o borrar cualquiera de esos modelos.
+"""
+from typing import Dict, Optional
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import QuerySet
+from school.cache import obtener_o_calcular
+from school.models import Alumno, Grado, Materia, Personal, Profesor
+
+
+NAMESPACE = 'estadisticas'
+
+
+def _querysets(institucion_id: Optional[int]) -> Dict[str, QuerySet]:
+    """Queryset por conteo, filtrado por institución si corresponde"""
+    querysets = {
+        'alumnos': (Alumno.objects.all(), 'grado__institucion_id'),
+        'profesores': (Profesor.objects.all(), 'institucion_id'),
+        'personal': (Personal.objects.all(), 'institucion_id'),
+        'materias': (Materia.objects.all(), 'grado__institucion_id'),
+        'grados': (Grado.objects.all(), 'institucion_id'),
+    }
+    return {
+        nombre: queryset.filter(**{lookup: institucion_id}) if institucion_id is not None else queryset
+        for nombre, (queryset, lookup) in querysets.items()
+    }
+
+
+class EstadisticasService:
+    """Conteos agregados para el dashboard"""
+
+    def conteos(self, institucion_id: Optional[int] = None) -> Dict[str, int]:
+        """Conteos calculados en una única consulta (sin caché)"""
+        # SQL crudo: se enruta como una lectura del ORM (réplica si hay, ver core/replicas.py)
+        connection = connections[router.db_for_read(Alumno)]
+        columnas = []
+        parametros = []
+        for nombre, queryset in _querysets(institucion_id).items():
+            sql, params = queryset.order_by().values('pk').query.sql_with_params()
+            columnas.append(
+                f'(SELECT COUNT(*) FROM ({sql}) AS {nombre}_sq) AS {connection.ops.quote_name(nombre)}'
+            )
+            parametros.extend(params)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {', '.join(columnas)}", parametros)
+            fila = cursor.fetchone()
+            nombres = [columna[0] for columna in cursor.description]
+        return dict(zip(nombres, fila))
+
+    def estadisticas(self, institucion_id: Optional[int] = None, usar_cache: bool = True) -> Dict[str, int]:
+        """Conteos cacheados; el TTL se configura con DASHBOARD_CACHE_TTL"""
+        timeout = getattr(settings, 'DASHBOARD_CACHE_TTL', 60)
+        if not usar_cache or not timeout:
+            return self.conteos(institucion_id)
+        return obtener_o_calcular(
+            [NAMESPACE], ('conteos', institucion_id),
+            lambda: self.conteos(institucion_id),
+            timeout=timeout,
+        )
+
+    async def aestadisticas(self, institucion_id: Optional[int] = None, usar_cache: bool = True) -> Dict[str, int]:
+        """
+        Versión async de estadisticas() para las vistas async.
+
+        Los conteos ya son una sola consulta SQL cruda (sin equivalente en el
+        ORM async) y la caché no tiene E/S async nativa: se ejecuta todo en
+        un único salto a hilo en lugar de cinco acount() secuenciales.
+        """
+        return await sync_to_async(self.estadisticas)(institucion_id, usar_cache)
@@ -0,0 +1,163 @@
+"""
+Servicio de resúmenes (boletines) de calificaciones
+
+Calcula promedios, mínimos, máximos, tasa de aprobación y posición (ranking)
+agrupando por alumno, materia, grado y/o periodo, todo en una sola consulta
+con agregaciones y funciones de ventana de la base de datos.
+
+Cuando la agrupación y los filtros solo involucran alumno y periodo (y se usa
+la nota aprobatoria por defecto), la consulta lee el resumen materializado
+ResumenCalificacion (una fila por alumno y periodo) en lugar de Calificacion.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Sequence
+from django.conf import settings
+from django.db.models import Avg, Count, DecimalField, ExpressionWrapper, F, Max, Min, Q, QuerySet, Sum, Window
+from django.db.models.functions import Rank
+from school.models import Calificacion, ResumenCalificacion
+
+
+# Dimensión -> (columna de agrupación, {campo de salida: columna descriptiva})
+DIMENSIONES = {
+    'alumno': ('alumno_id', {'alumno_nombre': 'alumno__nombre', 'alumno_apellido': 'alumno__apellido'}),
+    'materia': ('materia_id', {'materia_nombre': 'materia__nombre'}),
+    'grado': ('materia__grado_id', {'grado_nombre': 'materia__grado__nombre'}),
+    'periodo': ('periodo_id', {'periodo_nombre': 'periodo__nombre'}),
+}
+
+# Filtro de la query string -> lookup sobre Calificacion
+FILTROS = {
+    'alumno': 'alumno_id',
+    'materia': 'materia_id',
+    'periodo': 'periodo_id',
+    'grado': 'materia__grado_id',
+    'institucion': 'materia__grado__institucion_id',
+}
+
+# Dimensiones y filtros que puede responder el resumen materializado
+DIMENSIONES_MATERIALIZADAS = {'alumno', 'periodo'}
+
+FUENTE_AUTO = 'auto'
+FUENTE_CALIFICACIONES = 'calificaciones'
+
+DOS_DECIMALES = Decimal('0.01')
+
+
+class ResumenCalificacionesService:
+    """Servicio de agregación de calificaciones"""
+
+    @staticmethod
+    def nota_aprobatoria_por_defecto() -> Decimal:
+        return Decimal(str(getattr(settings, 'CALIFICACION_APROBATORIA', 10)))
+
+    @staticmethod
+    def validar_agrupacion(agrupar: Sequence[str]) -> List[str]:
+        """Normaliza la lista de dimensiones; lanza ValueError si alguna no existe"""
+        agrupar = [dimension.strip() for dimension in agrupar if dimension.strip()] or ['alumno']
+        invalidas = [dimension for dimension in agrupar if dimension not in DIMENSIONES]
+        if invalidas:
+            raise ValueError(
+                f"Dimensiones no válidas: {', '.join(invalidas)}. "
+                f"Use: {', '.join(DIMENSIONES)}"
+            )
+        return list(dict.fromkeys(agrupar))
+
+    def usa_materializado(self, agrupar: Sequence[str], filtros: Dict,
+                          nota_aprobatoria: Decimal = None) -> bool:
+        """Indica si la consulta puede resolverse con ResumenCalificacion"""
+        filtros_usados = {nombre for nombre, valor in filtros.items() if valor}
+        return (
+            set(agrupar) <= DIMENSIONES_MATERIALIZADAS
+            and filtros_usados <= DIMENSIONES_MATERIALIZADAS
+            and (nota_aprobatoria is None or nota_aprobatoria == self.nota_aprobatoria_por_defecto())
+        )
+
+    def resumen(self, agrupar: Sequence[str], filtros: Dict = None,
+                nota_aprobatoria: Decimal = None, fuente: str = FUENTE_AUTO) -> QuerySet:
+        """
+        Queryset agregado (una consulta) con una fila por combinación de dimensiones.
+
+        La posición se calcula con RANK() sobre el promedio descendente, particionando
+        por las dimensiones después de la primera: con agrupar=['alumno', 'periodo']
+        se obtiene el puesto de cada alumno dentro de cada periodo.
+
+        Con fuente='auto' se usa el resumen materializado cuando es posible;
+        fuente='calificaciones' fuerza el cálculo sobre Calificacion.
+        """
+        agrupar = self.validar_agrupacion(agrupar)
+        filtros = filtros or {}
+        materializado = fuente != FUENTE_CALIFICACIONES and self.usa_materializado(
+            agrupar, filtros, nota_aprobatoria
+        )
+        if nota_aprobatoria is None:
+            nota_aprobatoria = self.nota_aprobatoria_por_defecto()
+
+        queryset = ResumenCalificacion.objects.all() if materializado else Calificacion.objects.all()
+        for nombre, lookup in FILTROS.items():
+            if filtros.get(nombre):
+                queryset = queryset.filter(**{lookup: filtros[nombre]})
+
+        columnas = []
+        for dimension in agrupar:
+            columna_id, descriptivas = DIMENSIONES[dimension]
+            columnas.append(columna_id)
+            columnas.extend(descriptivas.values())
+
+        if materializado:
+            # Promedio ponderado: suma total / cantidad total
+            agregados = {
+                'promedio': ExpressionWrapper(
+                    Sum('suma') / Sum('total'),
+                    output_field=DecimalField(max_digits=12, decimal_places=4),
+                ),
+                'minima': Min('minima'),
+                'maxima': Max('maxima'),
+                'total': Sum('total'),
+                'aprobadas': Sum('aprobadas'),
+            }
+        else:
+            agregados = {
+                'promedio': Avg('calificacion'),
+                'minima': Min('calificacion'),
+                'maxima': Max('calificacion'),
+                'total': Count('id'),
+                'aprobadas': Count('id', filter=Q(calificacion__gte=nota_aprobatoria)),
+            }
+
+        particion = [F(DIMENSIONES[dimension][0]) for dimension in agrupar[1:]]
+        return (
+            queryset
+            .values(*columnas)
+            .annotate(**agregados)
+            .annotate(posicion=Window(
+                expression=Rank(),
+                partition_by=particion or None,
+                order_by=F('promedio').desc(),
+            ))
+            .order_by(*[DIMENSIONES[dimension][0] for dimension in agrupar[1:]], 'posicion',
+                      DIMENSIONES[agrupar[0]][0])
+        )
+
+    @staticmethod
+    def formatear(filas, agrupar: Sequence[str]) -> List[Dict]:
+        """Convierte las filas agregadas al formato de la API (decimales como texto)"""
+        resultado = []
+        for fila in filas:
+            salida = {}
+            for dimension in agrupar:
+                columna_id, descriptivas = DIMENSIONES[dimension]
+                salida[dimension] = fila[columna_id]
+                for campo, columna in descriptivas.items():
+                    salida[campo] = fila[columna]
+            for campo in ('promedio', 'minima', 'maxima'):
+                valor = fila[campo]
+                salida[campo] = (
+                    str(Decimal(str(valor)).quantize(DOS_DECIMALES, rounding=ROUND_HALF_UP))
+                    if valor is not None else None
+                )
+            salida['total'] = fila['total']
+            salida['aprobadas'] = fila['aprobadas']
+            salida['tasa_aprobacion'] = round(fila['aprobadas'] / fila['total'], 4) if fila['total'] else None
+            salida['posicion'] = fila['posicion']
+            resultado.append(salida)
+        return resultado
@@ -0,0 +1,183 @@
+"""
+Mantenimiento del resumen materializado (ResumenCalificacion)
+
+Cada fila resume las calificaciones de un alumno en un periodo. Cuando una
+calificación cambia solo se recalcula su par (alumno, periodo) con una
+consulta agregada sobre las pocas calificaciones de ese par, de modo que el
+coste no depende del tamaño de la tabla.
+
+Los pares modificados dentro de una transacción se acumulan y se recalculan
+juntos al confirmar (transaction.on_commit), así un borrado en cascada de un
+alumno no recalcula una vez por cada calificación.
+"""
+import threading
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from school.models import Calificacion, ResumenCalificacion
+
+
+Par = Tuple[int, int]  # (alumno_id, periodo_id)
+
+DOS_DECIMALES = Decimal('0.01')
+
+_pendientes = threading.local()
+
+
+def marcar_pendiente(alumno_id: int, periodo_id: int) -> None:
+    """Agenda el recálculo del par para cuando se confirme la transacción actual"""
+    if alumno_id is None or periodo_id is None:
+        return
+    pares = getattr(_pendientes, 'pares', None)
+    if pares is None:
+        pares = _pendientes.pares = set()
+    pares.add((alumno_id, periodo_id))
+    # Sin transacción activa on_commit ejecuta de inmediato. Dentro de una
+    # transacción, la primera callback procesa todos los pares acumulados y
+    # las demás no encuentran nada pendiente. Si hay rollback, los pares
+    # quedan y se recalculan con la siguiente confirmación (el recálculo es
+    # idempotente).
+    transaction.on_commit(procesar_pendientes)
+
+
+def procesar_pendientes() -> None:
+    pares = getattr(_pendientes, 'pares', None)
+    if not pares:
+        return
+    _pendientes.pares = set()
+    ResumenMaterializadoService().recalcular(pares=pares)
+
+
+def _iguales(a, b) -> bool:
+    """Compara valores numéricos sin depender del tipo que devuelva el backend"""
+    if a is None or b is None:
+        return a is b
+    return Decimal(str(a)) == Decimal(str(b))
+
+
+class ResumenMaterializadoService:
+    """Recalcula y verifica los resúmenes alumno x periodo"""
+
+    TAMANO_LOTE = 1000
+
+    @staticmethod
+    def nota_aprobatoria() -> Decimal:
+        return Decimal(str(getattr(settings, 'CALIFICACION_APROBATORIA', 10)))
+
+    def _agregados(self, alumno_ids: Optional[Iterable[int]] = None,
+                   periodo_ids: Optional[Iterable[int]] = None) -> Dict[Par, Dict]:
+        """Agregados por (alumno, periodo) calculados desde Calificacion"""
+        queryset = Calificacion.objects.all()
+        if alumno_ids is not None:
+            queryset = queryset.filter(alumno_id__in=set(alumno_ids))
+        if periodo_ids is not None:
+            queryset = queryset.filter(periodo_id__in=set(periodo_ids))
+        filas = (
+            queryset
+            .values('alumno_id', 'periodo_id')
+            .annotate(
+                total=Count('id'),
+                suma=Sum('calificacion'),
+                minima=Min('calificacion'),
+                maxima=Max('calificacion'),
+                aprobadas=Count('id', filter=Q(calificacion__gte=self.nota_aprobatoria())),
+            )
+            .order_by()
+        )
+        agregados = {}
+        for fila in filas:
+            suma = Decimal(str(fila['suma'])).quantize(DOS_DECIMALES)
+            agregados[(fila['alumno_id'], fila['periodo_id'])] = {
+                'total': fila['total'],
+                'suma': suma,
+                'promedio': (suma / fila['total']).quantize(DOS_DECIMALES, rounding=ROUND_HALF_UP),
+                'minima': Decimal(str(fila['minima'])).quantize(DOS_DECIMALES),
+                'maxima': Decimal(str(fila['maxima'])).quantize(DOS_DECIMALES),
+                'aprobadas': fila['aprobadas'],
+            }
+        return agregados
+
+    def recalcular(self, pares: Optional[Iterable[Par]] = None,
+                   alumno_ids: Optional[Iterable[int]] = None,
+                   periodo_ids: Optional[Iterable[int]] = None) -> int:
+        """
+        Recalcula los resúmenes de un conjunto de pares o de un rango de alumnos/periodos.
+
+        Con `pares` se consulta el producto de sus alumnos y periodos (un
+        superconjunto pequeño) y se actualizan solo esos pares. Devuelve el
+        número de filas escritas.
+        """
+        objetivo: Optional[Set[Par]] = None
+        if pares is not None:
+            objetivo = set(pares)
+            if not objetivo:
+                return 0
+            alumno_ids = {alumno for alumno, _ in objetivo}
+            periodo_ids = {periodo for _, periodo in objetivo}
+
+        agregados = self._agregados(alumno_ids, periodo_ids)
+        if objetivo is not None:
+            agregados = {par: datos for par, datos in agregados.items() if par in objetivo}
+
+        # Resúmenes existentes en el alcance que ya no tienen calificaciones
+        existentes = ResumenCalificacion.objects.all()
+        if alumno_ids is not None:
+            existentes = existentes.filter(alumno_id__in=set(alumno_ids))
+        if periodo_ids is not None:
+            existentes = existentes.filter(periodo_id__in=set(periodo_ids))
+        sobrantes = [
+            pk for pk, alumno, periodo in existentes.values_list('pk', 'alumno_id', 'periodo_id')
+            if (alumno, periodo) not in agregados
+            and (objetivo is None or (alumno, periodo) in objetivo)
+        ]
+
+        with transaction.atomic():
+            if sobrantes:
+                ResumenCalificacion.objects.filter(pk__in=sobrantes).delete()
+            ResumenCalificacion.objects.bulk_create(
+                [
+                    ResumenCalificacion(alumno_id=alumno, periodo_id=periodo, **datos)
+                    for (alumno, periodo), datos in agregados.items()
+                ],
+                batch_size=self.TAMANO_LOTE,
+                update_conflicts=True,
+                unique_fields=['alumno', 'periodo'],
+                update_fields=['total', 'suma', 'promedio', 'minima', 'maxima', 'aprobadas', 'actualizado'],
+            )
+        return len(agregados)
+
+    def verificar(self, alumno_ids: Optional[Iterable[int]] = None) -> List[Dict]:
+        """
+        Compara los resúmenes guardados con los calculados desde Calificacion.
+
+        Devuelve una lista de discrepancias {alumno, periodo, tipo, esperado, guardado}
+        donde tipo es 'faltante', 'sobrante' o 'distinto'.
+        """
+        esperados = self._agregados(alumno_ids)
+        guardados = ResumenCalificacion.objects.all()
+        if alumno_ids is not None:
+            guardados = guardados.filter(alumno_id__in=set(alumno_ids))
+        campos = ('total', 'suma', 'promedio', 'minima', 'maxima', 'aprobadas')
+        guardados = {
+            (fila['alumno_id'], fila['periodo_id']): {campo: fila[campo] for campo in campos}
+            for fila in guardados.values('alumno_id', 'periodo_id', *campos)
+        }
+
+        discrepancias = []
+        for par in sorted(set(esperados) | set(guardados)):
+            esperado, guardado = esperados.get(par), guardados.get(par)
+            if guardado is None:
+                tipo = 'faltante'
+            elif esperado is None:
+                tipo = 'sobrante'
+            elif any(not _iguales(guardado[campo], esperado[campo]) for campo in campos):
+                tipo = 'distinto'
+            else:
+                continue
+            discrepancias.append({
+                'alumno': par[0], 'periodo': par[1], 'tipo': tipo,
+                'esperado': esperado, 'guardado': guardado,
+            })
+        return discrepancias
@@ -0,0 +1,111 @@
+"""
+Señales de la app school: invalidación de cachés, mantenimiento de resúmenes
+e índices de búsqueda
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from school.api.autenticacion import invalidar_tokens, invalidar_usuario
+from school.busqueda import buscador
+from school.busqueda.motor import registrar_funciones_sqlite
+from school.cache import invalidar
+from school.models import Alumno, Calificacion, Grado, Institucion, Materia, Periodo, Personal, Profesor
+from school.services.estadisticas_service import NAMESPACE as ESTADISTICAS
+from school.services.resumen_materializado_service import marcar_pendiente
+
+
+@receiver([post_save, post_delete], sender=Calificacion)
+@receiver([post_save, post_delete], sender=Alumno)
+@receiver([post_save, post_delete], sender=Materia)
+@receiver([post_save, post_delete], sender=Grado)
+@receiver([post_save, post_delete], sender=Periodo)
+def invalidar_resumen_calificaciones(sender, **kwargs):
+    """Los resúmenes incluyen nombres de alumnos, materias, grados y periodos"""
+    invalidar('calificaciones')
+
+
+@receiver([post_save, post_delete], sender=Alumno)
+@receiver([post_save, post_delete], sender=Profesor)
+@receiver([post_save, post_delete], sender=Personal)
+@receiver([post_save, post_delete], sender=Materia)
+@receiver([post_save, post_delete], sender=Grado)
+def invalidar_estadisticas(sender, **kwargs):
+    """Un alta, baja o cambio de institución/grado altera los conteos del dashboard"""
+    invalidar(ESTADISTICAS)
+
+
+@receiver([post_save, post_delete], sender=Institucion)
+def invalidar_instituciones(sender, **kwargs):
+    invalidar('instituciones')
+
+
+@receiver([post_save, post_delete], sender=Periodo)
+def invalidar_periodos(sender, **kwargs):
+    invalidar('periodos')
+
+
+@receiver([post_save, post_delete], sender=Grado)
+def invalidar_grados(sender, **kwargs):
+    invalidar('grados')
+
+
+@receiver(post_init, sender=Calificacion)
+def recordar_par_original(sender, instance, **kwargs):
+    """
+    Guarda el par (alumno, periodo) cargado para detectar si cambia al guardar.
+    Se lee de __dict__: con .only()/.defer() leer un campo diferido llamaría a
+    refresh_from_db(), que construye otra Calificacion y vuelve a este receptor.
+    """
+    instance._par_resumen_original = (instance.__dict__.get('alumno_id'), instance.__dict__.get('periodo_id'))
+
+
+@receiver(post_save, sender=Calificacion)
+def actualizar_resumen_al_guardar(sender, instance, **kwargs):
+    marcar_pendiente(instance.alumno_id, instance.periodo_id)
+    original = getattr(instance, '_par_resumen_original', None)
+    # (None, None) si la instancia se cargó con el par diferido: no se conoce el original
+    if original and None not in original and original != (instance.alumno_id, instance.periodo_id):
+        marcar_pendiente(*original)
+    instance._par_resumen_original = (instance.alumno_id, instance.periodo_id)
+
+
+@receiver(post_delete, sender=Calificacion)
+def actualizar_resumen_al_borrar(sender, instance, **kwargs):
+    marcar_pendiente(instance.alumno_id, instance.periodo_id)
+
+
+@receiver(connection_created)
+def funciones_busqueda_sqlite(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        registrar_funciones_sqlite(connection)
+
+
+@receiver(post_save, sender=Alumno)
+@receiver(post_save, sender=Personal)
+def actualizar_indice_busqueda(sender, instance, **kwargs):
+    nombre = 'alumnos' if sender is Alumno else 'personal'
+    transaction.on_commit(lambda: buscador(nombre).registrar_cambio(instance))
+
+
+@receiver(post_delete, sender=Alumno)
+@receiver(post_delete, sender=Personal)
+def quitar_de_indice_busqueda(sender, instance, **kwargs):
+    nombre = 'alumnos' if sender is Alumno else 'personal'
+    transaction.on_commit(lambda: buscador(nombre).registrar_cambio(instance, eliminada=True))
+
+
+@receiver(post_delete, sender=Token)
+def invalidar_token_borrado(sender, instance, **kwargs):
+    """Logout (AuthViewSet.logout) o borrado del usuario: el token deja de valer"""
+    invalidar_tokens([instance.key])
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidar_tokens_usuario(sender, instance, **kwargs):
+    """Desactivación o cambio de permisos: la caché guarda el usuario completo"""
+    invalidar_usuario(instance.pk)
+    # Otra petición pudo volver a cachear el usuario anterior antes del commit
+    transaction.on_commit(lambda: invalidar_usuario(instance.pk))
@@ -0,0 +1,163 @@
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from school.api import autenticacion
+from school.api.autenticacion import PREFIJO_CLAVE, SALT_ACCESO, CacheTokens, _huella, emitir_acceso
+from school.models import RefreshToken
+
+
+CLAVE = 'clave-segura-123'
+HASHERS_RAPIDOS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+@override_settings(AUTH_TOKEN_MODO='firmado', PASSWORD_HASHERS=HASHERS_RAPIDOS)
+class AccesoFirmadoTests(TestCase):
+    """Acceso firmado (Bearer) y rotación de los tokens de refresco"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = get_user_model().objects.create_user('docente', 'docente@ejemplo.com', CLAVE, is_staff=True)
+
+    def _login(self):
+        respuesta = self.client.post('/api/auth/login/', {'username': 'docente', 'password': CLAVE})
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta.json()
+
+    def _me(self, acceso):
+        return self.client.get('/api/auth/me/', HTTP_AUTHORIZATION=f'Bearer {acceso}')
+
+    def _rechazado(self, respuesta, mensaje):
+        # 403 y no 401: la primera clase de autenticación (sesión) no define WWW-Authenticate
+        self.assertEqual(respuesta.status_code, 403)
+        self.assertIn(mensaje, str(respuesta.json()))
+
+    def _refrescar(self, refresco):
+        return self.client.post('/api/auth/refresh/', {'refresh': refresco}, content_type='application/json')
+
+    def test_acceso_valido_sin_consultas(self):
+        datos = self._login()
+        self.assertEqual(datos['token'], datos['access'])
+        with self.assertNumQueries(0):
+            respuesta = self._me(datos['access'])
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json()['username'], 'docente')
+
+    def test_acceso_manipulado_o_ajeno(self):
+        acceso = self._login()['access']
+        firma = acceso[-1]
+        manipulado = acceso[:-1] + ('A' if firma != 'A' else 'B')
+        claims = signing.loads(acceso, salt=SALT_ACCESO)
+        claims['rol'] = 'Administrador'
+        ajenos = [
+            manipulado,
+            signing.dumps(claims, salt=SALT_ACCESO, key='otra-clave'),  # Firmado con otra clave
+            signing.dumps(claims, salt='otro-uso'),  # Firma de otro propósito
+            'no-es-un-token',
+        ]
+        for token in ajenos:
+            with self.subTest(token=token):
+                self._rechazado(self._me(token), 'Token de acceso inválido')
+
+    @override_settings(AUTH_ACCESO_TTL=0)
+    def test_acceso_expirado(self):
+        acceso, _ = emitir_acceso(self.usuario)
+        self._rechazado(self._me(acceso), 'Token de acceso expirado')
+
+    def test_refresco_rota(self):
+        datos = self._login()
+        respuesta = self._refrescar(datos['refresh'])
+        self.assertEqual(respuesta.status_code, 200)
+        nuevo = respuesta.json()
+        self.assertNotEqual(nuevo['refresh'], datos['refresh'])
+        self.assertEqual(nuevo['rol'], 'Docente')
+        self.assertEqual(self._me(nuevo['access']).status_code, 200)
+        self.assertEqual(self._refrescar(nuevo['refresh']).status_code, 200)
+
+    def test_reutilizar_un_refresco_revoca_todos(self):
+        primero = self._login()['refresh']
+        otra_sesion = self._login()['refresh']
+        rotado = self._refrescar(primero).json()['refresh']
+
+        self.assertEqual(self._refrescar(primero).status_code, 401)
+        self.assertEqual(self._refrescar(rotado).status_code, 401)
+        self.assertEqual(self._refrescar(otra_sesion).status_code, 401)
+        self.assertFalse(RefreshToken.objects.filter(usuario=self.usuario, revocado_en__isnull=True).exists())
+
+    def test_logout_revoca_los_refrescos(self):
+        datos = self._login()
+        otra_sesion = self._login()['refresh']
+        respuesta = self.client.post(
+            '/api/auth/logout/', {'refresh': datos['refresh']}, content_type='application/json',
+            HTTP_AUTHORIZATION=f"Bearer {datos['access']}",
+        )
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(self._refrescar(otra_sesion).status_code, 200)
+        self.assertEqual(self._refrescar(datos['refresh']).status_code, 401)
+
+        datos = self._login()
+        self.client.post('/api/auth/logout/', HTTP_AUTHORIZATION=f"Bearer {datos['access']}")
+        self.assertFalse(RefreshToken.objects.filter(usuario=self.usuario, revocado_en__isnull=True).exists())
+
+    def test_usuario_inactivo_no_refresca(self):
+        refresco = self._login()['refresh']
+        self.usuario.is_active = False
+        self.usuario.save()
+        self.assertEqual(self._refrescar(refresco).status_code, 401)
+
+    def test_refresco_desconocido(self):
+        self.assertEqual(self._refrescar('inventado').status_code, 401)
+        self.assertEqual(self._refrescar('').status_code, 400)
+
+
+@override_settings(AUTH_TOKEN_MODO='token', PASSWORD_HASHERS=HASHERS_RAPIDOS)
+class TokenCacheadoTests(TestCase):
+    """Token de la base resuelto desde la caché e invalidado por las señales"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = get_user_model().objects.create_user('alumno', 'alumno@ejemplo.com', CLAVE)
+
+    def _login(self):
+        respuesta = self.client.post('/api/auth/login/', {'username': 'alumno', 'password': CLAVE})
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta.json()['token']
+
+    def _me(self, token):
+        return self.client.get('/api/auth/me/', HTTP_AUTHORIZATION=f'Token {token}')
+
+    def test_segunda_peticion_sin_consultas(self):
+        token = self._login()
+        self.assertEqual(self._me(token).status_code, 200)
+        with self.assertNumQueries(0):
+            respuesta = self._me(token)
+        self.assertEqual(respuesta.json()['username'], 'alumno')
+
+    def test_token_rechazado_tras_logout(self):
+        token = self._login()
+        self.assertEqual(self._me(token).status_code, 200)
+        respuesta = self.client.post('/api/auth/logout/', HTTP_AUTHORIZATION=f'Token {token}')
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(self._me(token).status_code, 403)
+
+    def test_token_rechazado_tras_desactivar(self):
+        token = self._login()
+        self.assertEqual(self._me(token).status_code, 200)
+        self.usuario.is_active = False
+        self.usuario.save()
+        self.assertEqual(self._me(token).status_code, 403)
+
+    def test_borrar_usuario_limpia_la_cache_compartida(self):
+        with override_settings(AUTH_TOKEN_CACHE_COMPARTIDA=True):
+            tokens = CacheTokens()
+        with mock.patch.object(autenticacion, '_cache_tokens', tokens):
+            token = self._login()
+            self.assertEqual(self._me(token).status_code, 200)
+            clave = PREFIJO_CLAVE + _huella(token)
+            self.assertIsNotNone(cache.get(clave))
+
+            self.usuario.delete()
+            self.assertIsNone(cache.get(clave))
+            self.assertIsNone(tokens.local.obtener(_huella(token)))
+            self.assertEqual(self._me(token).status_code, 403)
@@ -0,0 +1,106 @@
+from datetime import date
+from unittest import mock
+from django.test import TestCase
+from school.busqueda import Buscador, buscador
+from school.models import Alumno, Institucion, Personal
+
+
+class BusquedaTests(TestCase):
+    """Búsqueda sin acentos con el índice en memoria (SQLite) y con las funciones SQL"""
+
+    URL = '/api/busqueda/'
+
+    @classmethod
+    def setUpTestData(cls):
+        institucion = Institucion.objects.create(nombre='Instituto', direccion='Centro')
+        cls.jose = Alumno.objects.create(nombre='José', apellido='Pérez', matricula='EST-JOS-PER')
+        cls.maria = Alumno.objects.create(nombre='María', apellido='PEREZ Gómez', matricula='EST-MAR-PER')
+        cls.luis = Alumno.objects.create(nombre='Luis', apellido='López', matricula='EST-LUI-LOP')
+        cls.personal = Personal.objects.create(
+            nombre='Josefina', apellido='Peralta', cedula='V-000001', cargo='Docente',
+            fecha_ingreso=date(2020, 1, 1), institucion=institucion,
+        )
+
+    def setUp(self):
+        # El índice es del proceso: se descarta el de otras pruebas (cuyos datos ya se revirtieron)
+        buscador('alumnos').invalidar()
+        buscador('personal').invalidar()
+
+    def _ids(self, encontrados):
+        return [objeto.pk for objeto, _ in encontrados]
+
+    def test_sin_acentos_ni_mayusculas(self):
+        motor = buscador('alumnos')
+        self.assertEqual(self._ids(motor.buscar(Alumno.objects.all(), 'jose perez')), [self.jose.pk])
+        encontrados = self._ids(motor.buscar(Alumno.objects.all(), 'perez'))
+        self.assertEqual(set(encontrados), {self.jose.pk, self.maria.pk})
+        self.assertEqual(self._ids(motor.buscar(Alumno.objects.all(), 'GÓMEZ')), [self.maria.pk])
+
+    def test_autocompletar_por_prefijo_de_palabra(self):
+        motor = buscador('alumnos')
+        self.assertEqual(self._ids(motor.autocompletar(Alumno.objects.all(), 'jose pe')), [self.jose.pk])
+        # 'pe' está dentro de 'López' pero no al inicio de una palabra
+        self.assertNotIn(self.luis.pk, self._ids(motor.autocompletar(Alumno.objects.all(), 'pe')))
+
+    def test_filtrar_respeta_el_queryset(self):
+        motor = buscador('alumnos')
+        queryset = Alumno.objects.exclude(pk=self.jose.pk)
+        self.assertEqual(list(motor.filtrar(queryset, 'perez')), [self.maria])
+
+    def test_filtro_sql_cuando_hay_demasiados_candidatos(self):
+        motor = buscador('alumnos')
+        with mock.patch.object(Buscador, 'max_candidatos', return_value=0):
+            filtrados = motor.filtrar(Alumno.objects.all(), 'pérez')
+            self.assertNotIn('IN (', str(filtrados.query))
+            self.assertEqual(set(filtrados), {self.jose, self.maria})
+
+    def test_ruta_sql_con_funciones_registradas(self):
+        # Las funciones de la migración de PostgreSQL también existen en SQLite
+        motor = buscador('alumnos')
+        with mock.patch.object(Buscador, 'usa_sql', return_value=True):
+            self.assertEqual(self._ids(motor.buscar(Alumno.objects.all(), 'jose perez')), [self.jose.pk])
+            self.assertEqual(self._ids(motor.autocompletar(Alumno.objects.all(), 'maria pe')), [self.maria.pk])
+
+    def test_indice_se_actualiza_al_guardar_y_borrar(self):
+        motor = buscador('alumnos')
+        self.assertEqual(self._ids(motor.buscar(Alumno.objects.all(), 'ramirez')), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            nuevo = Alumno.objects.create(nombre='Ana', apellido='Ramírez', matricula='EST-ANA-RAM')
+        self.assertEqual(self._ids(motor.buscar(Alumno.objects.all(), 'ramirez')), [nuevo.pk])
+
+        nuevo.apellido = 'Suárez'
+        with self.captureOnCommitCallbacks(execute=True):
+            nuevo.save()
+        self.assertEqual(self._ids(motor.buscar(Alumno.objects.all(), 'ramirez')), [])
+        self.assertEqual(self._ids(motor.buscar(Alumno.objects.all(), 'suarez')), [nuevo.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            nuevo.delete()
+        self.assertEqual(self._ids(motor.buscar(Alumno.objects.all(), 'suarez')), [])
+
+    def test_indice_se_recarga_al_invalidar(self):
+        motor = buscador('alumnos')
+        motor.buscar(Alumno.objects.all(), 'luis')
+        # Cambio sin señales (ej. otro proceso): la versión nueva obliga a recargar
+        Alumno.objects.filter(pk=self.luis.pk).update(apellido='Núñez')
+        motor.invalidar()
+        self.assertEqual(self._ids(motor.buscar(Alumno.objects.all(), 'nunez')), [self.luis.pk])
+
+    def test_api(self):
+        respuesta = self.client.get(self.URL, {'q': 'jose'})
+        self.assertEqual(respuesta.status_code, 200)
+        resultados = respuesta.json()['resultados']
+        self.assertEqual({(r['tipo'], r['id']) for r in resultados},
+                         {('alumnos', self.jose.pk), ('personal', self.personal.pk)})
+        self.assertEqual(resultados[0]['id'], self.jose.pk)  # 'José' se parece más que 'Josefina'
+
+        respuesta = self.client.get(f'{self.URL}autocompletar/', {'q': 'pera', 'tipo': 'personal'})
+        self.assertEqual([r['id'] for r in respuesta.json()['resultados']], [self.personal.pk])
+
+        self.assertEqual(self.client.get(self.URL).status_code, 400)
+        self.assertEqual(self.client.get(self.URL, {'q': 'jose', 'tipo': 'otros'}).status_code, 400)
+
+    def test_search_en_el_listado_de_alumnos(self):
+        respuesta = self.client.get('/api/alumnos/', {'search': 'perez', 'cache': 'false'})
+        self.assertEqual({fila['id'] for fila in respuesta.json()['results']}, {self.jose.pk, self.maria.pk})
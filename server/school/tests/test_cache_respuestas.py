@@ -0,0 +1,46 @@
+from datetime import date
+from django.test import TestCase
+from school.models import Periodo
+
+
+class CacheReferenciaCondicionalTests(TestCase):
+    """Los aciertos de caché responden 200 o 304 con los validadores guardados y sin consultas"""
+
+    URL = '/api/periodos/'
+
+    @classmethod
+    def setUpTestData(cls):
+        Periodo.objects.create(nombre='2025-1', fecha_inicio=date(2025, 1, 1), fecha_fin=date(2025, 6, 30))
+
+    def test_if_none_match_responde_304(self):
+        for url in (self.URL, f'{self.URL}{Periodo.objects.get().pk}/'):
+            with self.subTest(url=url):
+                respuesta = self.client.get(url)
+                self.assertEqual(respuesta.status_code, 200)
+                etag, ultima = respuesta['ETag'], respuesta['Last-Modified']
+                with self.assertNumQueries(0):
+                    respuesta = self.client.get(url)  # Desde la caché, con sus validadores
+                self.assertEqual(respuesta.status_code, 200)
+                self.assertEqual((respuesta['ETag'], respuesta['Last-Modified']), (etag, ultima))
+                with self.assertNumQueries(0):
+                    respuesta = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(respuesta.status_code, 304)
+                self.assertEqual(respuesta['ETag'], etag)
+                with self.assertNumQueries(0):
+                    respuesta = self.client.get(url, HTTP_IF_MODIFIED_SINCE=ultima)
+                self.assertEqual(respuesta.status_code, 304)
+
+    def test_cambio_invalida_cache_y_etag(self):
+        etag = self.client.get(self.URL)['ETag']
+        Periodo.objects.create(nombre='2025-2', fecha_inicio=date(2025, 7, 1), fecha_fin=date(2025, 12, 15))
+        respuesta = self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotEqual(respuesta['ETag'], etag)
+        self.assertEqual(respuesta.json()['count'], 2)
+
+    def test_sin_cache_mantiene_los_validadores(self):
+        url = f'{self.URL}?cache=false'
+        respuesta = self.client.get(url)
+        self.assertEqual(respuesta.status_code, 200)
+        respuesta = self.client.get(url, HTTP_IF_NONE_MATCH=respuesta['ETag'])
+        self.assertEqual(respuesta.status_code, 304)
@@ -0,0 +1,118 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from school.models import Alumno, Calificacion, Grado, Institucion, Materia, Periodo, ResumenCalificacion
+from school.services.calificacion_service import CalificacionService
+from school.services.resumen_materializado_service import ResumenMaterializadoService
+
+
+class ImportarAlumnosTests(TestCase):
+    """Las filas con valores que no son texto se validan en lugar de fallar con 500"""
+
+    URL = '/api/alumnos/importar/'
+
+    def test_valores_numericos(self):
+        respuesta = self.client.post(
+            self.URL,
+            [{'nombre': 5, 'apellido': 'Perez'}, {'nombre': 'Ana', 'apellido': 'Perez', 'matricula': 12345}],
+            content_type='application/json',
+        )
+        self.assertEqual(respuesta.status_code, 201)
+        datos = respuesta.json()
+        self.assertEqual(datos['creadas'], 1)
+        self.assertEqual([error['fila'] for error in datos['errores']], [0])
+        self.assertIn('nombre', datos['errores'][0]['errores'])
+        self.assertTrue(Alumno.objects.filter(matricula='12345').exists())
+
+    def test_fecha_que_no_es_texto(self):
+        respuesta = self.client.post(
+            self.URL, [{'nombre': 'Ana', 'apellido': 'Perez', 'fecha_nacimiento': 20100101}],
+            content_type='application/json',
+        )
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn('fecha_nacimiento', respuesta.json()['errores'][0]['errores'])
+
+
+class CargaMasivaCalificacionesTests(TestCase):
+    """Upsert en bloque de calificaciones con errores por fila"""
+
+    URL = '/api/calificaciones/bulk/'
+
+    @classmethod
+    def setUpTestData(cls):
+        institucion = Institucion.objects.create(nombre='Instituto', direccion='Centro')
+        grado = Grado.objects.create(nombre='1ro', institucion=institucion)
+        cls.materia = Materia.objects.create(nombre='Matemática', grado=grado)
+        cls.periodo = Periodo.objects.create(nombre='2025-1', fecha_inicio=date(2025, 1, 1), fecha_fin=date(2025, 6, 30))
+        cls.alumnos = Alumno.objects.bulk_create(
+            Alumno(nombre=f'Alumno {i}', apellido='Perez', matricula=f'EST-{i:04d}', grado=grado) for i in range(50)
+        )
+
+    def _fila(self, destino, nota='15.00', **cambios):
+        return {'alumno': destino.pk, 'materia': self.materia.pk, 'periodo': self.periodo.pk,
+                'calificacion': nota, **cambios}
+
+    def _cargar(self, filas):
+        return self.client.post(self.URL, filas, content_type='application/json')
+
+    def test_upsert_actualiza_en_lugar_de_duplicar(self):
+        self.assertEqual(self._cargar([self._fila(self.alumnos[0], '10.00')]).json()['guardadas'], 1)
+        respuesta = self._cargar([self._fila(self.alumnos[0], '18.50'), self._fila(self.alumnos[1])])
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta.json()['guardadas'], 2)
+        self.assertEqual(Calificacion.objects.count(), 2)
+        self.assertEqual(Calificacion.objects.get(alumno=self.alumnos[0]).calificacion, Decimal('18.50'))
+        resumen = ResumenCalificacion.objects.get(alumno=self.alumnos[0], periodo=self.periodo)
+        self.assertEqual(resumen.promedio, Decimal('18.50'))
+
+    def test_errores_por_fila(self):
+        respuesta = self._cargar([
+            self._fila(self.alumnos[0]),
+            self._fila(self.alumnos[1], alumno=999999),
+            self._fila(self.alumnos[2], materia=True),
+            self._fila(self.alumnos[3], 'diez'),
+            'no es un objeto',
+        ])
+        self.assertEqual(respuesta.status_code, 200)
+        datos = respuesta.json()
+        self.assertEqual((datos['recibidas'], datos['guardadas']), (5, 1))
+        errores = {error['fila']: error['errores'] for error in datos['errores']}
+        self.assertEqual(sorted(errores), [1, 2, 3, 4])
+        self.assertIn('alumno', errores[1])
+        self.assertEqual(errores[2]['materia'], ['Debe ser un ID entero.'])
+        self.assertIn('calificacion', errores[3])
+        self.assertEqual(Calificacion.objects.count(), 1)
+
+    def test_ninguna_fila_valida(self):
+        respuesta = self._cargar([self._fila(self.alumnos[0], periodo=False)])
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertFalse(Calificacion.objects.exists())
+
+    def test_una_sola_transaccion(self):
+        with mock.patch.object(ResumenMaterializadoService, 'recalcular', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                CalificacionService().carga_masiva([self._fila(alumno) for alumno in self.alumnos[:5]])
+        self.assertFalse(Calificacion.objects.exists())
+
+    def test_consultas_constantes(self):
+        with CaptureQueriesContext(connection) as pocas:
+            self._cargar([self._fila(alumno) for alumno in self.alumnos[:5]])
+        with self.assertNumQueries(len(pocas)):
+            respuesta = self._cargar([self._fila(alumno, '12.00') for alumno in self.alumnos])
+        self.assertEqual(respuesta.json()['guardadas'], 50)
+
+    def test_csv_utf16(self):
+        contenido = 'alumno,materia,periodo,calificacion\n1,1,1,15\n'.encode('utf-16')
+        respuesta = self.client.post(self.URL, contenido, content_type='text/csv')
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn('UTF-8', respuesta.json()['detail']['detail'])
+
+    def test_archivo_utf16(self):
+        archivo = SimpleUploadedFile('notas.csv', 'alumno,materia\n'.encode('utf-16'), content_type='text/csv')
+        respuesta = self.client.post(self.URL, {'archivo': archivo})
+        self.assertEqual(respuesta.status_code, 400)
+        self.assertIn('UTF-8', respuesta.json()['detail']['detail'])
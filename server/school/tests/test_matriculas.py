@@ -0,0 +1,46 @@
+import threading
+from django.db import connection
+from django.test import TransactionTestCase
+from school.models import Alumno
+from school.services.alumno_service import AlumnoService
+
+
+HILOS = 8
+ALUMNOS_POR_HILO = 5
+
+
+class MatriculasConcurrentesTests(TransactionTestCase):
+    """Inscripciones simultáneas del mismo nombre reciben matrículas distintas y contiguas"""
+
+    def setUp(self):
+        # La base SQLite en memoria de los tests no admite escrituras desde varias conexiones
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('Requiere una base de pruebas en disco (PostgreSQL o SQLite con TEST NAME)')
+
+    def _inscribir(self, errores):
+        servicio = AlumnoService()
+        try:
+            for _ in range(ALUMNOS_POR_HILO):
+                servicio.crear_alumno({'nombre': 'Ana', 'apellido': 'Perez'})
+        except Exception as error:
+            errores.append(error)
+        finally:
+            connection.close()
+
+    def test_mismo_nombre_desde_varios_hilos(self):
+        errores = []
+        hilos = [threading.Thread(target=self._inscribir, args=(errores,)) for _ in range(HILOS)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(errores, [])
+        total = HILOS * ALUMNOS_POR_HILO
+        matriculas = list(Alumno.objects.values_list('matricula', flat=True))
+        self.assertEqual(len(matriculas), total)
+        self.assertEqual(len(set(matriculas)), total)
+        base = AlumnoService._base_matricula('Ana', 'Perez')
+        sufijos = sorted(AlumnoService._separar_matricula(m)[1] for m in matriculas)
+        self.assertEqual(sufijos, list(range(total)))
+        self.assertIn(base, matriculas)
@@ -0,0 +1,108 @@
+from datetime import date
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from school.api.pagination import encode_cursor
+from school.models import Alumno, Calificacion, Grado, Institucion, Materia, Periodo, Profesor
+
+
+class PaginacionAlumnosTests(TestCase):
+    """Una página o un cursor fuera de rango responde 404 como los demás listados"""
+
+    URL = '/api/alumnos/'
+
+    @classmethod
+    def setUpTestData(cls):
+        Alumno.objects.bulk_create(
+            Alumno(nombre=f'Alumno {i}', apellido='Perez', matricula=f'EST-{i:04d}') for i in range(3)
+        )
+
+    def test_pagina_fuera_de_rango(self):
+        respuesta = self.client.get(self.URL, {'page': 999})
+        self.assertEqual(respuesta.status_code, 404)
+
+    def test_cursor_invalido(self):
+        respuesta = self.client.get(self.URL, {'paginacion': 'cursor', 'cursor': 'zzz'})
+        self.assertEqual(respuesta.status_code, 404)
+        self.assertIn('Cursor inválido', str(respuesta.json()))
+
+
+class PaginacionCalificacionesTests(TestCase):
+    """Modo cursor sobre (periodo, alumno, id) y página sin COUNT(*)"""
+
+    URL = '/api/calificaciones/'
+
+    @classmethod
+    def setUpTestData(cls):
+        institucion = Institucion.objects.create(nombre='Instituto', direccion='Centro')
+        grado = Grado.objects.create(nombre='Primero', institucion=institucion)
+        profesor = Profesor.objects.create(nombre='Luis', apellido='Gomez', institucion=institucion)
+        materias = Materia.objects.bulk_create(
+            Materia(nombre=f'Materia {i}', grado=grado, profesor=profesor) for i in range(3)
+        )
+        alumnos = Alumno.objects.bulk_create(
+            Alumno(nombre=f'Alumno {i}', apellido='Perez', matricula=f'EST-{i:04d}') for i in range(3)
+        )
+        periodos = [
+            Periodo.objects.create(nombre='2025-2', fecha_inicio=date(2025, 7, 1), fecha_fin=date(2025, 12, 15)),
+            Periodo.objects.create(nombre='2025-1', fecha_inicio=date(2025, 1, 1), fecha_fin=date(2025, 6, 30)),
+        ]
+        # Inserción intercalada: el orden por id no coincide con el del cursor
+        Calificacion.objects.bulk_create(
+            Calificacion(alumno=alumno, materia=materia, periodo=periodo, calificacion=Decimal('15.00'))
+            for materia in materias for alumno in reversed(alumnos) for periodo in periodos
+        )
+        cls.esperados = list(
+            Calificacion.objects.order_by('periodo_id', 'alumno_id', 'id').values_list('id', flat=True)
+        )
+
+    def _recorrer(self, url, enlace):
+        ids, paginas = [], 0
+        while url:
+            datos = self.client.get(url).json()
+            ids.append([fila['id'] for fila in datos['results']])
+            url = datos[enlace]
+            paginas += 1
+            self.assertLess(paginas, 10)
+        return ids
+
+    def test_cursor_recorre_en_orden_y_vuelve(self):
+        paginas = self._recorrer(f'{self.URL}?paginacion=cursor&page_size=4&cache=false', 'next')
+        self.assertEqual(sum(paginas, []), self.esperados)
+        self.assertTrue(all(len(pagina) == 4 for pagina in paginas[:-1]))
+
+        ultima = self.client.get(f'{self.URL}?paginacion=cursor&page_size=4').json()
+        while ultima['next']:
+            ultima = self.client.get(ultima['next']).json()
+        hacia_atras = self._recorrer(ultima['previous'], 'previous')
+        self.assertEqual(hacia_atras, list(reversed(paginas[:-1])))
+
+    def test_cursor_con_valores_invalidos(self):
+        cursores = [
+            encode_cursor(['a', 'b', 'c']),  # Tipos que no son enteros
+            encode_cursor([1, 2]),  # Menos valores que columnas
+            encode_cursor([None, 1, 1]),
+            'zzz',
+        ]
+        for cursor in cursores:
+            with self.subTest(cursor=cursor):
+                respuesta = self.client.get(self.URL, {'paginacion': 'cursor', 'cursor': cursor})
+                self.assertEqual(respuesta.status_code, 404)
+
+    def test_sin_conteo(self):
+        parametros = {'page_size': 5, 'cache': 'false'}
+        with CaptureQueriesContext(connection) as con_conteo:
+            completa = self.client.get(self.URL, parametros).json()
+        with CaptureQueriesContext(connection) as sin_conteo:
+            datos = self.client.get(self.URL, {**parametros, 'sin_conteo': 'true'}).json()
+        self.assertEqual(len(sin_conteo), len(con_conteo) - 1)
+        self.assertIsNone(datos['count'])
+        self.assertEqual(datos['results'], completa['results'])
+        self.assertIn('page=2', datos['next'])
+        self.assertIsNone(datos['previous'])
+
+        ultima = self.client.get(self.URL, {**parametros, 'sin_conteo': 'true', 'page': 4}).json()
+        self.assertEqual(len(ultima['results']), len(self.esperados) - 15)
+        self.assertIsNone(ultima['next'])
+        self.assertIn('page=3', ultima['previous'])
@@ -0,0 +1,84 @@
+from datetime import date
+from decimal import Decimal
+from itertools import combinations
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from school.api.campos import campos_legibles
+from school.api.lectura_valores import build_values_plan
+from school.api.query_plans import build_query_plan
+from school.api.serializers import CalificacionSerializer
+from school.models import Alumno, Calificacion, Grado, Institucion, Materia, Periodo, Personal, Profesor
+
+
+# ViewSets con QueryPlanMixin
+ENDPOINTS = ['grados', 'materias', 'calificaciones', 'personal', 'profesores']
+FILAS = 60
+
+
+class ConsultasPorPaginaTests(TestCase):
+    """Una página del listado cuesta las mismas consultas con 5 o con 50 filas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        institucion = Institucion.objects.create(nombre='Instituto', direccion='Centro')
+        grados = Grado.objects.bulk_create(
+            Grado(nombre=f'Grado {i}', institucion=institucion) for i in range(FILAS)
+        )
+        profesores = Profesor.objects.bulk_create(
+            Profesor(nombre=f'Prof {i}', apellido='Gomez', institucion=institucion) for i in range(FILAS)
+        )
+        materias = Materia.objects.bulk_create(
+            Materia(nombre=f'Materia {i}', grado=grados[i], profesor=profesores[i]) for i in range(FILAS)
+        )
+        alumnos = Alumno.objects.bulk_create(
+            Alumno(nombre=f'Alumno {i}', apellido='Perez', matricula=f'EST-{i:04d}', grado=grados[i])
+            for i in range(FILAS)
+        )
+        periodo = Periodo.objects.create(nombre='2025-1', fecha_inicio=date(2025, 1, 1), fecha_fin=date(2025, 6, 30))
+        Calificacion.objects.bulk_create(
+            Calificacion(alumno=alumnos[i], materia=materias[i], periodo=periodo, calificacion=Decimal('12.00'))
+            for i in range(FILAS)
+        )
+        Personal.objects.bulk_create(
+            Personal(nombre=f'Personal {i}', apellido='Diaz', cedula=f'V-{i:06d}', cargo='Docente',
+                     fecha_ingreso=date(2020, 1, 1), institucion=institucion)
+            for i in range(FILAS)
+        )
+
+    def _comprobar(self, parametros=''):
+        for endpoint in ENDPOINTS:
+            with self.subTest(endpoint=endpoint, parametros=parametros):
+                url = f'/api/{endpoint}/?cache=false{parametros}&page_size='
+                with CaptureQueriesContext(connection) as contexto:
+                    respuesta = self.client.get(url + '5')
+                self.assertEqual(len(respuesta.json()['results']), 5)
+                with self.assertNumQueries(len(contexto)):
+                    respuesta = self.client.get(url + '50')
+                self.assertEqual(len(respuesta.json()['results']), 50)
+
+    def test_paginacion_por_pagina(self):
+        self._comprobar()
+
+    def test_paginacion_por_cursor(self):
+        self._comprobar('&paginacion=cursor')
+
+    @override_settings(API_LECTURA_VALORES=False)
+    def test_serializer_con_plan_de_consulta(self):
+        self._comprobar()
+
+
+class PlanesAcotadosTests(SimpleTestCase):
+    """Los planes se guardan por combinación de ?fields=, pero la caché no crece sin límite"""
+
+    def test_combinaciones_de_campos(self):
+        disponibles = campos_legibles(CalificacionSerializer)
+        subconjuntos = [c for n in range(1, len(disponibles)) for c in combinations(disponibles, n)]
+        for construir in (build_query_plan, build_values_plan):
+            with self.subTest(construir=construir.__name__):
+                limite = construir.cache_info().maxsize
+                self.assertIsNotNone(limite)
+                self.assertGreater(len(subconjuntos), limite)
+                for campos in subconjuntos:
+                    construir(CalificacionSerializer, campos=campos)
+                self.assertLessEqual(construir.cache_info().currsize, limite)
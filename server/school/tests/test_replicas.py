@@ -0,0 +1,95 @@
+from unittest import mock
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TransactionTestCase
+from core import replicas
+from school.cache import obtener_o_calcular
+from school.models import Periodo
+
+
+REPLICAS = ['replica_1', 'replica_2']
+
+
+class RouterReplicasTests(TransactionTestCase):
+    """
+    Enrutamiento de lecturas con dos réplicas (las réplicas se simulan:
+    el router solo decide el alias). TransactionTestCase porque dentro del
+    atomic de TestCase toda lectura se fija a la primaria.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with mock.patch('core.replicas.aliases_replica', return_value=REPLICAS):
+            cls.router = replicas.RouterReplicas()
+
+    def setUp(self):
+        self.token = replicas._estado.set(replicas.EstadoPeticion())
+        patcher = mock.patch('core.replicas.aliases_replica', return_value=REPLICAS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        replicas._estado.reset(self.token)
+
+    def _peticion(self, metodo='get', cookies=None, vista=None):
+        """Ejecuta `vista` dentro de ReplicasMiddleware; devuelve (alias leídos, respuesta)"""
+        leidos = []
+
+        def get_response(request):
+            leidos.append(self.router.db_for_read(Periodo))
+            if vista:
+                vista()
+            leidos.append(self.router.db_for_read(Periodo))
+            return HttpResponse()
+
+        request = getattr(RequestFactory(), metodo)('/api/periodos/')
+        request.COOKIES.update(cookies or {})
+        respuesta = replicas.ReplicasMiddleware(get_response)(request)
+        return leidos, respuesta
+
+    def test_round_robin_una_replica_por_peticion(self):
+        elegidas = []
+        for _ in range(4):
+            leidos, _ = self._peticion()
+            self.assertEqual(leidos[0], leidos[1])
+            elegidas.append(leidos[0])
+        self.assertEqual(sorted(elegidas), sorted(REPLICAS * 2))
+        self.assertNotEqual(elegidas[0], elegidas[1])
+
+    def test_metodo_no_seguro_lee_de_la_primaria(self):
+        leidos, _ = self._peticion('post')
+        self.assertEqual(leidos, ['default', 'default'])
+
+    def test_escritura_fija_la_peticion_y_envia_la_cookie(self):
+        leidos, respuesta = self._peticion(vista=lambda: self.router.db_for_write(Periodo))
+        self.assertIn(leidos[0], REPLICAS)
+        self.assertEqual(leidos[1], 'default')
+        self.assertIn(replicas.COOKIE_PRIMARIA, respuesta.cookies)
+
+        leidos, respuesta = self._peticion(cookies={replicas.COOKIE_PRIMARIA: '1'})
+        self.assertEqual(leidos, ['default', 'default'])
+        self.assertNotIn(replicas.COOKIE_PRIMARIA, respuesta.cookies)
+
+    def test_transaccion_fija_la_primaria(self):
+        self.assertIn(self.router.db_for_read(Periodo), REPLICAS)
+        with transaction.atomic():
+            self.assertEqual(self.router.db_for_read(Periodo), 'default')
+        # Fuera del bloque sigue fijada: lo leído después puede depender de lo escrito
+        self.assertEqual(self.router.db_for_read(Periodo), 'default')
+
+    def test_cache_se_llena_desde_la_primaria(self):
+        replica = self.router.db_for_read(Periodo)
+        self.assertIn(replica, REPLICAS)
+        leido = obtener_o_calcular(['periodos'], ('router',), lambda: self.router.db_for_read(Periodo))
+        self.assertEqual(leido, 'default')
+        # Después del cálculo se vuelve a la réplica de la petición
+        self.assertEqual(self.router.db_for_read(Periodo), replica)
+
+    def test_cache_no_desfija_una_escritura(self):
+        def escribir():
+            self.router.db_for_write(Periodo)
+            return 'ok'
+
+        obtener_o_calcular(['periodos'], ('escritura',), escribir)
+        self.assertEqual(self.router.db_for_read(Periodo), 'default')
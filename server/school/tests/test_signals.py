@@ -0,0 +1,160 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.test import TestCase
+from school.models import Alumno, Calificacion, Grado, Institucion, Materia, Periodo, ResumenCalificacion
+from school.services.resumen_materializado_service import ResumenMaterializadoService
+
+
+class CalificacionDiferidaTests(TestCase):
+    """post_init de Calificacion no debe cargar campos diferidos"""
+
+    @classmethod
+    def setUpTestData(cls):
+        institucion = Institucion.objects.create(nombre='Instituto', direccion='Centro')
+        grado = Grado.objects.create(nombre='1ro', institucion=institucion)
+        alumno = Alumno.objects.create(nombre='Ana', apellido='Perez', matricula='EST-ANA-PER', grado=grado)
+        materia = Materia.objects.create(nombre='Matemática', grado=grado)
+        periodo = Periodo.objects.create(nombre='2025-1', fecha_inicio=date(2025, 1, 1), fecha_fin=date(2025, 6, 30))
+        Calificacion.objects.create(alumno=alumno, materia=materia, periodo=periodo, calificacion=Decimal('15.50'))
+
+    def test_only_sin_par_carga_sin_consultas_extra(self):
+        with self.assertNumQueries(1):
+            calificaciones = list(Calificacion.objects.only('id', 'calificacion')[:10])
+        self.assertEqual(calificaciones[0].calificacion, Decimal('15.50'))
+
+    def test_defer_periodo_carga(self):
+        with self.assertNumQueries(1):
+            calificaciones = list(Calificacion.objects.defer('periodo'))
+        self.assertEqual(len(calificaciones), 1)
+
+    def test_guardar_instancia_diferida(self):
+        calificacion = Calificacion.objects.only('id', 'calificacion').get()
+        calificacion.calificacion = Decimal('18.00')
+        calificacion.save(update_fields=['calificacion'])
+        self.assertEqual(Calificacion.objects.get().calificacion, Decimal('18.00'))
+
+
+class ResumenCalificacionTests(TestCase):
+    """Las señales mantienen ResumenCalificacion al confirmar cada transacción"""
+
+    @classmethod
+    def setUpTestData(cls):
+        institucion = Institucion.objects.create(nombre='Instituto', direccion='Centro')
+        grado = Grado.objects.create(nombre='1ro', institucion=institucion)
+        cls.alumno = Alumno.objects.create(nombre='Ana', apellido='Perez', matricula='EST-ANA-PER', grado=grado)
+        cls.materias = [Materia.objects.create(nombre=f'Materia {i}', grado=grado) for i in range(2)]
+        cls.periodo = Periodo.objects.create(nombre='2025-1', fecha_inicio=date(2025, 1, 1), fecha_fin=date(2025, 6, 30))
+        cls.otro_periodo = Periodo.objects.create(nombre='2025-2', fecha_inicio=date(2025, 7, 1), fecha_fin=date(2025, 12, 15))
+
+    def _calificar(self, materia, nota, periodo=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Calificacion.objects.create(
+                alumno=self.alumno, materia=materia, periodo=periodo or self.periodo, calificacion=Decimal(nota)
+            )
+
+    def _resumen(self, periodo=None):
+        return ResumenCalificacion.objects.filter(alumno=self.alumno, periodo=periodo or self.periodo).first()
+
+    def test_crear_y_actualizar(self):
+        self._calificar(self.materias[0], '8.00')
+        calificacion = self._calificar(self.materias[1], '15.00')
+        resumen = self._resumen()
+        self.assertEqual((resumen.total, resumen.promedio, resumen.aprobadas), (2, Decimal('11.50'), 1))
+
+        calificacion.calificacion = Decimal('19.00')
+        with self.captureOnCommitCallbacks(execute=True):
+            calificacion.save()
+        resumen = self._resumen()
+        self.assertEqual((resumen.promedio, resumen.maxima), (Decimal('13.50'), Decimal('19.00')))
+
+    def test_cambiar_de_periodo_actualiza_ambos_pares(self):
+        self._calificar(self.materias[0], '12.00')
+        calificacion = self._calificar(self.materias[1], '16.00')
+        calificacion.periodo = self.otro_periodo
+        with self.captureOnCommitCallbacks(execute=True):
+            calificacion.save()
+        self.assertEqual(self._resumen().total, 1)
+        self.assertEqual(self._resumen(self.otro_periodo).promedio, Decimal('16.00'))
+
+    def test_borrar(self):
+        primera = self._calificar(self.materias[0], '12.00')
+        self._calificar(self.materias[1], '16.00')
+        with self.captureOnCommitCallbacks(execute=True):
+            primera.delete()
+        self.assertEqual(self._resumen().total, 1)
+
+    def test_borrado_en_cascada_del_alumno(self):
+        self._calificar(self.materias[0], '12.00')
+        self._calificar(self.materias[1], '16.00', periodo=self.otro_periodo)
+        with mock.patch.object(
+            ResumenMaterializadoService, 'recalcular', autospec=True,
+            side_effect=ResumenMaterializadoService.recalcular,
+        ) as recalcular:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.alumno.delete()
+        # Un solo recálculo con los dos pares, no uno por calificación
+        self.assertEqual(recalcular.call_count, 1)
+        self.assertEqual(len(recalcular.call_args.kwargs['pares']), 2)
+        self.assertFalse(ResumenCalificacion.objects.exists())
+
+    def test_rollback_no_modifica_el_resumen(self):
+        self._calificar(self.materias[0], '12.00')
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    Calificacion.objects.create(
+                        alumno=self.alumno, materia=self.materias[1], periodo=self.periodo,
+                        calificacion=Decimal('20.00'),
+                    )
+                    raise RuntimeError
+        self.assertEqual(callbacks, [])
+        resumen = self._resumen()
+        self.assertEqual((resumen.total, resumen.promedio), (1, Decimal('12.00')))
+
+
+class VerificarResumenesTests(TestCase):
+    """rebuild_grade_summaries --verificar informa las discrepancias y el backfill las corrige"""
+
+    @classmethod
+    def setUpTestData(cls):
+        institucion = Institucion.objects.create(nombre='Instituto', direccion='Centro')
+        grado = Grado.objects.create(nombre='1ro', institucion=institucion)
+        materia = Materia.objects.create(nombre='Matemática', grado=grado)
+        periodo = Periodo.objects.create(nombre='2025-1', fecha_inicio=date(2025, 1, 1), fecha_fin=date(2025, 6, 30))
+        cls.alumnos = Alumno.objects.bulk_create(
+            Alumno(nombre=f'Alumno {i}', apellido='Perez', matricula=f'EST-{i:04d}', grado=grado) for i in range(3)
+        )
+        # bulk_create no emite señales: el resumen se construye con el comando
+        Calificacion.objects.bulk_create(
+            Calificacion(alumno=alumno, materia=materia, periodo=periodo, calificacion=Decimal('14.00'))
+            for alumno in cls.alumnos[:2]
+        )
+        cls.periodo = periodo
+
+    def _verificar(self):
+        salida = StringIO()
+        call_command('rebuild_grade_summaries', '--verificar', stdout=salida)
+        return salida.getvalue()
+
+    def test_detecta_y_corrige_discrepancias(self):
+        with self.assertRaisesMessage(CommandError, '2 resúmenes inconsistentes'):
+            self._verificar()
+
+        call_command('rebuild_grade_summaries', stdout=StringIO())
+        self.assertIn('Resúmenes consistentes', self._verificar())
+
+        ResumenCalificacion.objects.filter(alumno=self.alumnos[0]).update(promedio=Decimal('1.00'))
+        ResumenCalificacion.objects.filter(alumno=self.alumnos[1]).delete()
+        ResumenCalificacion.objects.create(
+            alumno=self.alumnos[2], periodo=self.periodo, total=1, suma=Decimal('5.00'),
+            promedio=Decimal('5.00'), minima=Decimal('5.00'), maxima=Decimal('5.00'), aprobadas=0,
+        )
+        salida = StringIO()
+        with self.assertRaisesMessage(CommandError, '3 resúmenes inconsistentes'):
+            call_command('rebuild_grade_summaries', '--verificar', stdout=salida)
+        for tipo in ('distinto', 'faltante', 'sobrante'):
+            self.assertIn(tipo, salida.getvalue())
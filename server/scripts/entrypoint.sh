@@ -2,9 +2,15 @@
 
 # Script de entrada para Docker
 # Ejecuta migraciones y luego inicia el servidor
+#
+# SERVIDOR=runserver  servidor de desarrollo de Django (por defecto)
+# SERVIDOR=wsgi       Gunicorn con core.wsgi (ver gunicorn.conf.py)
+# SERVIDOR=asgi       Gunicorn con workers de Uvicorn y core.asgi
 
 set -e
 
+SERVIDOR="${SERVIDOR:-runserver}"
+
 echo "Esperando a que la base de datos esté lista..."
 sleep 2
 
@@ -14,6 +20,18 @@ python manage.py migrate --noinput
 echo "Recopilando archivos estáticos (si es necesario)..."
 python manage.py collectstatic --noinput || true
 
-echo "Iniciando servidor Django..."
-exec python manage.py runserver 0.0.0.0:8000
-
+case "$SERVIDOR" in
+    runserver)
+        echo "Iniciando servidor Django (desarrollo)..."
+        exec python manage.py runserver 0.0.0.0:8000
+        ;;
+    wsgi|asgi)
+        echo "Iniciando Gunicorn ($SERVIDOR)..."
+        # exec: Gunicorn recibe las señales del contenedor (HUP recarga, TERM termina ordenadamente)
+        exec gunicorn --config gunicorn.conf.py
+        ;;
+    *)
+        echo "SERVIDOR no válido: $SERVIDOR (use runserver, wsgi o asgi)" >&2
+        exit 1
+        ;;
+esac
@@ -0,0 +1,146 @@
+"""
+Prueba de carga HTTP (solo biblioteca estándar)
+
+Lanza N clientes concurrentes con conexiones keep-alive que recorren las
+rutas indicadas durante un tiempo fijo, y muestra peticiones por segundo,
+p50/p90/p99 y errores. Con varios objetivos los mide uno tras otro y
+compara el rendimiento contra el primero, por ejemplo runserver vs Gunicorn:
+
+    SERVIDOR=runserver ... (puerto 8000)   SERVIDOR=wsgi ... (puerto 8001)
+    python scripts/prueba_carga.py http://localhost:8000 http://localhost:8001 \\
+        --concurrencia 16 --duracion 20
+
+    python scripts/prueba_carga.py http://localhost:8000 --rutas /api/grados/ /api/alumnos/?page=3
+    python scripts/prueba_carga.py http://localhost:8000 --json carga.json
+"""
+import argparse
+import http.client
+import json
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+
+RUTAS = [
+    '/api/instituciones/',
+    '/api/grados/',
+    '/api/alumnos/',
+    '/api/alumnos/?page=2',
+    '/api/materias/',
+    '/api/calificaciones/',
+    '/api/personal/?estado=true',
+    '/api/dashboard/stats/',
+]
+
+
+def _cliente(objetivo, rutas, fin, cabeceras, latencias, estados, bloqueo):
+    """Un cliente: conexión persistente, recorre las rutas en ciclo hasta `fin`"""
+    partes = urlsplit(objetivo)
+    clase = http.client.HTTPSConnection if partes.scheme == 'https' else http.client.HTTPConnection
+    conexion = None
+    propias, estados_propios = [], Counter()
+    indice = 0
+    while time.perf_counter() < fin:
+        ruta = rutas[indice % len(rutas)]
+        indice += 1
+        inicio = time.perf_counter()
+        try:
+            if conexion is None:
+                conexion = clase(partes.netloc, timeout=30)
+            conexion.request('GET', partes.path.rstrip('/') + ruta, headers=cabeceras)
+            respuesta = conexion.getresponse()
+            respuesta.read()
+            estados_propios[respuesta.status] += 1
+            if respuesta.getheader('Connection', '').lower() == 'close':
+                conexion.close()
+                conexion = None
+        except (OSError, http.client.HTTPException) as e:
+            estados_propios[type(e).__name__] += 1
+            if conexion is not None:
+                conexion.close()
+            conexion = None
+            continue
+        propias.append((time.perf_counter() - inicio) * 1000)
+    if conexion is not None:
+        conexion.close()
+    with bloqueo:
+        latencias.extend(propias)
+        estados.update(estados_propios)
+
+
+def medir(objetivo, rutas, concurrencia, duracion, calentamiento, cabeceras):
+    """Resultados de una corrida contra un objetivo"""
+    if calentamiento:
+        _correr(objetivo, rutas, concurrencia, calentamiento, cabeceras)
+    latencias, estados, transcurrido = _correr(objetivo, rutas, concurrencia, duracion, cabeceras)
+    exitosas = sum(cantidad for estado, cantidad in estados.items() if isinstance(estado, int) and estado < 400)
+    resultado = {
+        'objetivo': objetivo,
+        'concurrencia': concurrencia,
+        'duracion_s': round(transcurrido, 2),
+        'peticiones': len(latencias),
+        'por_segundo': round(exitosas / transcurrido, 1),
+        'errores': sum(estados.values()) - exitosas,
+        'estados': {str(estado): cantidad for estado, cantidad in sorted(estados.items(), key=str)},
+    }
+    if len(latencias) > 1:
+        cortes = statistics.quantiles(latencias, n=100, method='inclusive')
+        resultado.update(p50_ms=round(cortes[49], 2), p90_ms=round(cortes[89], 2), p99_ms=round(cortes[98], 2))
+    return resultado
+
+
+def _correr(objetivo, rutas, concurrencia, duracion, cabeceras):
+    latencias, estados, bloqueo = [], Counter(), threading.Lock()
+    inicio = time.perf_counter()
+    fin = inicio + duracion
+    hilos = [
+        threading.Thread(target=_cliente, args=(objetivo, rutas, fin, cabeceras, latencias, estados, bloqueo))
+        for _ in range(concurrencia)
+    ]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return latencias, estados, time.perf_counter() - inicio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Prueba de carga de la API')
+    parser.add_argument('objetivos', nargs='+', help='URL base de cada servidor a medir')
+    parser.add_argument('--rutas', nargs='+', default=RUTAS)
+    parser.add_argument('--concurrencia', type=int, default=8)
+    parser.add_argument('--duracion', type=float, default=15, help='Segundos de medición por objetivo')
+    parser.add_argument('--calentamiento', type=float, default=2, help='Segundos previos no medidos')
+    parser.add_argument('--token', help="Enviar 'Authorization: Token <token>'")
+    parser.add_argument('--json', dest='json_path', help='Guardar resultados en un archivo JSON')
+    opciones = parser.parse_args(argv)
+
+    cabeceras = {'Accept': 'application/json'}
+    if opciones.token:
+        cabeceras['Authorization'] = f'Token {opciones.token}'
+
+    resultados = []
+    for objetivo in opciones.objetivos:
+        resultado = medir(objetivo, opciones.rutas, opciones.concurrencia, opciones.duracion,
+                          opciones.calentamiento, cabeceras)
+        resultados.append(resultado)
+        base = resultados[0]['por_segundo']
+        comparacion = f"  x{resultado['por_segundo'] / base:.2f}" if base and len(resultados) > 1 else ''
+        print(
+            f"{objetivo:<30} {resultado['por_segundo']:>8} req/s  "
+            f"p50 {resultado.get('p50_ms', '-'):>8} ms  p90 {resultado.get('p90_ms', '-'):>8} ms  "
+            f"p99 {resultado.get('p99_ms', '-'):>8} ms  errores {resultado['errores']}{comparacion}"
+        )
+
+    if opciones.json_path:
+        with open(opciones.json_path, 'w', encoding='utf-8') as archivo:
+            json.dump(resultados, archivo, indent=2)
+        print(f'Resultados guardados en {opciones.json_path}')
+    return 1 if any(resultado['errores'] for resultado in resultados) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())